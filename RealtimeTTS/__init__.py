@@ -2,9 +2,21 @@
 
 from .text_to_stream import TextToAudioStream
 from .engines import BaseEngine, TimingInfo
+from .audio_sinks import AudioSink, RingBufferSink, FileSink, CallbackSink
+from .sentence_cache import SentenceCache
+from .metrics import StreamMetrics, SentenceMetrics
+from .sentence_tokenizers import warm_up_tokenizer
+from .stream_manager import StreamManager, StreamSession
+from .batch_render import render
+from .audio_devices import invalidate_device_cache
+from .audio_frame import AudioFrame
 
 __all__ = [
     "TextToAudioStream", "BaseEngine", "TimingInfo",
+    "AudioSink", "RingBufferSink", "FileSink", "CallbackSink",
+    "SentenceCache", "StreamMetrics", "SentenceMetrics", "warm_up_tokenizer",
+    "StreamManager", "StreamSession", "render", "invalidate_device_cache",
+    "AudioFrame",
     "SystemEngine", "SystemVoice",
     "AzureEngine", "AzureVoice",
     "ElevenlabsEngine", "ElevenlabsVoice",
@@ -0,0 +1,138 @@
+"""
+Audio Devices Module
+--------------------
+Process-wide PortAudio context and cached output device capabilities.
+
+Initializing PortAudio and probing the sample rates a device supports
+takes a noticeable time, and AudioStream needs both before it can open a
+device. They are done once per process here, so reopening an output (e.g.
+at the start of every play() call) costs only the device open.
+
+- get_pyaudio(): The PyAudio instance shared by all AudioStreams.
+- get_default_output_device_index(): Index of the default output device.
+- get_device_info(): Cached device info of an output device.
+- get_supported_sample_rates(): Cached standard sample rates a device
+  supports for a format.
+- invalidate_device_cache(): Forgets the cached device information, e.g.
+  after an audio device was plugged in or removed.
+"""
+
+from typing import List
+import threading
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+# Sample rates probed on an output device
+STANDARD_SAMPLE_RATES = (8000, 9600, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000)
+
+_lock = threading.RLock()
+_pyaudio_instance = None
+_default_output_device_index = None
+_device_infos = {}
+_supported_rates = {}
+
+
+def get_pyaudio():
+    """
+    Returns:
+        pyaudio.PyAudio: The process-wide PyAudio instance, created on first use.
+    """
+    global _pyaudio_instance
+    with _lock:
+        if _pyaudio_instance is None:
+            if not PYAUDIO_AVAILABLE:
+                raise ImportError(
+                    "PyAudio is not available, can't open an audio output device. "
+                    "Install it with 'pip install pyaudio' or use muted playback "
+                    "or another output sink."
+                )
+            _pyaudio_instance = pyaudio.PyAudio()
+        return _pyaudio_instance
+
+
+def get_default_output_device_index() -> int:
+    """
+    Returns:
+        int: Index of the system's default output device.
+    """
+    global _default_output_device_index
+    with _lock:
+        if _default_output_device_index is None:
+            _default_output_device_index = get_pyaudio().get_default_output_device_info()["index"]
+        return _default_output_device_index
+
+
+def get_device_info(device_index: int) -> dict:
+    """
+    Args:
+        device_index (int): Index of the audio device.
+
+    Returns:
+        dict: PortAudio's information about the device.
+    """
+    with _lock:
+        info = _device_infos.get(device_index)
+        if info is None:
+            info = get_pyaudio().get_device_info_by_index(device_index)
+            _device_infos[device_index] = info
+        return info
+
+
+def get_supported_sample_rates(device_index: int, format: int) -> List[int]:
+    """
+    Tests which standard sample rates the device supports for output, once
+    per device and format.
+
+    Args:
+        device_index (int): Index of the audio device.
+        format (int): PortAudio sample format.
+
+    Returns:
+        list: Supported sample rates in ascending order.
+    """
+    key = (device_index, format)
+    with _lock:
+        rates = _supported_rates.get(key)
+        if rates is not None:
+            return list(rates)
+
+        pa = get_pyaudio()
+        max_channels = get_device_info(device_index).get("maxOutputChannels")
+        rates = []
+        for rate in STANDARD_SAMPLE_RATES:
+            try:
+                if pa.is_format_supported(
+                    rate,
+                    output_device=device_index,
+                    output_channels=max_channels,
+                    output_format=format,
+                ):
+                    rates.append(rate)
+            except Exception:
+                continue
+        _supported_rates[key] = tuple(rates)
+        return rates
+
+
+def invalidate_device_cache(reinitialize: bool = False):
+    """
+    Forgets the cached default device, device infos and supported sample
+    rates, they are probed again on the next use.
+
+    Args:
+        reinitialize (bool): If True, PortAudio is terminated as well and
+          initialized again on next use, which is needed to detect devices
+          added or removed while the process runs. Only allowed while no
+          output stream is open.
+    """
+    global _pyaudio_instance, _default_output_device_index
+    with _lock:
+        _default_output_device_index = None
+        _device_infos.clear()
+        _supported_rates.clear()
+        if reinitialize and _pyaudio_instance is not None:
+            _pyaudio_instance.terminate()
+            _pyaudio_instance = None
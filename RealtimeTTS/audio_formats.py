@@ -0,0 +1,62 @@
+"""
+Audio Formats Module
+
+PortAudio sample format constants, mirrored from PyAudio so that the
+library can run headless (muted or with a non-PyAudio sink) on systems
+where PyAudio or the PortAudio library is not installed.
+
+The values are identical to the ones PyAudio exposes, engines may keep
+using pyaudio.paInt16 etc. interchangeably.
+"""
+
+paFloat32 = 0x00000001
+paInt32 = 0x00000002
+paInt24 = 0x00000004
+paInt16 = 0x00000008
+paInt8 = 0x00000010
+paUInt8 = 0x00000020
+paCustomFormat = 0x00010000
+
+paFramesPerBufferUnspecified = 0
+
+# Bytes per sample for each format (custom/mpeg chunks are decoded to 16 bit)
+SAMPLE_WIDTHS = {
+    paFloat32: 4,
+    paInt32: 4,
+    paInt24: 3,
+    paInt16: 2,
+    paInt8: 1,
+    paUInt8: 1,
+    paCustomFormat: 2,
+}
+
+
+def get_sample_size(format: int) -> int:
+    """
+    Returns the size of a single sample in bytes.
+
+    Args:
+        format (int): PortAudio sample format, e.g. paInt16.
+
+    Returns:
+        int: Bytes per sample.
+    """
+    if format not in SAMPLE_WIDTHS:
+        raise ValueError(f"Unknown audio format {format} (0x{format:x})")
+    return SAMPLE_WIDTHS[format]
+
+
+def get_format_from_width(width: int) -> int:
+    """
+    Returns the PortAudio sample format for a sample width in bytes.
+
+    Args:
+        width (int): Bytes per sample (1 to 4).
+
+    Returns:
+        int: PortAudio sample format.
+    """
+    formats = {1: paUInt8, 2: paInt16, 3: paInt24, 4: paFloat32}
+    if width not in formats:
+        raise ValueError(f"Invalid sample width {width}")
+    return formats[width]
@@ -0,0 +1,135 @@
+"""
+Audio Frame Module
+------------------
+A chunk of PCM audio that knows its own format.
+
+Engines traditionally put raw bytes into their queue and every consumer
+looks up the format with engine.get_stream_info(). An engine producing
+NumPy audio can put an AudioFrame instead: it keeps the array (no
+tobytes() copy) together with format, channels, sample rate and the
+sentence it belongs to. The frame travels through the queue, the player
+and the output sink as a view of that array and is converted into bytes
+or another sample format only where this is needed.
+
+- AudioFrame: The frame, `len(frame)` is its size in bytes like for raw chunks.
+- AUDIO_CHUNK_TYPES: Types of audio items in engine queues, everything
+  else (e.g. sentence markers, None) is control data.
+- get_duration(): Duration of a raw or framed audio chunk.
+"""
+
+from . import audio_formats
+import numpy as np
+
+# NumPy sample type of each PCM format
+DTYPES = {
+    audio_formats.paFloat32: np.float32,
+    audio_formats.paInt32: np.int32,
+    audio_formats.paInt16: np.int16,
+    audio_formats.paInt8: np.int8,
+    audio_formats.paUInt8: np.uint8,
+}
+
+
+class AudioFrame:
+    """
+    Interleaved PCM samples with their format and optional metadata.
+    """
+
+    __slots__ = ("samples", "format", "channels", "rate", "sentence", "start_time")
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        format: int,
+        channels: int,
+        rate: int,
+        sentence: str = None,
+        start_time: float = None,
+    ):
+        """
+        Args:
+            samples (np.ndarray): Interleaved samples of the type matching
+              format, e.g. int16 for paInt16. Not copied if contiguous.
+            format (int): PortAudio sample format.
+            channels (int): Number of interleaved channels.
+            rate (int): Sample rate in Hz.
+            sentence (str, optional): Text the audio belongs to.
+            start_time (float, optional): Position of the frame in seconds
+              from the start of the sentence's audio, on the same scale as
+              the engine's word timings.
+        """
+        if format not in DTYPES:
+            raise ValueError(f"Unsupported audio frame format {format} (0x{format:x})")
+        samples = np.ascontiguousarray(samples).reshape(-1)
+        if samples.dtype != DTYPES[format]:
+            raise ValueError(f"Samples of type {samples.dtype} don't match format {format} (0x{format:x})")
+        self.samples = samples
+        self.format = format
+        self.channels = channels
+        self.rate = rate
+        self.sentence = sentence
+        self.start_time = start_time
+
+    @classmethod
+    def from_bytes(cls, data: bytes, format: int, channels: int, rate: int, **metadata) -> "AudioFrame":
+        """Wraps raw audio data without copying it."""
+        return cls(np.frombuffer(data, dtype=DTYPES[format]), format, channels, rate, **metadata)
+
+    def __len__(self) -> int:
+        return self.samples.nbytes
+
+    def __bytes__(self) -> bytes:
+        return self.samples.tobytes()
+
+    @property
+    def data(self) -> memoryview:
+        """Read-only byte view of the samples, usable wherever bytes are accepted for writing."""
+        return memoryview(self.samples).cast("B").toreadonly()
+
+    @property
+    def frames(self) -> int:
+        """Number of samples per channel."""
+        return self.samples.size // self.channels
+
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds."""
+        return self.frames / self.rate
+
+    def convert(self, format: int) -> "AudioFrame":
+        """
+        Returns the frame in another sample format, the frame itself if it
+        already has it. float32 is mapped to the full 16 bit range and back.
+
+        Args:
+            format (int): paInt16 or paFloat32.
+        """
+        if format == self.format:
+            return self
+        if format == audio_formats.paInt16 and self.format == audio_formats.paFloat32:
+            samples = np.clip(self.samples, -1.0, 1.0)
+            samples *= 32767
+            samples = samples.astype(np.int16)
+        elif format == audio_formats.paFloat32 and self.format == audio_formats.paInt16:
+            samples = self.samples.astype(np.float32)
+            samples *= 1.0 / 32768
+        else:
+            raise ValueError(f"Can't convert audio frame from format {self.format} to {format}")
+        return AudioFrame(samples, format, self.channels, self.rate, self.sentence, self.start_time)
+
+
+AUDIO_CHUNK_TYPES = (bytes, bytearray, AudioFrame)
+
+
+def get_duration(chunk, bytes_per_second: float) -> float:
+    """
+    Returns the length of an audio chunk in seconds.
+
+    Args:
+        chunk (bytes or AudioFrame): The audio chunk.
+        bytes_per_second (float): Bytes per second of raw chunks, frames
+          use their own format.
+    """
+    if isinstance(chunk, AudioFrame):
+        return chunk.duration
+    return len(chunk) / bytes_per_second
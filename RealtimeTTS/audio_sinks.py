@@ -0,0 +1,325 @@
+"""
+Audio Sinks Module
+
+Destinations the StreamPlayer writes the played-out audio to. The default
+sink is the PyAudio output device (AudioStream in stream_player.py), the
+sinks here let the library run without any audio stack:
+
+  - AudioSink: Interface every sink implements.
+  - RingBufferSink: Keeps the audio in a bounded in-memory ring buffer to be read by the application.
+  - FileSink: Writes the audio to a WAV file (or raw bytes for mpeg streams).
+  - CallbackSink: Hands every chunk to a callable.
+
+Select a sink with the output_sink parameter of TextToAudioStream or
+AudioConfiguration.
+"""
+
+from . import audio_formats
+from typing import Callable
+import numpy as np
+import threading
+import logging
+import wave
+
+
+class AudioSink:
+    """
+    Interface for audio output destinations used by the StreamPlayer.
+
+    A sink is configured with the AudioConfiguration of the engine before
+    it is opened. `actual_sample_rate` holds the rate the sink consumes,
+    the player resamples if it differs from the engine rate.
+    """
+
+    def __init__(self):
+        self.config = None
+        self.actual_sample_rate = 0
+
+    def configure(self, config):
+        """
+        Assigns the audio configuration of the engine to the sink.
+
+        Args:
+            config (AudioConfiguration): Object containing audio settings.
+        """
+        self.config = config
+
+    def open_stream(self):
+        """Prepares the sink for writing."""
+        self.actual_sample_rate = self.config.rate
+
+    def start_stream(self):
+        """Starts consuming audio."""
+        pass
+
+    def stop_stream(self):
+        """Stops consuming audio."""
+        pass
+
+    def close_stream(self):
+        """Releases all resources held by the sink."""
+        pass
+
+    def abort_write(self):
+        """
+        Makes a write() blocked waiting for the output return right away and
+        drops further writes until the sink is started or stopped again.
+        """
+        pass
+
+    def output_latency(self) -> float:
+        """
+        Returns:
+            float: Seconds between writing audio and hearing it.
+        """
+        return 0.0
+
+    def set_paused(self, paused: bool):
+        """
+        Called when playback is paused or resumed. Sinks that keep consuming
+        audio on their own (like a callback mode output) play silence while paused.
+        """
+        pass
+
+    def is_stream_open(self) -> bool:
+        """
+        Returns:
+            bool: True if open_stream() was called and the sink was not closed since.
+        """
+        return self.actual_sample_rate != 0
+
+    def is_stream_active(self) -> bool:
+        """
+        Returns:
+            bool: True if the sink is currently consuming audio.
+        """
+        return self.is_stream_open()
+
+    def write(self, chunk: bytes):
+        """
+        Writes a chunk of audio data.
+
+        Args:
+            chunk (bytes): Audio data in the configured format.
+        """
+        raise NotImplementedError(
+            "The write method must be implemented by the derived class."
+        )
+
+
+class CallbackSink(AudioSink):
+    """
+    Hands every played-out chunk to a callable.
+    """
+
+    def __init__(self, callback: Callable[[bytes], None]):
+        """
+        Args:
+            callback (Callable): Called with each chunk of audio data.
+        """
+        super().__init__()
+        self.callback = callback
+
+    def write(self, chunk: bytes):
+        # Audio of engine frames arrives as memoryview
+        self.callback(bytes(chunk))
+
+
+class FileSink(AudioSink):
+    """
+    Writes the played-out audio to a file.
+
+    PCM audio is stored as WAV file (float32 audio is converted to 16 bit),
+    mpeg streams are written as raw bytes. The file stays open across play()
+    calls, so the audio of all of them is appended, until the application
+    calls close(). A play() with another stream format starts a new file.
+    """
+
+    def __init__(self, filename: str):
+        """
+        Args:
+            filename (str): Path of the output file.
+        """
+        super().__init__()
+        self.filename = filename
+        self.handle = None
+        self.file = None
+        self.file_format = None
+        self.is_wave = False
+
+    def open_stream(self):
+        super().open_stream()
+        file_format = (self.config.format, self.config.channels, self.config.rate)
+        if self.file:
+            if file_format == self.file_format:
+                return
+            logging.warning(f"stream format of {self.filename} changed, starting a new file")
+            self.close()
+        self.file_format = file_format
+
+        is_mpeg = (
+            self.config.format == audio_formats.paCustomFormat
+            and self.config.channels == -1
+            and self.config.rate == -1
+        )
+        self.handle = open(self.filename, "wb")
+        if is_mpeg or self.config.format == audio_formats.paCustomFormat:
+            self.file = self.handle
+            self.is_wave = False
+        else:
+            self.file = wave.open(self.handle, "wb")
+            self.file.setnchannels(self.config.channels)
+            if self.config.format == audio_formats.paFloat32:
+                self.file.setsampwidth(2)
+            else:
+                self.file.setsampwidth(audio_formats.get_sample_size(self.config.format))
+            self.file.setframerate(self.config.rate)
+            self.is_wave = True
+
+    def close_stream(self):
+        # Called by the player at the end of every play(), the file stays
+        # open for the next one (wave keeps its header up to date)
+        if self.handle:
+            self.handle.flush()
+        self.actual_sample_rate = 0
+
+    def close(self):
+        """Closes the file, the next write starts a new one."""
+        if self.file:
+            self.file.close()
+            self.handle.close()
+            self.file = None
+            self.handle = None
+        self.actual_sample_rate = 0
+
+    def write(self, chunk: bytes):
+        if not self.file:
+            self.open_stream()
+
+        if self.is_wave:
+            if self.config.format == audio_formats.paFloat32:
+                audio_data = np.frombuffer(chunk, dtype=np.float32)
+                chunk = (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+            self.file.writeframes(chunk)
+        else:
+            self.file.write(chunk)
+
+
+class RingBufferSink(AudioSink):
+    """
+    Keeps the played-out audio in a bounded in-memory ring buffer that the
+    application reads from, e.g. to forward it over a network connection.
+
+    When the buffer is full, write() blocks until the reader made room
+    (or, with overwrite=True, drops the oldest audio).
+    """
+
+    def __init__(self, capacity_bytes: int = 1024 * 1024, overwrite: bool = False):
+        """
+        Args:
+            capacity_bytes (int): Size of the ring buffer in bytes.
+            overwrite (bool): If True, a full buffer drops the oldest audio
+              instead of blocking the writer. Defaults to False.
+        """
+        super().__init__()
+        self.capacity = capacity_bytes
+        self.overwrite = overwrite
+        self.buffer = bytearray(capacity_bytes)
+        self.read_pos = 0
+        self.size = 0
+        self.dropped_bytes = 0
+        self.closed = False
+        self.aborted = False
+        self.condition = threading.Condition()
+
+    def open_stream(self):
+        super().open_stream()
+        with self.condition:
+            self.closed = False
+            self.aborted = False
+
+    def start_stream(self):
+        with self.condition:
+            self.aborted = False
+
+    def stop_stream(self):
+        with self.condition:
+            self.aborted = False
+
+    def abort_write(self):
+        # A write() waiting for a reader that went away returns right away
+        with self.condition:
+            self.aborted = True
+            self.condition.notify_all()
+
+    def close_stream(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.actual_sample_rate = 0
+
+    def clear(self):
+        """Discards all buffered audio."""
+        with self.condition:
+            self.read_pos = 0
+            self.size = 0
+            self.condition.notify_all()
+
+    def available(self) -> int:
+        """
+        Returns:
+            int: Number of bytes ready to be read.
+        """
+        with self.condition:
+            return self.size
+
+    def write(self, chunk: bytes):
+        view = memoryview(chunk)
+        with self.condition:
+            while len(view) > 0 and not self.aborted:
+                free = self.capacity - self.size
+                if free == 0:
+                    if self.overwrite:
+                        drop = min(len(view), self.capacity)
+                        self.read_pos = (self.read_pos + drop) % self.capacity
+                        self.size -= drop
+                        self.dropped_bytes += drop
+                        continue
+                    if self.closed:
+                        return
+                    self.condition.wait(0.05)
+                    continue
+
+                count = min(free, len(view))
+                write_pos = (self.read_pos + self.size) % self.capacity
+                first = min(count, self.capacity - write_pos)
+                self.buffer[write_pos:write_pos + first] = view[:first]
+                self.buffer[:count - first] = view[first:count]
+                self.size += count
+                view = view[count:]
+                self.condition.notify_all()
+
+    def read(self, max_bytes: int = -1, timeout: float = None) -> bytes:
+        """
+        Reads buffered audio.
+
+        Args:
+            max_bytes (int): Maximum number of bytes to read, -1 for all.
+            timeout (float): Seconds to wait for data if the buffer is empty.
+              None waits until data arrives or the sink is closed.
+
+        Returns:
+            bytes: The audio data (empty if nothing arrived in time).
+        """
+        with self.condition:
+            if self.size == 0 and not self.closed:
+                self.condition.wait_for(lambda: self.size > 0 or self.closed, timeout)
+
+            count = self.size if max_bytes < 0 else min(max_bytes, self.size)
+            first = min(count, self.capacity - self.read_pos)
+            data = bytes(self.buffer[self.read_pos:self.read_pos + first])
+            data += bytes(self.buffer[:count - first])
+            self.read_pos = (self.read_pos + count) % self.capacity
+            self.size -= count
+            self.condition.notify_all()
+            return data
@@ -0,0 +1,212 @@
+"""
+Batch Render Module
+-------------------
+Offline bulk synthesis of complete documents (audiobooks, IVR prompt sets)
+into audio files, without a player and without real-time pacing.
+
+- render(texts, out_dir, engine, workers, format): Splits the documents into
+  sentences, synthesizes them (in a process pool with one engine per worker
+  if workers > 1) and writes one WAV or FLAC file per document.
+
+Engines can't be sent to other processes, so for workers > 1 `engine` has
+to be a picklable callable creating the engine, e.g.
+functools.partial(KokoroEngine, voice="af_heart"). The pool uses the
+"spawn" start method, so the calling script needs an
+`if __name__ == "__main__":` guard.
+
+Usage:
+    paths = render(
+        {"chapter1": chapter1_text, "chapter2": chapter2_text},
+        "audiobook",
+        engine=functools.partial(KokoroEngine, voice="af_heart"),
+        workers=4,
+        format="flac",
+    )
+"""
+
+from .sentence_tokenizers import get_sentence_tokenizer
+from .sentence_cache import CacheRecorder
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple, Union
+from .engines import BaseEngine
+from . import audio_formats
+import multiprocessing.util
+import numpy as np
+import logging
+import wave
+import io
+import os
+
+# Engine of a pool worker process, created by _init_worker
+_worker_engine = None
+
+
+def _init_worker(engine_factory: Callable[[], BaseEngine]):
+    """Creates the engine of a pool worker, shut down when the worker exits."""
+    global _worker_engine
+    _worker_engine = engine_factory()
+    multiprocessing.util.Finalize(None, _worker_engine.shutdown, exitpriority=10)
+
+
+def _synthesize_in_worker(sentence: str) -> Tuple[int, int, bytes]:
+    return _synthesize_pcm(_worker_engine, sentence)
+
+
+def _synthesize_pcm(engine: BaseEngine, sentence: str) -> Tuple[int, int, bytes]:
+    """
+    Synthesizes a sentence into 16 bit PCM.
+
+    Returns:
+        tuple: Sample rate, channels and audio data.
+    """
+    recorder = CacheRecorder()
+    with engine.redirect_output(recorder):
+        success = engine.synthesize(sentence)
+    while not engine.timings.empty():
+        engine.timings.get_nowait()
+    if not success:
+        raise RuntimeError(f'engine {engine.engine_name} failed to synthesize sentence "{sentence}"')
+
+    audio = b"".join(recorder.chunks)
+    format, channels, rate = engine.get_stream_info()
+
+    if format == audio_formats.paCustomFormat:
+        # pydub is only needed for mp3 engines and FLAC output
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(io.BytesIO(audio), format="mp3").set_sample_width(2)
+        return segment.frame_rate, segment.channels, segment.raw_data
+    if format == audio_formats.paFloat32:
+        audio_data = np.frombuffer(audio, dtype=np.float32)
+        return rate, channels, (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+    if format == audio_formats.paInt16:
+        return rate, channels, audio
+    raise ValueError(f"Unsupported stream format of engine {engine.engine_name}: {format}")
+
+
+class _DocumentWriter:
+    """Writes the sentences of one document into a WAV file, converted to FLAC on close."""
+
+    def __init__(self, path: str, format: str):
+        self.path = path
+        self.format = format
+        self.wav_path = path if format == "wav" else path + ".tmp.wav"
+        self.file = None
+        self.silence = b""
+
+    def write(self, rate: int, channels: int, audio: bytes, silence_duration: float):
+        if self.file is None:
+            self.file = wave.open(self.wav_path, "wb")
+            self.file.setnchannels(channels)
+            self.file.setsampwidth(2)
+            self.file.setframerate(rate)
+        elif self.silence:
+            self.file.writeframes(self.silence)
+        self.file.writeframes(audio)
+        self.silence = b"\0\0" * channels * int(rate * silence_duration)
+
+    def close(self) -> bool:
+        """Returns True if the document had audio and a file was written."""
+        if self.file is None:
+            return False
+        self.file.close()
+        if self.format != "wav":
+            from pydub import AudioSegment
+            AudioSegment.from_wav(self.wav_path).export(self.path, format=self.format)
+            os.remove(self.wav_path)
+        return True
+
+
+def render(
+    texts: Union[str, List[str], Dict[str, str]],
+    out_dir: str,
+    engine: Union[BaseEngine, Callable[[], BaseEngine]],
+    workers: int = 1,
+    format: str = "wav",
+    tokenizer: str = "nltk",
+    language: str = "en",
+    tokenize_sentences: Callable[[str], List[str]] = None,
+    sentence_silence_duration: float = 0.0,
+) -> List[str]:
+    """
+    Renders documents into audio files.
+
+    Args:
+        texts (str, list or dict): A document, a list of documents (files
+          are named by index, e.g. 0000.wav) or a dict of file name to
+          document.
+        out_dir (str): Directory the files are written to, created if needed.
+        engine (BaseEngine or Callable): The engine, or a picklable callable
+          creating it. With workers > 1 it has to be a callable, every worker
+          process creates its own engine.
+        workers (int): Number of worker processes. 1 synthesizes in the
+          calling process.
+        format (str): "wav" or "flac" (FLAC is encoded with ffmpeg via pydub).
+          Audio is stored as 16 bit PCM.
+        tokenizer (str): Sentence tokenizer, "nltk", "stanza" or "fast".
+        language (str): Language code for sentence splitting.
+        tokenize_sentences (Callable, optional): Custom function splitting a
+          text into sentences.
+        sentence_silence_duration (float): Seconds of silence inserted
+          between sentences.
+
+    Returns:
+        List[str]: Paths of the written files in document order, None for
+          documents without any text.
+    """
+    format = format.lower()
+    if format not in ("wav", "flac"):
+        raise ValueError(f"Unsupported format: {format}, use wav or flac")
+
+    if isinstance(texts, str):
+        texts = [texts]
+    if isinstance(texts, dict):
+        names, documents = list(texts.keys()), list(texts.values())
+    else:
+        documents = list(texts)
+        names = [f"{index:04d}" for index in range(len(documents))]
+
+    tokenize_sentences = tokenize_sentences or get_sentence_tokenizer(tokenizer, language)
+    document_sentences = [
+        [sentence.strip() for sentence in tokenize_sentences(text) if sentence.strip()]
+        for text in documents
+    ]
+    sentences = [sentence for doc in document_sentences for sentence in doc]
+    logging.info(f"rendering {len(sentences)} sentences of {len(documents)} documents")
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    executor = None
+    local_engine = None
+    if workers > 1:
+        if isinstance(engine, BaseEngine):
+            raise ValueError("workers > 1 needs a callable creating the engine, not an engine instance")
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(engine,),
+        )
+        results = executor.map(_synthesize_in_worker, sentences)
+    else:
+        local_engine = engine if isinstance(engine, BaseEngine) else engine()
+        results = (_synthesize_pcm(local_engine, sentence) for sentence in sentences)
+
+    paths = []
+    try:
+        for name, doc in zip(names, document_sentences):
+            path = os.path.join(out_dir, f"{name}.{format}")
+            writer = _DocumentWriter(path, format)
+            try:
+                for _ in doc:
+                    rate, channels, audio = next(results)
+                    writer.write(rate, channels, audio, sentence_silence_duration)
+            finally:
+                written = writer.close()
+            paths.append(path if written else None)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if local_engine is not None and local_engine is not engine:
+            local_engine.shutdown()
+
+    return paths
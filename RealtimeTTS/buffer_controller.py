@@ -0,0 +1,274 @@
+"""
+Buffer Controller Module
+------------------------
+Decides how many sentences are merged into one synthesis call, based on
+measured engine performance instead of a fixed buffer threshold.
+
+- AdaptiveBufferController: Learns the engine's per-call overhead (time to
+  first audio), real-time factor and speech rate, tracks how much audio is
+  queued ahead of playback and merges sentences while that is safe and worth it.
+- SynthesisProbe: Output target that measures a single synthesize() call.
+
+Merging saves a call's overhead per merged sentence, which matters for cloud
+engines with HTTP round-trips, but delays the first audio of the merged text.
+The controller merges only while the queued audio covers that delay, and
+yields every sentence on its own as soon as the buffer runs low.
+"""
+
+from .audio_frame import AUDIO_CHUNK_TYPES, get_duration
+from . import audio_formats
+import threading
+import time
+
+# Bytes per second assumed for compressed (mpeg) streams, 128 kbit/s
+COMPRESSED_BYTES_PER_SECOND = 16000
+
+
+def get_bytes_per_second(format: int, channels: int, rate: int) -> int:
+    """
+    Returns the number of bytes per second of audio for a stream format.
+
+    Args:
+        format (int): PortAudio sample format.
+        channels (int): Number of channels, -1 for mpeg.
+        rate (int): Sample rate, -1 for mpeg.
+
+    Returns:
+        int: Bytes per second (an estimate for compressed streams).
+    """
+    if format == audio_formats.paCustomFormat or rate <= 0 or channels <= 0:
+        return COMPRESSED_BYTES_PER_SECOND
+    return audio_formats.get_sample_size(format) * channels * rate
+
+
+class SynthesisProbe:
+    """
+    Forwards the audio chunks of one synthesize() call to the current
+    output target and measures time to first chunk and audio length.
+    """
+
+    def __init__(self, target, controller, bytes_per_second: int):
+        """
+        Args:
+            target: Output target the chunks are forwarded to.
+            controller (AdaptiveBufferController): Receives the measurements.
+            bytes_per_second (int): Bytes per second of audio of the engine.
+        """
+        self.target = target
+        self.controller = controller
+        self.bytes_per_second = bytes_per_second
+        self.start_time = time.time()
+        self.first_chunk_time = None
+        self.audio_seconds = 0.0
+
+    def put(self, chunk, block: bool = True, timeout: float = None):
+        """
+        Measures the chunk and forwards it to the target.
+
+        Args:
+            chunk: Audio data chunk.
+            block, timeout: Accepted for queue.Queue compatibility, ignored.
+        """
+        if isinstance(chunk, AUDIO_CHUNK_TYPES) and len(chunk):
+            if self.first_chunk_time is None:
+                self.first_chunk_time = time.time()
+            seconds = get_duration(chunk, self.bytes_per_second)
+            self.audio_seconds += seconds
+            self.controller.add_audio(seconds)
+        self.target.put(chunk)
+
+    def put_nowait(self, chunk):
+        """Measures the chunk and forwards it to the target."""
+        self.put(chunk)
+
+    def finish(self, text: str, success: bool):
+        """
+        Reports the measurements of the finished call to the controller.
+
+        Args:
+            text (str): The synthesized text.
+            success (bool): Whether synthesis succeeded.
+        """
+        if not success or self.first_chunk_time is None:
+            return
+        end_time = time.time()
+        self.controller.record_synthesis(
+            chars=len(text),
+            first_chunk_latency=self.first_chunk_time - self.start_time,
+            duration=end_time - self.start_time,
+            audio_seconds=self.audio_seconds,
+        )
+
+
+class AdaptiveBufferController:
+    """
+    Merges sentences into larger synthesis calls when the engine's per-call
+    overhead is high and enough audio is queued, and yields single sentences
+    when playback is close to running dry.
+
+    Engine statistics are exponential moving averages and are kept across
+    play() calls, the playout estimate is reset for every play() call.
+    """
+
+    def __init__(
+        self,
+        safety_margin: float = 0.3,
+        overhead_share: float = 0.2,
+        max_merge_seconds: float = 8.0,
+        smoothing: float = 0.3,
+        initial_overhead: float = 0.3,
+        initial_rtf: float = 0.3,
+        initial_seconds_per_char: float = 0.065,
+    ):
+        """
+        Args:
+            safety_margin (float): Seconds of queued audio that must remain
+              when the merged text's audio starts arriving.
+            overhead_share (float): Targeted share of the per-call overhead in
+              a call's total synthesis time. Lower values merge more.
+            max_merge_seconds (float): Upper limit for the predicted audio
+              length of merged text.
+            smoothing (float): Weight of a new measurement in the moving averages.
+            initial_overhead (float): Assumed seconds to first audio before
+              the first measurement.
+            initial_rtf (float): Assumed real-time factor (synthesis seconds
+              per audio second) before the first measurement.
+            initial_seconds_per_char (float): Assumed seconds of speech per
+              character before the first measurement.
+        """
+        self.safety_margin = safety_margin
+        self.overhead_share = overhead_share
+        self.max_merge_seconds = max_merge_seconds
+        self.smoothing = smoothing
+        self.overhead = initial_overhead
+        self.rtf = initial_rtf
+        self.seconds_per_char = initial_seconds_per_char
+        self.arrival_interval = 0.0
+        self.sentence_chars = 0.0
+        self.measurements = 0
+        self.playout_end = 0.0
+        self.last_arrival = None
+        self.lock = threading.Lock()
+
+    def _smooth(self, current: float, value: float) -> float:
+        return current + self.smoothing * (value - current)
+
+    def reset(self):
+        """Resets the playout estimate at the start of a play() call."""
+        with self.lock:
+            self.playout_end = 0.0
+            self.last_arrival = None
+
+    def probe(self, target, bytes_per_second: int) -> SynthesisProbe:
+        """
+        Creates a probe measuring one synthesize() call.
+
+        Args:
+            target: Output target the probe forwards the chunks to.
+            bytes_per_second (int): Bytes per second of audio of the engine.
+        """
+        return SynthesisProbe(target, self, bytes_per_second)
+
+    def add_audio(self, seconds: float):
+        """
+        Extends the playout estimate by audio that was handed to the player.
+        Playback is assumed to run in real time from the moment audio arrives.
+        """
+        with self.lock:
+            now = time.time()
+            self.playout_end = max(self.playout_end, now) + seconds
+
+    def buffered_seconds(self) -> float:
+        """
+        Returns:
+            float: Estimated seconds of audio queued ahead of playback.
+        """
+        with self.lock:
+            return max(0.0, self.playout_end - time.time())
+
+    def record_synthesis(
+        self,
+        chars: int,
+        first_chunk_latency: float,
+        duration: float,
+        audio_seconds: float,
+    ):
+        """
+        Updates the engine statistics with a finished synthesis call.
+
+        Args:
+            chars (int): Number of synthesized characters.
+            first_chunk_latency (float): Seconds until the first chunk arrived.
+            duration (float): Seconds the call took.
+            audio_seconds (float): Seconds of audio produced.
+        """
+        if audio_seconds <= 0 or chars <= 0:
+            return
+        with self.lock:
+            self.overhead = self._smooth(self.overhead, first_chunk_latency)
+            self.rtf = self._smooth(
+                self.rtf, max(0.0, duration - first_chunk_latency) / audio_seconds
+            )
+            self.seconds_per_char = self._smooth(
+                self.seconds_per_char, audio_seconds / chars
+            )
+            self.measurements += 1
+
+    def record_sentence_arrival(self, chars: int):
+        """
+        Updates the average interval between incoming sentences and their length.
+
+        Args:
+            chars (int): Length of the arrived sentence.
+        """
+        with self.lock:
+            now = time.time()
+            if self.last_arrival is not None:
+                self.arrival_interval = self._smooth(
+                    self.arrival_interval, now - self.last_arrival
+                )
+                self.sentence_chars = self._smooth(self.sentence_chars, chars)
+            else:
+                self.sentence_chars = self.sentence_chars or chars
+            self.last_arrival = now
+
+    def merge_target_seconds(self) -> float:
+        """
+        Returns:
+            float: Audio length a call should produce so the per-call
+              overhead stays within overhead_share of its synthesis time.
+        """
+        with self.lock:
+            target = (
+                self.overhead * (1 - self.overhead_share)
+                / (self.overhead_share * max(self.rtf, 0.01))
+            )
+        return min(target, self.max_merge_seconds)
+
+    def should_yield(self, pending_chars: int) -> bool:
+        """
+        Decides whether the accumulated text should be synthesized now.
+
+        Args:
+            pending_chars (int): Length of the accumulated text.
+
+        Returns:
+            bool: True to synthesize the text now, False to merge it with
+              the next sentence.
+        """
+        buffered = self.buffered_seconds()
+        target = self.merge_target_seconds()
+        with self.lock:
+            pending_audio = pending_chars * self.seconds_per_char
+            if pending_audio >= target:
+                return True
+
+            # Waiting for the next sentence and synthesizing both must not
+            # let playback run dry
+            merged_audio = pending_audio + self.sentence_chars * self.seconds_per_char
+            time_needed = (
+                self.arrival_interval
+                + self.overhead
+                + self.rtf * merged_audio
+            )
+            return buffered - time_needed < self.safety_margin
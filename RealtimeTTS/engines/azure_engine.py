@@ -4,7 +4,10 @@ from .base_engine import BaseEngine, TimingInfo
 from typing import Union
 import traceback 
 import requests
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import logging
 
 
@@ -168,7 +171,7 @@ class AzureEngine(BaseEngine):
         """
         return pyaudio.paInt16, 1, self.sample_rate
 
-    def _handle_word_boundary(self, evt):
+    def _handle_word_boundary(self, evt, timings=None):
         try:
             import time
             current_time = time.time()
@@ -195,7 +198,7 @@ class AzureEngine(BaseEngine):
                 end_time + self.audio_duration,
                 word
             )
-            self.timings.put(timingInfo)
+            (self.timings if timings is None else timings).put(timingInfo)
 
         except Exception as e:
             traceback.print_exc()
@@ -222,8 +225,12 @@ class AzureEngine(BaseEngine):
             speech_config=speech_config, audio_config=stream_config
         )
 
-        # Initialize word timings list and register the word-boundary callback.
-        speech_synthesizer.synthesis_word_boundary.connect(self._handle_word_boundary)
+        # Register the word-boundary callback. It runs on an SDK thread, so the
+        # timings target of this thread (see redirect_output) is passed along.
+        timings = self.timings
+        speech_synthesizer.synthesis_word_boundary.connect(
+            lambda evt: self._handle_word_boundary(evt, timings)
+        )
 
         emotion_start_tag = f'<mstts:express-as style="{self.emotion}" styledegree="{self.emotion_degree}" role="{self.emotion_role}">'
         emotion_end_tag = "</mstts:express-as>"
@@ -1,17 +1,23 @@
 """
 This module defines a base framework for speech synthesis engines. It includes:
 - A TimingInfo class to capture timing details (start, end, and word) of audio segments.
+- An AudioChunkQueue class, the engine's audio queue, which tracks the buffered bytes and can block producers above a limit.
 - A BaseEngine abstract class (using a custom metaclass) that sets up default properties and common audio processing methods (such as applying fade-ins/outs and trimming silence) along with abstract methods for voice management and synthesis.
 """
 
 import torch.multiprocessing as mp
+from ..audio_frame import AUDIO_CHUNK_TYPES
+from contextlib import contextmanager
 from abc import ABCMeta, ABC
 from typing import Union
 import numpy as np
+import threading
 import shutil
 import queue
 
 class TimingInfo:
+    __slots__ = ("start_time", "end_time", "word")
+
     def __init__(self, start_time, end_time, word):
         self.start_time = start_time
         self.end_time = end_time
@@ -20,6 +26,90 @@ class TimingInfo:
     def __str__(self):
         return f"Word: {self.word}, Start Time: {self.start_time}, End Time: {self.end_time}"
 
+class AudioChunkQueue(queue.Queue):
+    """
+    Queue of audio chunks that keeps count of the buffered audio bytes.
+
+    If max_buffered_bytes is greater than 0, put() of an audio chunk blocks
+    while that much audio is buffered, so a fast engine is throttled to the
+    speed of playback instead of filling memory. max_buffered_chunks does the
+    same for the number of buffered chunks. Markers and other non-audio
+    items are never blocked and not counted.
+    """
+
+    def __init__(self, max_buffered_bytes: int = 0, max_buffered_chunks: int = 0):
+        """
+        Args:
+            max_buffered_bytes (int): Buffered audio bytes above which
+              producers are blocked. 0 means unbounded.
+            max_buffered_chunks (int): Buffered audio chunks at which
+              producers are blocked. 0 means unbounded.
+        """
+        super().__init__()
+        self.max_buffered_bytes = max_buffered_bytes
+        self.max_buffered_chunks = max_buffered_chunks
+        self.buffered_bytes = 0
+        self.buffered_chunks = 0
+        self.space_available = threading.Condition(self.mutex)
+
+    def _put(self, item):
+        super()._put(item)
+        if isinstance(item, AUDIO_CHUNK_TYPES):
+            self.buffered_bytes += len(item)
+            self.buffered_chunks += 1
+
+    def _get(self):
+        item = super()._get()
+        if isinstance(item, AUDIO_CHUNK_TYPES):
+            self.buffered_bytes -= len(item)
+            self.buffered_chunks -= 1
+            self.space_available.notify_all()
+        return item
+
+    def _is_full(self) -> bool:
+        """True while a limit is reached. Caller holds the mutex."""
+        return (
+            (self.max_buffered_bytes > 0 and self.buffered_bytes >= self.max_buffered_bytes)
+            or (self.max_buffered_chunks > 0 and self.buffered_chunks >= self.max_buffered_chunks)
+        )
+
+    def put(self, item, block: bool = True, timeout: float = None):
+        """
+        Puts an item into the queue, waiting for playback to catch up
+        first if it is an audio chunk and the buffer is full.
+
+        Raises:
+            queue.Full: If the buffer stayed full for timeout seconds.
+        """
+        if not (self.max_buffered_bytes > 0 or self.max_buffered_chunks > 0) or not isinstance(item, AUDIO_CHUNK_TYPES):
+            super().put(item, block, timeout)
+            return
+
+        # Check and insert under the same lock, so concurrent producers
+        # (pool or look-ahead workers) can't exceed the limit together
+        with self.space_available:
+            if not block:
+                if self._is_full():
+                    raise queue.Full
+            elif not self.space_available.wait_for(lambda: not self._is_full(), timeout):
+                raise queue.Full
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def set_max_buffered_bytes(self, max_buffered_bytes: int):
+        """Changes the limit, waking up blocked producers. 0 means unbounded."""
+        with self.space_available:
+            self.max_buffered_bytes = max_buffered_bytes
+            self.space_available.notify_all()
+
+    def set_max_buffered_chunks(self, max_buffered_chunks: int):
+        """Changes the chunk limit, waking up blocked producers. 0 means unbounded."""
+        with self.space_available:
+            self.max_buffered_chunks = max_buffered_chunks
+            self.space_available.notify_all()
+
+
 # Define a meta class that will automatically call the BaseEngine's __init__ method
 # and also the post_init method if it exists.
 class BaseInitMeta(ABCMeta):
@@ -46,8 +136,14 @@ class BaseEngine(ABC, metaclass=BaseInitMeta):
         # Indicates if the engine can handle generators.
         self.can_consume_generators = False
 
+        # Indicates if synthesize() may be called from several threads at once.
+        self.can_synthesize_concurrently = False
+
+        # Per-thread output targets installed by redirect_output().
+        self._output_redirects = threading.local()
+
         # Queue to manage audio chunks for the engine.
-        self.queue = queue.Queue()
+        self.queue = AudioChunkQueue()
 
         # Queue to manage word level timings for the engine.
         self.timings = queue.Queue()
@@ -62,6 +158,89 @@ class BaseEngine(ABC, metaclass=BaseInitMeta):
 
         self.reset_audio_duration()
 
+    @property
+    def queue(self):
+        """
+        The queue the engine pushes its audio chunks into.
+
+        Returns the output target installed with redirect_output() for the
+        calling thread, otherwise the engine's own queue.
+        """
+        redirects = self.__dict__.get("_output_redirects")
+        target = getattr(redirects, "target", None)
+        if target is not None:
+            return target
+        return self._queue
+
+    @queue.setter
+    def queue(self, value):
+        self._queue = value
+
+    @property
+    def timings(self):
+        """
+        The queue the engine pushes its word timings into.
+
+        Returns the timings target installed with redirect_output() for the
+        calling thread, otherwise the engine's own timings queue.
+        """
+        redirects = self.__dict__.get("_output_redirects")
+        target = getattr(redirects, "timings", None)
+        if target is not None:
+            return target
+        return self._timings
+
+    @timings.setter
+    def timings(self, value):
+        self._timings = value
+
+    @contextmanager
+    def redirect_output(self, target, timings=None):
+        """
+        Routes the audio chunks produced on the calling thread into target
+        instead of the engine's queue.
+
+        Args:
+            target: Any object with a put() method, e.g. a queue.Queue.
+            timings (optional): Object with a put() method receiving the word
+              timings produced on the calling thread. None keeps the current
+              timings target. Engines reporting timings from another thread
+              have to read self.timings on the synthesizing thread.
+        """
+        redirects = self._output_redirects
+        previous = getattr(redirects, "target", None)
+        previous_timings = getattr(redirects, "timings", None)
+        redirects.target = target
+        if timings is not None:
+            redirects.timings = timings
+        try:
+            yield target
+        finally:
+            redirects.target = previous
+            redirects.timings = previous_timings
+
+    def set_max_buffered_bytes(self, max_buffered_bytes: int):
+        """
+        Bounds the audio waiting in the engine's own queue, synthesize()
+        blocks while more is buffered (see AudioChunkQueue).
+
+        Args:
+            max_buffered_bytes (int): Byte limit, 0 removes the bound.
+        """
+        if isinstance(self._queue, AudioChunkQueue):
+            self._queue.set_max_buffered_bytes(max_buffered_bytes)
+
+    def set_max_buffered_chunks(self, max_buffered_chunks: int):
+        """
+        Bounds the number of audio chunks waiting in the engine's own queue,
+        synthesize() blocks while that many are buffered (see AudioChunkQueue).
+
+        Args:
+            max_buffered_chunks (int): Chunk limit, 0 removes the bound.
+        """
+        if isinstance(self._queue, AudioChunkQueue):
+            self._queue.set_max_buffered_chunks(max_buffered_chunks)
+
     def reset_audio_duration(self):
         """
         Resets the audio duration to 0.
@@ -268,6 +447,42 @@ class BaseEngine(ABC, metaclass=BaseInitMeta):
             "The set_voice_parameters method must be implemented by the derived class."
         )
 
+    def get_voice_parameters(self) -> dict:
+        """
+        Returns the settings that influence the synthesized audio,
+        used to tell cached audio of different voices apart.
+
+        The default implementation collects the common voice attributes of
+        the engines. Derived classes with other settings should override it,
+        setters changing the voice have to keep these attributes up to date.
+
+        Returns:
+            dict: Mapping of setting name to a string representation of its
+              value. None if the engine can't describe its current voice,
+              its audio is not cached then.
+        """
+        parameters = {}
+        for name in ("voice", "current_voice"):
+            if hasattr(self, name):
+                parameters[name] = repr(getattr(self, name))
+
+        # Plain settings only, attributes like "model" may hold model objects
+        for name in (
+            "voice_name", "id", "model", "model_name", "specific_model",
+            "language", "speed", "rate", "pitch", "volume", "emotion",
+            "emotion_degree", "emotion_role", "stability", "clarity",
+            "style_exxageration", "instructions", "temperature",
+            "voice_prompt", "cloning_reference_wav", "ref_audio_path",
+            "model_checkpoint_path",
+        ):
+            value = getattr(self, name, None)
+            if isinstance(value, (str, int, float, bool)) or (
+                isinstance(value, (list, tuple))
+                and all(isinstance(item, (str, int, float, bool)) for item in value)
+            ):
+                parameters[name] = repr(value)
+        return parameters
+
     def shutdown(self):
         """
         Shuts down the engine.
@@ -9,7 +9,10 @@ import numpy as np
 import traceback
 import requests
 import logging
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import torch
 import time
 import json
@@ -817,6 +820,8 @@ class CoquiEngine(BaseEngine):
         # Wait for the response from the worker process
         status, result = self.parent_synthesize_pipe.recv()
         if status == "success":
+            # Part of the sentence cache key (get_voice_parameters)
+            self.cloning_reference_wav = cloning_reference_wav
             logging.info("Reference WAV updated successfully")
         else:
             logging.error(f"Error updating reference WAV: {cloning_reference_wav}")
@@ -832,6 +837,7 @@ class CoquiEngine(BaseEngine):
         # Wait for the response from the worker process
         status, result = self.parent_synthesize_pipe.recv()
         if status == "success":
+            self.speed = speed
             logging.info("Speed updated successfully")
         else:
             logging.error("Error updating speed")
@@ -5,7 +5,10 @@ from typing import Union
 import queue
 import threading
 import subprocess
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import asyncio
 
 
@@ -70,6 +73,7 @@ class EdgeEngine(BaseEngine):
 
     def post_init(self):
         self.engine_name = "edge"
+        self.can_synthesize_concurrently = True
 
     def get_stream_info(self):
         """
@@ -105,13 +109,17 @@ class EdgeEngine(BaseEngine):
         )        
         # Create queue for passing chunks between async and sync code
         chunk_queue = queue.Queue()
-        
+
+        # Resolve the output queue on the calling thread so redirected output
+        # keeps working inside the streaming thread below
+        output_queue = self.queue
+
         # Function to run async stream in separate thread
         async def process_stream():
             try:
                 async for chunk in communicate.stream():
                     if chunk["type"] == "audio":
-                        self.queue.put(chunk["data"])
+                        output_queue.put(chunk["data"])
             except Exception as e:
                 print(f"Stream processing error: {e}")
                 chunk_queue.put(None)
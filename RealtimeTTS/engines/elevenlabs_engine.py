@@ -2,7 +2,10 @@ from elevenlabs.client import ElevenLabs
 from typing import Union
 from .base_engine import BaseEngine
 import logging
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import os
 import traceback
 
@@ -67,6 +70,7 @@ class ElevenlabsEngine(BaseEngine):
     def post_init(self):
         """Set engine name and generator consumption capability."""
         self.can_consume_generators = False
+        self.can_synthesize_concurrently = True
         self.engine_name = "elevenlabs"
 
     def get_stream_info(self):
@@ -5,7 +5,10 @@ import tempfile
 import wave
 import os
 import io
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 from gtts import gTTS
 import gtts.lang
 
@@ -6,11 +6,15 @@ Requires:
 """
 
 from .base_engine import BaseEngine, TimingInfo
+from ..audio_frame import AudioFrame
 from queue import Queue
 from typing import List, Union
 import numpy as np
 import traceback
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import time
 
 # Make sure torch is installed
@@ -371,10 +375,10 @@ class KokoroEngine(BaseEngine):
                             fade_in_ms=self.fade_in_ms,
                             fade_out_ms=self.fade_out_ms,
                         )
-                    audio_int16 = (audio_float32 * 32767).astype(np.int16).tobytes()
-                    audio_length_in_seconds = len(audio_float32) / 24000
-                    self.audio_duration += audio_length_in_seconds
-                    self.queue.put(audio_int16)
+                    audio_int16 = (audio_float32 * 32767).astype(np.int16)
+                    frame = AudioFrame(audio_int16, pyaudio.paInt16, 1, 24000, sentence=text, start_time=self.audio_duration)
+                    self.audio_duration += frame.duration
+                    self.queue.put(frame)
 
                 if self.debug:
                     duration = time.time() - start_time
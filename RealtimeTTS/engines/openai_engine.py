@@ -1,7 +1,10 @@
 from .base_engine import BaseEngine
 from openai import OpenAI
 from typing import Union
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import time
 
 # ANSI escape codes for colors
@@ -72,6 +75,7 @@ class OpenAIEngine(BaseEngine):
 
     def post_init(self):
         self.engine_name = "openai"
+        self.can_synthesize_concurrently = True
 
     def get_stream_info(self):
         """
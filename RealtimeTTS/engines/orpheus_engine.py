@@ -1,7 +1,10 @@
 import json
 import time
 import logging
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import requests
 import traceback
 import numpy as np
@@ -3,7 +3,10 @@ from transformers import AutoTokenizer
 from .base_engine import BaseEngine
 from threading import Thread
 from typing import Union
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import torch
 import time
 
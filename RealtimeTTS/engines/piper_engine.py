@@ -1,7 +1,10 @@
 import os
 import wave
 import tempfile
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import shutil
 import subprocess
 from typing import Optional
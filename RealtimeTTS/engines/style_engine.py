@@ -1,6 +1,10 @@
 from .base_engine import BaseEngine
 from queue import Queue
 import numpy as np
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import random
 import torch
 import sys
@@ -265,7 +269,6 @@ class StyleTTSEngine(BaseEngine):
         print(f"Updated all parameters:\n - Model config: {model_config_path}\n - Model checkpoint: {model_checkpoint_path}\n - Reference audio: {ref_audio_path}")
 
     def get_stream_info(self):
-        import pyaudio
         return pyaudio.paInt16, 1, 24000
 
     def synthesize(self, text: str) -> bool:
@@ -3,7 +3,10 @@ from pydub.utils import mediainfo
 from pydub import AudioSegment
 from typing import Union
 import tempfile
-import pyaudio
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import pyttsx3
 import wave
 import os
@@ -120,6 +123,19 @@ class SystemEngine(BaseEngine):
                     if voice in installed_voice.name:
                         self.engine.setProperty("voice", installed_voice.id)
 
+    def get_voice_parameters(self) -> dict:
+        """
+        Returns the voice settings of the system synthesizer, which are kept
+        by pyttsx3 instead of engine attributes.
+        """
+        try:
+            return {
+                name: repr(self.engine.getProperty(name))
+                for name in ("voice", "rate", "volume")
+            }
+        except Exception:
+            return None
+
     def set_voice_parameters(self, **voice_parameters):
         """
         Sets the voice parameters to be used for speech synthesis.
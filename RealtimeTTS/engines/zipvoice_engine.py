@@ -3,6 +3,10 @@ import os
 import torch
 import torchaudio
 import numpy as np
+try:
+    import pyaudio
+except ImportError:
+    from .. import audio_formats as pyaudio
 import json
 import logging
 from typing import Optional, Union
@@ -242,7 +246,6 @@ class ZipVoiceEngine(BaseEngine):
         self.engine_name = "zipvoice"
 
     def get_stream_info(self):
-        import pyaudio
         # The vocoder outputs float32, but we convert to int16 for broader compatibility.
         return pyaudio.paInt16, 1, self.sampling_rate
 
@@ -301,6 +304,12 @@ class ZipVoiceEngine(BaseEngine):
                 setattr(self, param, value)
                 logging.info(f"ZipVoiceEngine: Set {param} to {value}")
 
+    def get_voice_parameters(self) -> dict:
+        parameters = super().get_voice_parameters()
+        for name in ("guidance_scale", "num_step", "t_shift", "target_rms", "feat_scale"):
+            parameters[name] = repr(getattr(self, name))
+        return parameters
+
     def shutdown(self):
         # Clean up GPU memory
         del self.model
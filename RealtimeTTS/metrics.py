@@ -0,0 +1,337 @@
+"""
+Metrics Module
+--------------
+Per-sentence latency instrumentation for TextToAudioStream.
+
+- SentenceMetrics: Timestamps of a single sentence on its way from text to
+  the output device.
+- Histogram: Aggregates a latency or ratio over many sentences.
+- StreamMetrics: Collects the SentenceMetrics of a stream and keeps
+  histograms for time to first audio, first chunk latency, real-time factor
+  and stop latency.
+- SentenceRecorder: Output target recording first chunk time and audio
+  length of a sentence.
+- SentenceMarker: Placed in the audio queue around a sentence's chunks, so the
+  StreamPlayer can tell when the sentence is actually played.
+
+All timestamps are time.time() values, None if the stage was not reached.
+"""
+
+from .audio_frame import AUDIO_CHUNK_TYPES, get_duration
+from typing import Callable, Dict, List
+from collections import deque
+import threading
+import bisect
+import time
+
+
+class SentenceMetrics:
+    """
+    Timestamps of one sentence.
+
+    Attributes:
+        index (int): Position of the sentence within its play() call.
+        text (str): The sentence text.
+        engine_name (str): Engine that synthesized the sentence.
+        text_received (float): First character of the sentence was read.
+        sentence_detected (float): Sentence boundary was detected.
+        synthesis_start (float): engine.synthesize() was called.
+        first_chunk_enqueued (float): First audio chunk was produced.
+        synthesis_end (float): engine.synthesize() returned.
+        first_chunk_played (float): First audio of the sentence was written
+          to the output device.
+        last_chunk_played (float): Last audio of the sentence was written.
+        audio_seconds (float): Length of the produced audio.
+    """
+
+    __slots__ = (
+        "index", "text", "engine_name",
+        "text_received", "sentence_detected", "synthesis_start",
+        "first_chunk_enqueued", "synthesis_end",
+        "first_chunk_played", "last_chunk_played",
+        "audio_seconds",
+    )
+
+    def __init__(self, index: int, text: str, text_received: float, sentence_detected: float):
+        self.index = index
+        self.text = text
+        self.engine_name = None
+        self.text_received = text_received
+        self.sentence_detected = sentence_detected
+        self.synthesis_start = None
+        self.first_chunk_enqueued = None
+        self.synthesis_end = None
+        self.first_chunk_played = None
+        self.last_chunk_played = None
+        self.audio_seconds = 0.0
+
+    @property
+    def first_chunk_latency(self) -> float:
+        """Seconds from synthesize() call to the first audio chunk."""
+        if self.synthesis_start is None or self.first_chunk_enqueued is None:
+            return None
+        return self.first_chunk_enqueued - self.synthesis_start
+
+    @property
+    def real_time_factor(self) -> float:
+        """Synthesis seconds per second of produced audio."""
+        if self.synthesis_start is None or self.synthesis_end is None or self.audio_seconds <= 0:
+            return None
+        return (self.synthesis_end - self.synthesis_start) / self.audio_seconds
+
+    @property
+    def time_to_first_audio(self) -> float:
+        """Seconds from receiving the sentence's text to playing its first audio."""
+        if self.text_received is None or self.first_chunk_played is None:
+            return None
+        return self.first_chunk_played - self.text_received
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Returns:
+            dict: All timestamps and derived values.
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values["first_chunk_latency"] = self.first_chunk_latency
+        values["real_time_factor"] = self.real_time_factor
+        values["time_to_first_audio"] = self.time_to_first_audio
+        return values
+
+    def __repr__(self):
+        return (
+            f"SentenceMetrics(index={self.index}, text={self.text!r}, "
+            f"first_chunk_latency={self.first_chunk_latency}, "
+            f"real_time_factor={self.real_time_factor}, "
+            f"time_to_first_audio={self.time_to_first_audio})"
+        )
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with count, sum, min, max and approximate percentiles.
+    """
+
+    def __init__(self, bounds: List[float]):
+        """
+        Args:
+            bounds (List[float]): Ascending upper bounds of the buckets,
+              values above the last bound go into an overflow bucket.
+        """
+        self.bounds = list(bounds)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Removes all recorded values."""
+        with self.lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.min = None
+            self.max = None
+
+    def add(self, value: float):
+        """Records a value."""
+        if value is None:
+            return
+        with self.lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.sum += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the upper bound of the bucket containing the given percentile
+        (the maximum for the overflow bucket).
+
+        Args:
+            percent (float): Percentile between 0 and 100.
+        """
+        with self.lock:
+            if not self.count:
+                return None
+            rank = percent / 100.0 * self.count
+            seen = 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank and count:
+                    return self.bounds[i] if i < len(self.bounds) else self.max
+            return self.max
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Returns:
+            dict: count, mean, min, max, p50, p90 and p99.
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+    def __repr__(self):
+        return f"Histogram({self.as_dict()})"
+
+
+# Bucket bounds in seconds for latencies and as ratio for real-time factors
+LATENCY_BOUNDS = [0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0]
+RTF_BOUNDS = [0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0]
+STOP_LATENCY_BOUNDS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.03, 0.05, 0.1, 0.2, 0.5, 1.0]
+
+
+class StreamMetrics:
+    """
+    Collects SentenceMetrics for a TextToAudioStream.
+
+    `sentences` holds the sentences of the current (or last) play() call, the
+    histograms aggregate over all play() calls until reset() is called.
+
+    Histograms:
+        time_to_first_audio: Per play() call, first text received until
+          first audio played.
+        first_chunk_latency: Per sentence, synthesize() call until first chunk.
+        real_time_factor: Per sentence, synthesis time per second of audio.
+        stop_latency: Per stop() call, call until playback stopped.
+    """
+
+    def __init__(
+        self,
+        on_sentence_metrics: Callable[[SentenceMetrics], None] = None,
+        max_sentences: int = 0,
+    ):
+        """
+        Args:
+            on_sentence_metrics (Callable, optional): Called with the
+              SentenceMetrics of every sentence once its last chunk was played.
+            max_sentences (int): If greater than 0, `sentences` only keeps the
+              most recent max_sentences entries.
+        """
+        self.on_sentence_metrics = on_sentence_metrics
+        self.max_sentences = max_sentences
+        self.sentences = self._new_sentence_list()
+        self.sentence_count = 0
+        self.time_to_first_audio = Histogram(LATENCY_BOUNDS)
+        self.first_chunk_latency = Histogram(LATENCY_BOUNDS)
+        self.real_time_factor = Histogram(RTF_BOUNDS)
+        self.stop_latency = Histogram(STOP_LATENCY_BOUNDS)
+        self.lock = threading.Lock()
+
+    def _new_sentence_list(self):
+        return deque(maxlen=self.max_sentences) if self.max_sentences > 0 else []
+
+    def start_play(self):
+        """Starts collecting the sentences of a new play() call."""
+        with self.lock:
+            self.sentences = self._new_sentence_list()
+            self.sentence_count = 0
+
+    def new_sentence(self, text: str, text_received: float = None) -> SentenceMetrics:
+        """
+        Creates the metrics of a newly detected sentence.
+
+        Args:
+            text (str): The sentence text.
+            text_received (float, optional): Time the first character of the
+              sentence was read. Defaults to now.
+        """
+        now = time.time()
+        with self.lock:
+            metrics = SentenceMetrics(self.sentence_count, text, text_received or now, now)
+            self.sentences.append(metrics)
+            self.sentence_count += 1
+        return metrics
+
+    def sentence_played(self, metrics: SentenceMetrics):
+        """
+        Records a sentence whose last chunk was played and invokes the callback.
+        """
+        if metrics.index == 0:
+            self.time_to_first_audio.add(metrics.time_to_first_audio)
+        self.first_chunk_latency.add(metrics.first_chunk_latency)
+        self.real_time_factor.add(metrics.real_time_factor)
+
+        if self.on_sentence_metrics:
+            self.on_sentence_metrics(metrics)
+
+    def reset(self):
+        """Clears the sentences and all histograms."""
+        with self.lock:
+            self.sentences = self._new_sentence_list()
+            self.sentence_count = 0
+        self.time_to_first_audio.reset()
+        self.first_chunk_latency.reset()
+        self.real_time_factor.reset()
+        self.stop_latency.reset()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            dict: The histograms as dictionaries.
+        """
+        return {
+            "time_to_first_audio": self.time_to_first_audio.as_dict(),
+            "first_chunk_latency": self.first_chunk_latency.as_dict(),
+            "real_time_factor": self.real_time_factor.as_dict(),
+            "stop_latency": self.stop_latency.as_dict(),
+        }
+
+
+class SentenceRecorder:
+    """
+    Forwards the audio chunks of one sentence to the current output target
+    and records when the first chunk arrived and how much audio was produced.
+    """
+
+    def __init__(self, target, metrics: SentenceMetrics, bytes_per_second: int):
+        """
+        Args:
+            target: Output target the chunks are forwarded to.
+            metrics (SentenceMetrics): Receives the timestamps.
+            bytes_per_second (int): Bytes per second of audio of the engine.
+        """
+        self.target = target
+        self.metrics = metrics
+        self.bytes_per_second = bytes_per_second
+
+    def put(self, chunk, block: bool = True, timeout: float = None):
+        """
+        Records the chunk and forwards it to the target.
+
+        Args:
+            chunk: Audio data chunk.
+            block, timeout: Accepted for queue.Queue compatibility, ignored.
+        """
+        if isinstance(chunk, AUDIO_CHUNK_TYPES) and len(chunk):
+            if self.metrics.first_chunk_enqueued is None:
+                self.metrics.first_chunk_enqueued = time.time()
+            self.metrics.audio_seconds += get_duration(chunk, self.bytes_per_second)
+        self.target.put(chunk)
+
+    def put_nowait(self, chunk):
+        """Records the chunk and forwards it to the target."""
+        self.put(chunk)
+
+
+class SentenceMarker:
+    """
+    Queued before (is_end=False) and after (is_end=True) the audio chunks
+    of a sentence. The StreamPlayer stamps the played timestamps into the
+    metrics when it reaches the markers and calls callback after the end marker.
+    """
+
+    __slots__ = ("metrics", "is_end", "callback")
+
+    def __init__(self, metrics: SentenceMetrics, is_end: bool, callback: Callable = None):
+        self.metrics = metrics
+        self.is_end = is_end
+        self.callback = callback
@@ -0,0 +1,277 @@
+"""
+MP3 Decoder Module
+------------------
+Streaming decoding of the mp3 audio of cloud engines (OpenAI, Edge,
+ElevenLabs) into PCM for the StreamPlayer.
+
+Decoding every network chunk on its own starts a new ffmpeg process per
+chunk and cuts the stream at arbitrary positions. StreamingMp3Decoder
+keeps one ffmpeg process per stream instead: mp3 bytes are piped in as
+they arrive and 16 bit PCM is read back by a reader thread, so the chunks
+are decoded as one continuous stream.
+
+- StreamingMp3Decoder: Feeds mp3 chunks to the decoder process and returns
+  the PCM decoded so far.
+- read_mp3_format(): Sample rate and channels from the first frame header,
+  used for engines that don't report their stream format.
+"""
+
+from typing import Optional, Tuple
+import subprocess
+import threading
+import logging
+import shutil
+
+# Bytes searched for the first frame header before giving up
+MAX_HEADER_SEARCH = 64 * 1024
+
+# Maximum number of bytes taken from the decoder's output pipe at once
+READ_SIZE = 64 * 1024
+
+# Sample rates of MPEG 1 layer I-III, halved for MPEG 2 and quartered for MPEG 2.5
+_SAMPLE_RATES = (44100, 48000, 32000)
+
+
+def is_decoder_available() -> bool:
+    """
+    Returns:
+        bool: True if ffmpeg is installed.
+    """
+    return shutil.which("ffmpeg") is not None
+
+
+def read_mp3_format(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Reads the stream format from the first MPEG audio frame header,
+    skipping a leading ID3v2 tag.
+
+    Args:
+        data (bytes): Start of the mp3 stream.
+
+    Returns:
+        tuple: Sample rate and number of channels, None if data doesn't
+          contain a frame header yet.
+    """
+    offset = 0
+    if data[:3] == b"ID3":
+        if len(data) < 10:
+            return None
+        size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+        offset = 10 + size + (10 if data[5] & 0x10 else 0)
+
+    for i in range(offset, len(data) - 3):
+        if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+            continue
+        version = (data[i + 1] >> 3) & 3
+        layer = (data[i + 1] >> 1) & 3
+        bitrate_index = data[i + 2] >> 4
+        rate_index = (data[i + 2] >> 2) & 3
+        if version == 1 or layer == 0 or bitrate_index == 15 or rate_index == 3:
+            # Reserved values, not a frame header
+            continue
+        rate = _SAMPLE_RATES[rate_index] >> {3: 0, 2: 1, 0: 2}[version]
+        channels = 1 if data[i + 3] >> 6 == 3 else 2
+        return rate, channels
+    return None
+
+
+class StreamingMp3Decoder:
+    """
+    Decodes an mp3 stream chunk by chunk with one long-lived ffmpeg process.
+
+    The process is started by the first feed() and ended by flush() at the
+    end of the stream; the next feed() starts a new one. Not thread-safe,
+    feed(), read(), flush() and reset() are called by one thread.
+
+    Usage:
+        decoder = StreamingMp3Decoder(channels=1, rate=24000)
+        for chunk in mp3_chunks:
+            play(decoder.feed(chunk))
+        play(decoder.flush())
+    """
+
+    def __init__(self, channels: int = -1, rate: int = -1):
+        """
+        Args:
+            channels (int): Channels of the decoded PCM, -1 to use the
+              stream's own.
+            rate (int): Sample rate of the decoded PCM, -1 to use the
+              stream's own. If channels or rate is -1, both are read from
+              the first frame header and kept for later streams.
+        """
+        self.channels = channels
+        self.rate = rate
+        self.process = None
+        self.reader_thread = None
+        self.pcm = bytearray()
+        self.pcm_lock = threading.Lock()
+        self.header = b""
+        self.fed_bytes = 0
+        self.decoded_bytes = 0
+
+    @property
+    def format_known(self) -> bool:
+        """True once the channels and sample rate of the decoded PCM are known."""
+        return self.channels > 0 and self.rate > 0
+
+    @property
+    def frame_bytes(self) -> int:
+        """Bytes per frame of the decoded 16 bit PCM."""
+        return 2 * self.channels
+
+    def compressed_bytes_per_second(self) -> Optional[float]:
+        """
+        Returns:
+            float: Measured mp3 bytes per second of decoded audio, None
+              before the first PCM was decoded.
+        """
+        if self.decoded_bytes == 0:
+            return None
+        return self.fed_bytes * self.frame_bytes * self.rate / self.decoded_bytes
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        Passes the next chunk of the mp3 stream to the decoder.
+
+        Args:
+            data (bytes): mp3 data, may end anywhere within a frame.
+
+        Returns:
+            bytes: The PCM decoded so far (possibly empty).
+        """
+        if not self.format_known:
+            self.header += data
+            stream_format = read_mp3_format(self.header)
+            if stream_format is None:
+                if len(self.header) > MAX_HEADER_SEARCH:
+                    self.header = b""
+                    raise ValueError("no MPEG audio frame header found in the stream")
+                return b""
+            rate, channels = stream_format
+            self.rate = self.rate if self.rate > 0 else rate
+            self.channels = self.channels if self.channels > 0 else channels
+            logging.debug(f"decoding mp3 stream to {self.channels} channels at {self.rate} Hz")
+            data, self.header = self.header, b""
+
+        if self.process is None:
+            self._start()
+
+        self.fed_bytes += len(data)
+        try:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        except OSError as e:
+            self.reset()
+            raise RuntimeError(f"mp3 decoder process ended unexpectedly: {e}")
+        return self.read()
+
+    def read(self) -> bytes:
+        """
+        Returns:
+            bytes: The whole frames of PCM decoded since the last call.
+        """
+        with self.pcm_lock:
+            count = len(self.pcm) - len(self.pcm) % self.frame_bytes
+            data = bytes(self.pcm[:count])
+            del self.pcm[:count]
+        return data
+
+    def flush(self, timeout: float = 5.0) -> bytes:
+        """
+        Ends the stream and waits for the decoder to output the last frames.
+
+        Args:
+            timeout (float): Seconds to wait for the decoder to finish.
+
+        Returns:
+            bytes: The PCM not returned by feed() yet.
+        """
+        self.header = b""
+        process = self.process
+        if process is None:
+            return self.read()
+
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        self.reader_thread.join(timeout)
+        if self.reader_thread.is_alive():
+            logging.warning("mp3 decoder did not finish the stream in time")
+            process.kill()
+            self.reader_thread.join()
+        process.wait()
+        self.process = None
+        self.reader_thread = None
+
+        data = self.read()
+        with self.pcm_lock:
+            # A trailing partial frame can't be played
+            self.pcm.clear()
+        return data
+
+    def reset(self):
+        """Stops the decoder process and drops all data of the current stream."""
+        self.header = b""
+        process = self.process
+        if process is not None:
+            process.kill()
+            self.reader_thread.join()
+            process.wait()
+            self.process = None
+            self.reader_thread = None
+        with self.pcm_lock:
+            self.pcm.clear()
+
+    def close(self):
+        """Releases the decoder process."""
+        self.reset()
+
+    def _start(self):
+        """Starts the ffmpeg process and the thread reading its output."""
+        command = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel", "error",
+            # Start decoding right away instead of analyzing the input first
+            "-probesize", "32",
+            "-analyzeduration", "0",
+            "-fflags", "nobuffer",
+            "-f", "mp3",
+            "-i", "pipe:0",
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "-ac", str(self.channels),
+            "-ar", str(self.rate),
+            "-flush_packets", "1",
+            "pipe:1",
+        ]
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            raise ValueError(
+                "ffmpeg not found, necessary to decode mp3 audio. "
+                "On mac you can install it with 'brew install ffmpeg'. "
+                "On linux and windows you can install it from https://ffmpeg.org/"
+            )
+        self.reader_thread = threading.Thread(
+            target=self._read_output, args=(self.process,), daemon=True
+        )
+        self.reader_thread.start()
+
+    def _read_output(self, process: subprocess.Popen):
+        """Collects the decoded PCM until the process closes its output."""
+        stdout = process.stdout
+        while True:
+            data = stdout.read1(READ_SIZE)
+            if not data:
+                break
+            with self.pcm_lock:
+                self.pcm += data
+            self.decoded_bytes += len(data)
+        stdout.close()
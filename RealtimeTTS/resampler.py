@@ -0,0 +1,150 @@
+"""
+Resampler Module
+----------------
+Streaming sample rate conversion for the StreamPlayer.
+
+Resampling every chunk on its own restarts the filter at each chunk
+boundary, which is audible as clicks. StreamingResampler is a polyphase
+FIR resampler that keeps the last input samples of a chunk as filter
+history for the next one, so a stream of chunks is converted as if it was
+one continuous signal.
+
+- StreamingResampler: Converts interleaved int16 or float32 chunks from
+  one rate to another, created once per rate pair and channel layout.
+
+The windowed-sinc filter is designed once per rate ratio and shared by
+all resamplers with that ratio.
+"""
+
+from functools import lru_cache
+from . import audio_formats
+from math import gcd, ceil
+import numpy as np
+
+# Zero crossings of the sinc on each side of the filter center
+ZERO_CROSSINGS = 16
+
+# Cutoff relative to the lower Nyquist frequency of both rates
+ROLLOFF = 0.945
+
+# Kaiser window shape, about 90dB stopband attenuation
+KAISER_BETA = 8.6
+
+# Number of output frames computed at once, bounds the temporary memory
+BLOCK_FRAMES = 2048
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """
+    Designs the low-pass filter for resampling by up/down.
+
+    Returns:
+        np.ndarray: Filter of shape (up, taps), row p holds the taps of
+          phase p, the taps of every phase add up to about 1.
+    """
+    cutoff = 0.5 * ROLLOFF / max(up, down)
+    taps = int(ceil(ZERO_CROSSINGS / cutoff / up))
+    length = taps * up
+
+    n = np.arange(length) - (length - 1) / 2.0
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, KAISER_BETA)
+    h *= up / h.sum()
+
+    # h[phase + k * up] is tap k of phase
+    return np.ascontiguousarray(h.reshape(taps, up).T, dtype=np.float32)
+
+
+class StreamingResampler:
+    """
+    Polyphase resampler keeping its filter state across chunks.
+
+    Usage:
+        resampler = StreamingResampler(24000, 48000, channels=1)
+        for chunk in chunks:
+            device.write(resampler.process(chunk))
+    """
+
+    def __init__(
+        self,
+        source_rate: int,
+        target_rate: int,
+        channels: int = 1,
+        format: int = audio_formats.paInt16,
+    ):
+        """
+        Args:
+            source_rate (int): Sample rate of the input chunks.
+            target_rate (int): Sample rate of the output chunks.
+            channels (int): Number of interleaved channels.
+            format (int): paInt16 or paFloat32, used for input and output.
+        """
+        if format not in (audio_formats.paInt16, audio_formats.paFloat32):
+            raise ValueError(f"Unsupported format for resampling: {format}")
+
+        divisor = gcd(source_rate, target_rate)
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.channels = channels
+        self.format = format
+        self.dtype = np.float32 if format == audio_formats.paFloat32 else np.int16
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        self.filter = _polyphase_filter(self.up, self.down)
+        self.taps = self.filter.shape[1]
+        self.tap_offsets = np.arange(self.taps)
+        self.buffer = np.zeros((0, channels), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Forgets the filter history, e.g. before a new stream starts."""
+        self.history = np.zeros((self.taps - 1, self.channels), dtype=np.float32)
+        self.input_frames = 0
+        self.output_frames = 0
+
+    def process(self, chunk: bytes) -> bytes:
+        """
+        Resamples the next chunk of the stream.
+
+        Args:
+            chunk (bytes): Interleaved audio in the resampler's format.
+
+        Returns:
+            bytes: The resampled audio available so far, in the same format.
+        """
+        samples = np.frombuffer(chunk, dtype=self.dtype)
+        frames = len(samples) // self.channels
+        if frames == 0:
+            return b""
+
+        # History and chunk in one buffer, reallocated only for larger chunks
+        history_frames = self.taps - 1
+        needed = history_frames + frames
+        if len(self.buffer) < needed:
+            self.buffer = np.empty((needed, self.channels), dtype=np.float32)
+        buffer = self.buffer[:needed]
+        buffer[:history_frames] = self.history
+        buffer[history_frames:] = samples[: frames * self.channels].reshape(frames, self.channels)
+
+        # Output frame n lies at n * down on the upsampled grid and needs the
+        # input frames up to (n * down) // up
+        first_input = self.input_frames - history_frames
+        self.input_frames += frames
+        end = (self.input_frames * self.up + self.down - 1) // self.down
+
+        output = np.empty((end - self.output_frames, self.channels), dtype=np.float32)
+        for start in range(self.output_frames, end, BLOCK_FRAMES):
+            positions = np.arange(start, min(start + BLOCK_FRAMES, end), dtype=np.int64) * self.down
+            bases = positions // self.up - first_input
+            phases = self.filter[positions % self.up]
+            window = buffer[bases[:, None] - self.tap_offsets]
+            output[start - self.output_frames : start - self.output_frames + len(positions)] = (
+                np.einsum("nk,nkc->nc", phases, window)
+            )
+        self.output_frames = end
+        self.history = buffer[frames:].copy()
+
+        if self.dtype == np.int16:
+            np.rint(output, out=output)
+            np.clip(output, -32768, 32767, out=output)
+        return output.astype(self.dtype).tobytes()
@@ -0,0 +1,136 @@
+"""
+Ring Buffer Module
+------------------
+Lock-free single-producer single-consumer byte ring buffer feeding the
+PortAudio callback of AudioStream in callback mode.
+
+- AudioRingBuffer: The playback thread writes into it, the audio callback
+  reads from it. The callback never waits on a lock held by Python code;
+  the writer sleeps on an event while the buffer is full and is woken up
+  by the next read.
+
+Both sides only advance their own counter (write_count for the producer,
+read_count for the consumer). The counters grow monotonically and their
+difference is the fill level, so no lock is needed as long as there is
+exactly one writer thread and one reader thread.
+"""
+
+import threading
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size byte ring buffer for one writer and one reader thread.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity (int): Size of the buffer in bytes.
+        """
+        self.capacity = capacity
+        self.buffer = bytearray(capacity)
+        self.write_count = 0
+        self.read_count = 0
+        self.discard_count = 0
+        self.space_available = threading.Event()
+        self.drained = threading.Event()
+        self.drained.set()
+
+    def available(self) -> int:
+        """
+        Returns:
+            int: Number of bytes ready to be read.
+        """
+        return self.write_count - max(self.read_count, self.discard_count)
+
+    def write(self, data: bytes, abort_event: threading.Event = None, timeout: float = 1.0) -> int:
+        """
+        Writes data, waiting for the reader while the buffer is full.
+        Must only be called from the writer thread.
+
+        Args:
+            data (bytes): The data to write.
+            abort_event (threading.Event, optional): Stops writing when set,
+              wake() interrupts the wait.
+            timeout (float): Seconds to wait for the reader to make room
+              before giving up.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        view = memoryview(data).cast("B")
+        written = 0
+        while written < len(view):
+            if abort_event is not None and abort_event.is_set():
+                break
+
+            free = self.capacity - self.available()
+            if free == 0:
+                self.space_available.clear()
+                # The reader may have made room before the clear
+                if self.capacity - self.available() == 0 and not self.space_available.wait(timeout):
+                    break
+                continue
+
+            count = min(free, len(view) - written)
+            position = self.write_count % self.capacity
+            first = min(count, self.capacity - position)
+            self.buffer[position:position + first] = view[written:written + first]
+            self.buffer[:count - first] = view[written + first:written + count]
+            self.drained.clear()
+            self.write_count += count
+            written += count
+        return written
+
+    def read_into(self, out: bytearray, count: int) -> int:
+        """
+        Copies up to count bytes into out without waiting.
+        Must only be called from the reader thread.
+
+        Args:
+            out (bytearray): Destination, at least count bytes long.
+            count (int): Maximum number of bytes to read.
+
+        Returns:
+            int: Number of bytes read.
+        """
+        start = max(self.read_count, self.discard_count)
+        count = min(count, self.write_count - start)
+        position = start % self.capacity
+        first = min(count, self.capacity - position)
+        out[:first] = self.buffer[position:position + first]
+        out[first:count] = self.buffer[:count - first]
+        self.read_count = start + count
+
+        self.space_available.set()
+        if self.read_count == self.write_count:
+            self.drained.set()
+        return count
+
+    def clear(self):
+        """Discards the buffered data, may be called from any thread."""
+        self.discard_count = self.write_count
+        self.drained.set()
+        self.wake()
+
+    def wake(self):
+        """Wakes up a writer waiting for room."""
+        self.space_available.set()
+
+    def wait_drained(self, timeout: float = None) -> bool:
+        """
+        Waits until the reader consumed all written data. Must not be called
+        while the writer is writing.
+
+        Returns:
+            bool: True if the buffer is empty.
+        """
+        while self.available() > 0:
+            # A set from a read racing an earlier write may be stale
+            self.drained.clear()
+            if self.available() == 0:
+                break
+            if not self.drained.wait(timeout):
+                return False
+        return True
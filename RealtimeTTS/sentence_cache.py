@@ -0,0 +1,317 @@
+"""
+Sentence Cache Module
+---------------------
+Content-addressed cache for synthesized sentence audio, so repeated sentences
+(greetings, confirmations, error messages) are played without calling the
+engine again.
+
+- SentenceCache: Two-tier cache with a bounded in-memory LRU tier and an
+  optional on-disk PCM tier.
+- CacheRecorder: Output target that forwards the engine's audio chunks and
+  keeps a copy for the cache.
+
+Entries are keyed by engine name, voice parameters, stream format and the
+normalized sentence text.
+"""
+
+from .audio_frame import AUDIO_CHUNK_TYPES
+from collections import OrderedDict
+from typing import List, Optional
+import unicodedata
+import threading
+import hashlib
+import logging
+import json
+import os
+
+
+class CacheRecorder:
+    """
+    Forwards audio chunks to the engine's current output target and records
+    them, so a freshly synthesized sentence can be stored in the cache.
+    """
+
+    def __init__(self, target=None):
+        """
+        Args:
+            target: Output target the chunks are forwarded to (any object
+              with a put() method). None only records the chunks.
+        """
+        self.target = target
+        self.chunks = []
+
+    def put(self, chunk, block: bool = True, timeout: float = None):
+        """
+        Records the chunk and forwards it to the target.
+
+        Args:
+            chunk: Audio data chunk.
+            block, timeout: Accepted for queue.Queue compatibility, ignored.
+        """
+        if isinstance(chunk, AUDIO_CHUNK_TYPES):
+            self.chunks.append(bytes(chunk))
+        if self.target is not None:
+            self.target.put(chunk)
+
+    def put_nowait(self, chunk):
+        """Records the chunk and forwards it to the target."""
+        self.put(chunk)
+
+
+class SentenceCache:
+    """
+    Caches the audio chunks of synthesized sentences.
+
+    The memory tier holds up to `max_memory_bytes` of audio and evicts the
+    least recently used entries first. If `cache_dir` is set, every entry is
+    also written to a .pcm file there and read back on a memory miss (the
+    chunks are copied into the memory tier), so the cache survives restarts and can be shared between processes.
+
+    Pinned entries (see pin()) are never evicted from the memory tier.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        cache_dir: str = None,
+        max_disk_bytes: int = 0,
+        read_chunk_size: int = 32 * 1024,
+    ):
+        """
+        Args:
+            max_memory_bytes (int): Size limit of the memory tier in bytes.
+            cache_dir (str, optional): Directory of the disk tier.
+              Defaults to None (memory tier only).
+            max_disk_bytes (int): Size limit of the disk tier in bytes, the
+              least recently used files are deleted first. 0 for no limit.
+            read_chunk_size (int): Size of the chunks audio read from the
+              disk tier is split into.
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.read_chunk_size = read_chunk_size
+        self.entries = OrderedDict()
+        self.pinned = set()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Normalizes sentence text for the cache key
+        (unicode normalization and collapsed whitespace).
+        """
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def make_key(self, engine, text: str) -> Optional[str]:
+        """
+        Builds the cache key for a sentence synthesized by engine.
+
+        Args:
+            engine (BaseEngine): Engine synthesizing the sentence.
+            text (str): The sentence text.
+
+        Returns:
+            str: Hex digest identifying the audio, None if the engine can't
+              describe its current voice and the sentence must not be cached.
+        """
+        voice_parameters = engine.get_voice_parameters()
+        if voice_parameters is None:
+            return None
+        description = {
+            "engine": engine.engine_name,
+            "voice": voice_parameters,
+            "stream_info": list(engine.get_stream_info()),
+            "text": self.normalize_text(text),
+        }
+        serialized = json.dumps(description, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[bytes]]:
+        """
+        Looks up the audio chunks stored for key.
+
+        Args:
+            key (str): Cache key from make_key().
+
+        Returns:
+            List[bytes]: The audio chunks, or None on a miss.
+        """
+        with self.lock:
+            chunks = self.entries.get(key)
+            if chunks is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return chunks
+
+        chunks = self._read_disk(key)
+        with self.lock:
+            if chunks is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store_memory(key, chunks)
+        return chunks
+
+    def put(self, key: str, chunks: List[bytes], pinned: bool = False):
+        """
+        Stores the audio chunks of a sentence.
+
+        Args:
+            key (str): Cache key from make_key().
+            chunks (List[bytes]): The audio chunks.
+            pinned (bool): If True, the entry is never evicted from memory.
+        """
+        if not chunks:
+            return
+
+        with self.lock:
+            if pinned:
+                self.pinned.add(key)
+            self._store_memory(key, chunks)
+
+        self._write_disk(key, chunks)
+
+    def pin(self, key: str) -> bool:
+        """
+        Protects an entry from eviction.
+
+        Returns:
+            bool: False if the key is not cached.
+        """
+        if self.get(key) is None:
+            return False
+        with self.lock:
+            self.pinned.add(key)
+        return True
+
+    def unpin(self, key: str):
+        """Allows an entry to be evicted again."""
+        with self.lock:
+            self.pinned.discard(key)
+            self._evict_memory()
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            if key in self.entries:
+                return True
+        return self.cache_dir is not None and os.path.exists(self._disk_path(key))
+
+    def clear(self, disk: bool = False):
+        """
+        Removes all unpinned entries from the memory tier.
+
+        Args:
+            disk (bool): If True, also deletes all files of the disk tier.
+        """
+        with self.lock:
+            for key in list(self.entries):
+                if key not in self.pinned:
+                    self.memory_bytes -= sum(len(c) for c in self.entries.pop(key))
+
+        if disk and self.cache_dir:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".pcm"):
+                    self._remove_file(entry.path)
+
+    def _store_memory(self, key: str, chunks: List[bytes]):
+        """Inserts an entry into the LRU tier. Caller holds the lock."""
+        if key in self.entries:
+            self.memory_bytes -= sum(len(c) for c in self.entries.pop(key))
+        self.entries[key] = chunks
+        self.memory_bytes += sum(len(c) for c in chunks)
+        self._evict_memory()
+
+    def _evict_memory(self):
+        """Drops least recently used unpinned entries. Caller holds the lock."""
+        if self.memory_bytes <= self.max_memory_bytes:
+            return
+        for key in list(self.entries):
+            if self.memory_bytes <= self.max_memory_bytes:
+                break
+            if key in self.pinned:
+                continue
+            self.memory_bytes -= sum(len(c) for c in self.entries.pop(key))
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".pcm")
+
+    def _read_disk(self, key: str) -> Optional[List[bytes]]:
+        """Reads an entry from the disk tier in chunks of read_chunk_size."""
+        if not self.cache_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                chunks = list(iter(lambda: f.read(self.read_chunk_size), b""))
+            if not chunks:
+                return None
+            # Mark as recently used for disk eviction
+            os.utime(path)
+            return chunks
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"sentence cache failed to read {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, chunks: List[bytes]):
+        """Writes an entry to the disk tier (atomically, via rename)."""
+        if not self.cache_dir:
+            return
+
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logging.warning(f"sentence cache failed to write {path}: {e}")
+            self._remove_file(temp_path)
+            return
+
+        if self.max_disk_bytes > 0:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Deletes least recently used files until the disk tier fits its limit."""
+        files = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".pcm"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            key = os.path.basename(path)[:-len(".pcm")]
+            if key in self.pinned:
+                continue
+            self._remove_file(path)
+            total -= size
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
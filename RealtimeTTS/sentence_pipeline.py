@@ -0,0 +1,243 @@
+"""
+Sentence Pipeline Module
+------------------------
+Synthesizes upcoming sentences ahead of playback and hands their audio to the
+player strictly in sentence order.
+
+- SentenceBuffer: Collects the audio chunks and word timings produced for
+  a single sentence.
+- SentencePipeline: Runs synthesis workers over a bounded look-ahead window
+  and releases the buffered chunks in playback order.
+"""
+
+from .audio_frame import AUDIO_CHUNK_TYPES, get_duration
+from .engines import TimingInfo
+from typing import Callable, List
+import threading
+import logging
+import queue
+import time
+
+
+class SentenceBuffer:
+    """
+    Holds the audio chunks synthesized for a single sentence until they are
+    released to the player.
+
+    Engines write into the buffer through BaseEngine.redirect_output(), so the
+    buffer mimics the put() interface of the engine queue. Word timings are
+    redirected into `timings`, `timings_base` is the engine's audio_duration
+    when synthesis started, the offset of the timings' time scale.
+    """
+
+    def __init__(self, index: int, text: str, context=None):
+        """
+        Args:
+            index (int): Position of the sentence in playback order.
+            text (str): The sentence text to synthesize.
+            context (optional): Caller data passed along with the sentence.
+        """
+        self.index = index
+        self.text = text
+        self.context = context
+        self.chunks = queue.Queue()
+        self.timings = queue.Queue()
+        self.timings_base = 0.0
+        self.start_time = time.time()
+        self.first_chunk_time = None
+        self.finished = threading.Event()
+        self.success = False
+
+    def put(self, chunk, block: bool = True, timeout: float = None):
+        """
+        Stores an audio chunk produced by the engine.
+
+        Args:
+            chunk: Audio data chunk.
+            block, timeout: Accepted for queue.Queue compatibility, ignored.
+        """
+        if self.first_chunk_time is None and isinstance(chunk, AUDIO_CHUNK_TYPES):
+            self.first_chunk_time = time.time()
+        self.chunks.put(chunk)
+
+    def put_nowait(self, chunk):
+        """Stores an audio chunk produced by the engine."""
+        self.put(chunk)
+
+    def finish(self, success: bool):
+        """
+        Marks the sentence as completely synthesized.
+
+        Args:
+            success (bool): Whether synthesis succeeded.
+        """
+        self.success = success
+        self.finished.set()
+
+
+class SentencePipeline:
+    """
+    Synthesizes up to `lookahead` sentences ahead of the sentence currently
+    being released, each into its own SentenceBuffer, and forwards the audio
+    in submission order.
+
+    Every entry of `engines` gets its own synthesis thread, so passing a pool
+    of engine instances fans the sentences out across them in parallel.
+
+    Chunks of the sentence at the head of the window are forwarded as soon as
+    they arrive, so look-ahead never delays the first audio of a sentence.
+
+    If a timings target is given, the word timings redirected into the
+    buffers are forwarded along with the audio, moved from the time scale of
+    the engine that synthesized the sentence onto the scale of the released
+    audio (`released_seconds`).
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[SentenceBuffer, object], bool],
+        release: Callable[[bytes], None],
+        engines: List[object],
+        lookahead: int = 1,
+        abort_event: threading.Event = None,
+        timings=None,
+        bytes_per_second: float = 0.0,
+        timings_offset: float = 0.0,
+    ):
+        """
+        Args:
+            synthesize (Callable): Called with a SentenceBuffer and the
+              worker's engine, synthesizes buffer.text into the buffer and
+              returns True on success.
+            release (Callable): Receives the audio chunks in playback order.
+            engines (List[BaseEngine]): One synthesis thread is started per
+              entry. List the same engine several times only if it can
+              synthesize concurrently.
+            lookahead (int): Number of sentences that may be synthesized ahead
+              of the sentence currently being released.
+            abort_event (threading.Event, optional): Stops synthesis and
+              release when set.
+            timings (optional): Object with a put() method receiving the word
+              timings of the buffers in playback order.
+            bytes_per_second (float): Bytes per second of raw audio chunks,
+              needed to measure the released audio for timings.
+            timings_offset (float): Position of the first released chunk on
+              the time scale of the forwarded timings.
+        """
+        self.synthesize = synthesize
+        self.release = release
+        self.timings = timings
+        self.bytes_per_second = bytes_per_second
+        self.released_seconds = timings_offset
+        self.abort_event = abort_event or threading.Event()
+        self.window = threading.Semaphore(max(1, lookahead + 1))
+        self.work_queue = queue.Queue()
+        self.release_queue = queue.Queue()
+        self.sentence_count = 0
+
+        self.worker_threads = [
+            threading.Thread(
+                target=self._synthesis_worker, args=(engine,), daemon=True
+            )
+            for engine in engines
+        ]
+        self.release_thread = threading.Thread(
+            target=self._release_worker, daemon=True
+        )
+
+        for worker_thread in self.worker_threads:
+            worker_thread.start()
+        self.release_thread.start()
+
+    def submit(self, text: str, context=None) -> bool:
+        """
+        Queues a sentence for synthesis.
+        Blocks while the look-ahead window is full.
+
+        Args:
+            text (str): The sentence to synthesize.
+            context (optional): Caller data, available as buffer.context.
+
+        Returns:
+            bool: False if the pipeline was aborted before the sentence
+              could be queued.
+        """
+        while not self.window.acquire(timeout=0.05):
+            if self.abort_event.is_set():
+                return False
+
+        buffer = SentenceBuffer(self.sentence_count, text, context)
+        self.sentence_count += 1
+        self.release_queue.put(buffer)
+        self.work_queue.put(buffer)
+        return True
+
+    def close(self):
+        """
+        Waits until every submitted sentence has been synthesized and
+        released, then stops the worker threads.
+        """
+        for _ in self.worker_threads:
+            self.work_queue.put(None)
+        self.release_queue.put(None)
+
+        for worker_thread in self.worker_threads:
+            worker_thread.join()
+        self.release_thread.join()
+
+    def _synthesis_worker(self, engine):
+        """Synthesizes queued sentences into their buffers using engine."""
+        while True:
+            buffer = self.work_queue.get()
+            if buffer is None:
+                break
+
+            success = False
+            if not self.abort_event.is_set():
+                try:
+                    success = self.synthesize(buffer, engine)
+                except Exception as e:
+                    logging.warning(
+                        f'look-ahead synthesis of sentence "{buffer.text}" failed with error: {e}'
+                    )
+            buffer.finish(success)
+
+    def _release_worker(self):
+        """Forwards the buffered chunks to the player in sentence order."""
+        while True:
+            buffer = self.release_queue.get()
+            if buffer is None:
+                break
+
+            sentence_start = self.released_seconds
+            while not self.abort_event.is_set():
+                self._release_timings(buffer, sentence_start)
+                try:
+                    chunk = buffer.chunks.get(timeout=0.05)
+                except queue.Empty:
+                    if buffer.finished.is_set() and buffer.chunks.empty():
+                        break
+                    continue
+                if self.timings is not None and isinstance(chunk, AUDIO_CHUNK_TYPES):
+                    self.released_seconds += get_duration(chunk, self.bytes_per_second)
+                self.release(chunk)
+            self._release_timings(buffer, sentence_start)
+
+            self.window.release()
+
+    def _release_timings(self, buffer: SentenceBuffer, sentence_start: float):
+        """
+        Forwards the word timings buffered so far for a sentence whose audio
+        starts at sentence_start on the released audio's time scale.
+        """
+        if self.timings is None:
+            return
+        shift = sentence_start - buffer.timings_base
+        while True:
+            try:
+                timing = buffer.timings.get_nowait()
+            except queue.Empty:
+                return
+            self.timings.put(
+                TimingInfo(timing.start_time + shift, timing.end_time + shift, timing.word)
+            )
@@ -0,0 +1,323 @@
+"""
+Sentence Segmenter Module
+-------------------------
+Dependency-free incremental sentence segmentation, selected with
+tokenizer="fast".
+
+Well-punctuated text like LLM output doesn't need a statistical tokenizer:
+a sentence ends at a full stop, question or exclamation mark that is
+followed by whitespace and a character that doesn't continue the sentence
+(not lowercase, not after a known abbreviation or an initial). Text chunks
+are scanned with regular expressions as they arrive, only new text is
+scanned and a boundary is decided as soon as the first character of the
+next sentence is known.
+
+- FastSentenceSegmenter: The incremental state machine (feed() / flush()).
+- generate_sentences_fast: Drop-in for stream2sentence.generate_sentences
+  with the same quick-yield, fragment delimiter and length semantics.
+- split_sentences: Splits a complete text into sentences.
+"""
+
+from typing import Iterable, Iterator, List
+import re
+
+# Default full sentence delimiters of stream2sentence
+FULL_SENTENCE_DELIMITERS = ".?!\n…。"
+
+# Delimiters ending a sentence right away, without looking at the next character
+IMMEDIATE_DELIMITERS = "\n。！？"
+
+# Characters that may follow a delimiter and still belong to the sentence
+CLOSING_CHARACTERS = "\"')]}”’»"
+
+# Words followed by a period that don't end a sentence (compared lowercase)
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "mt",
+    "e.g", "i.e", "cf", "fig", "approx", "dept", "est", "inc", "ltd",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec",
+}
+
+_LINK_PATTERN = re.compile(
+    r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|"
+    r"[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+)
+
+_EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F000-\U0001FAFF"  # pictographs, emoticons, transport, symbols
+    "\u2600-\u27BF"          # misc symbols and dingbats
+    "\u2B00-\u2BFF"          # arrows, stars
+    "\uFE0F\u200D"           # variation selector, zero width joiner
+    "]+"
+)
+
+
+def _character_class(characters: str) -> str:
+    return "[" + "".join(re.escape(c) for c in characters) + "]"
+
+
+class FastSentenceSegmenter:
+    """
+    Incremental sentence segmenter working on text chunks.
+
+    The quick-yield options match stream2sentence: the first fragment of the
+    text (of every sentence with quick_yield_for_all_sentences, every fragment
+    with quick_yield_every_fragment) is yielded at the first fragment
+    delimiter once it is longer than minimum_first_fragment_length, or at a
+    space once force_first_fragment_after_words words were read.
+    """
+
+    def __init__(
+        self,
+        minimum_sentence_length: int = 10,
+        minimum_first_fragment_length: int = 10,
+        quick_yield_single_sentence_fragment: bool = False,
+        quick_yield_for_all_sentences: bool = False,
+        quick_yield_every_fragment: bool = False,
+        cleanup_text_links: bool = False,
+        cleanup_text_emojis: bool = False,
+        sentence_fragment_delimiters: str = ".?!;:,\n…)]}。-",
+        full_sentence_delimiters: str = FULL_SENTENCE_DELIMITERS,
+        force_first_fragment_after_words: int = 30,
+    ):
+        """
+        Args:
+            minimum_sentence_length (int): Sentences shorter than this are
+              merged with the following text.
+            minimum_first_fragment_length (int): Minimum length of a quickly
+              yielded first fragment.
+            quick_yield_single_sentence_fragment (bool): Yield the first
+              fragment of the text as soon as possible.
+            quick_yield_for_all_sentences (bool): Yield the first fragment of
+              every sentence as soon as possible.
+            quick_yield_every_fragment (bool): Yield every fragment as soon
+              as possible.
+            cleanup_text_links (bool): Remove links from the yielded text.
+            cleanup_text_emojis (bool): Remove emojis from the yielded text.
+            sentence_fragment_delimiters (str): Characters ending a fragment.
+            full_sentence_delimiters (str): Characters ending a sentence.
+            force_first_fragment_after_words (int): Number of words after
+              which a first fragment is yielded even without a delimiter.
+        """
+        if quick_yield_every_fragment:
+            quick_yield_for_all_sentences = True
+        if quick_yield_for_all_sentences:
+            quick_yield_single_sentence_fragment = True
+
+        self.minimum_sentence_length = minimum_sentence_length
+        self.minimum_first_fragment_length = minimum_first_fragment_length
+        self.quick_yield_single_sentence_fragment = quick_yield_single_sentence_fragment
+        self.quick_yield_for_all_sentences = quick_yield_for_all_sentences
+        self.quick_yield_every_fragment = quick_yield_every_fragment
+        self.cleanup_text_links = cleanup_text_links
+        self.cleanup_text_emojis = cleanup_text_emojis
+        self.sentence_fragment_delimiters = sentence_fragment_delimiters
+        self.full_sentence_delimiters = full_sentence_delimiters
+        self.force_first_fragment_after_words = force_first_fragment_after_words
+
+        self.fragment_pattern = re.compile(
+            r"\s|" + _character_class(sentence_fragment_delimiters)
+        )
+        self.sentence_pattern = re.compile(_character_class(full_sentence_delimiters))
+        self.continuation = set(full_sentence_delimiters + CLOSING_CHARACTERS)
+        self.reset()
+
+    def reset(self):
+        """Discards all buffered text."""
+        self.buffer = ""
+        self.scan_position = 0
+        self.word_count = 0
+        self.is_first_sentence = True
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Adds a chunk of text.
+
+        Args:
+            text (str): The next chunk of the text stream.
+
+        Returns:
+            List[str]: Sentences (or fragments) completed by the chunk.
+        """
+        if not text:
+            return []
+        if not self.buffer:
+            text = text.lstrip()
+        self.buffer += text
+
+        sentences = []
+        while True:
+            end = self._find_end()
+            if end is None:
+                return sentences
+            sentence = self._cut(end)
+            if sentence:
+                sentences.append(sentence)
+
+    def flush(self) -> List[str]:
+        """
+        Ends the text stream.
+
+        Returns:
+            List[str]: The remaining text as last sentence, if any.
+        """
+        sentence = self._clean(self.buffer)
+        self.reset()
+        return [sentence] if sentence else []
+
+    def _quick_yield(self) -> bool:
+        return self.is_first_sentence and self.quick_yield_single_sentence_fragment
+
+    def _find_end(self):
+        """Returns the end index of the next sentence in the buffer, None if unknown yet."""
+        if self._quick_yield():
+            return self._find_fragment_end()
+        return self._find_sentence_end()
+
+    def _find_fragment_end(self):
+        buffer = self.buffer
+        for match in self.fragment_pattern.finditer(buffer, self.scan_position):
+            position = match.start()
+            char = buffer[position]
+            self.word_count += 1
+            if position + 1 > self.minimum_first_fragment_length and (
+                char in self.sentence_fragment_delimiters
+                or (char.isspace() and self.word_count >= self.force_first_fragment_after_words)
+            ):
+                return position + 1
+        self.scan_position = len(buffer)
+        return None
+
+    def _find_sentence_end(self):
+        buffer = self.buffer
+        for match in self.sentence_pattern.finditer(buffer, self.scan_position):
+            position = match.start()
+            end = self._boundary_after(position)
+            if end is None:
+                # Decided once the next sentence starts
+                self.scan_position = position
+                return None
+            if end > 0 and len(buffer[:end].strip()) >= self.minimum_sentence_length:
+                return end
+        self.scan_position = len(buffer)
+        return None
+
+    def _boundary_after(self, position: int):
+        """
+        Checks if the delimiter at position ends a sentence.
+
+        Returns:
+            int: Index after the sentence, -1 if it is no sentence end,
+              None if the following text is needed to decide.
+        """
+        buffer = self.buffer
+        length = len(buffer)
+        char = buffer[position]
+        if char in IMMEDIATE_DELIMITERS:
+            return position + 1
+
+        end = position + 1
+        while end < length and buffer[end] in self.continuation:
+            end += 1
+        if end == length:
+            return None
+        if not buffer[end].isspace():
+            # "3.14", "e.g.x", "file.txt"
+            return -1
+
+        next_start = end
+        while next_start < length and buffer[next_start].isspace():
+            next_start += 1
+        if next_start == length:
+            return None
+        if buffer[next_start].islower():
+            return -1
+
+        if char == ".":
+            words = buffer[max(0, position - 10):position].split()
+            word = words[-1].lstrip(CLOSING_CHARACTERS + "([{") if words else ""
+            if (len(word) == 1 and word.isalpha()) or word.lower() in ABBREVIATIONS:
+                return -1
+        return end
+
+    def _cut(self, end: int) -> str:
+        """Removes the text up to end from the buffer and returns it cleaned."""
+        sentence = self.buffer[:end]
+        self.buffer = self.buffer[end:].lstrip()
+        self.scan_position = 0
+        self.word_count = 0
+
+        if self._quick_yield():
+            if not self.quick_yield_every_fragment:
+                self.is_first_sentence = False
+        elif self.quick_yield_for_all_sentences:
+            self.is_first_sentence = True
+        return self._clean(sentence)
+
+    def _clean(self, text: str) -> str:
+        if self.cleanup_text_links:
+            text = _LINK_PATTERN.sub("", text)
+        if self.cleanup_text_emojis:
+            text = _EMOJI_PATTERN.sub("", text)
+        return text.strip()
+
+
+def generate_sentences_fast(
+    generator: Iterable[str],
+    minimum_sentence_length: int = 10,
+    minimum_first_fragment_length: int = 10,
+    quick_yield_single_sentence_fragment: bool = False,
+    quick_yield_for_all_sentences: bool = False,
+    quick_yield_every_fragment: bool = False,
+    cleanup_text_links: bool = False,
+    cleanup_text_emojis: bool = False,
+    sentence_fragment_delimiters: str = ".?!;:,\n…)]}。-",
+    full_sentence_delimiters: str = FULL_SENTENCE_DELIMITERS,
+    force_first_fragment_after_words: int = 30,
+    **_,
+) -> Iterator[str]:
+    """
+    Generates sentences from a stream of text chunks with the
+    FastSentenceSegmenter. Takes the arguments of
+    stream2sentence.generate_sentences, tokenizer specific ones (context
+    sizes, tokenize_sentences, language) are ignored.
+
+    Args:
+        generator (Iterable[str]): The text chunks.
+        See FastSentenceSegmenter for the other arguments.
+
+    Yields:
+        str: The sentences (and quickly yielded fragments).
+    """
+    segmenter = FastSentenceSegmenter(
+        minimum_sentence_length=minimum_sentence_length,
+        minimum_first_fragment_length=minimum_first_fragment_length,
+        quick_yield_single_sentence_fragment=quick_yield_single_sentence_fragment,
+        quick_yield_for_all_sentences=quick_yield_for_all_sentences,
+        quick_yield_every_fragment=quick_yield_every_fragment,
+        cleanup_text_links=cleanup_text_links,
+        cleanup_text_emojis=cleanup_text_emojis,
+        sentence_fragment_delimiters=sentence_fragment_delimiters,
+        full_sentence_delimiters=full_sentence_delimiters,
+        force_first_fragment_after_words=force_first_fragment_after_words,
+    )
+    for chunk in generator:
+        for sentence in segmenter.feed(chunk):
+            yield sentence
+    for sentence in segmenter.flush():
+        yield sentence
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Splits a complete text into sentences.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        List[str]: The sentences.
+    """
+    segmenter = FastSentenceSegmenter(minimum_sentence_length=0)
+    return segmenter.feed(text) + segmenter.flush()
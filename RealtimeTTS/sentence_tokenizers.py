@@ -0,0 +1,141 @@
+"""
+Sentence Tokenizers Module
+--------------------------
+Process-wide cache of the sentence tokenizers used for sentence detection.
+
+stream2sentence keeps a single global tokenizer, re-runs its initialization
+on every generate_sentences() call (NLTK retries the punkt download as long
+as it fails) and keeps the Stanza pipeline of the first language it was
+initialized with. Here each (tokenizer, language) pair is initialized once
+per process, on first use, and shared by all TextToAudioStream objects, so
+creating a stream per request stays cheap. stream2sentence (and with it
+NLTK) is only imported once an "nltk" or "stanza" tokenizer is used.
+
+- get_sentence_tokenizer(tokenizer, language): Returns the tokenize
+  function for the pair, initializing it on first use.
+- warm_up_tokenizer(tokenizer, language): Initializes a tokenizer ahead of
+  time, e.g. from an application startup hook.
+- get_sentence_generator(tokenizer): Returns the function splitting a text
+  stream into sentences.
+"""
+
+from .sentence_segmenter import split_sentences, generate_sentences_fast
+from typing import Callable, Dict, List, Tuple
+import threading
+import logging
+
+_tokenizers: Dict[Tuple[str, str], Callable[[str], List[str]]] = {}
+_lock = threading.Lock()
+
+
+def _create_nltk_tokenizer(language: str) -> Callable[[str], List[str]]:
+    """
+    Loads NLTK punkt, downloading it only if it is not installed yet.
+    Uses the same (English) punkt model as stream2sentence.
+    """
+    import stream2sentence.stream2sentence as s2s_module
+    import nltk
+
+    try:
+        nltk.data.find("tokenizers/punkt_tab")
+    except LookupError:
+        try:
+            nltk.download("punkt_tab", quiet=True)
+        except Exception as e:
+            logging.warning(f"Error downloading nltk punkt_tab: {e}")
+
+    # stream2sentence re-runs its own initialization on every call
+    s2s_module.nltk_initialized = True
+    return nltk.tokenize.sent_tokenize
+
+
+def _create_stanza_tokenizer(language: str) -> Callable[[str], List[str]]:
+    """Builds a Stanza tokenize pipeline for language, downloading the model if needed."""
+    import stream2sentence.stream2sentence as s2s_module
+    import stanza
+
+    try:
+        nlp = stanza.Pipeline(
+            lang=language, processors="tokenize", download_method=None
+        )
+    except Exception:
+        stanza.download(language, processors="tokenize")
+        nlp = stanza.Pipeline(
+            lang=language, processors="tokenize", download_method=None
+        )
+
+    # Spares stream2sentence building a pipeline of its own
+    if s2s_module.nlp is None:
+        s2s_module.nlp = nlp
+        s2s_module.stanza_initialized = True
+
+    def tokenize(text: str) -> List[str]:
+        return [sentence.text for sentence in nlp(text).sentences]
+
+    return tokenize
+
+
+_factories = {
+    "nltk": _create_nltk_tokenizer,
+    "stanza": _create_stanza_tokenizer,
+    "fast": lambda language: split_sentences,
+}
+
+
+def get_sentence_tokenizer(
+    tokenizer: str = "nltk", language: str = "en"
+) -> Callable[[str], List[str]]:
+    """
+    Returns the sentence tokenize function for tokenizer and language.
+    The tokenizer is initialized on the first call and cached for the process.
+
+    Args:
+        tokenizer (str): "nltk", "stanza" or "fast".
+        language (str): Language code, e.g. "en".
+
+    Returns:
+        Callable[[str], List[str]]: Function splitting a text into sentences,
+          to be passed as tokenize_sentences to stream2sentence.
+    """
+    key = (tokenizer, language)
+    tokenize = _tokenizers.get(key)
+    if tokenize is not None:
+        return tokenize
+
+    factory = _factories.get(tokenizer)
+    if factory is None:
+        raise ValueError(f"Unknown tokenizer: {tokenizer}")
+
+    with _lock:
+        tokenize = _tokenizers.get(key)
+        if tokenize is None:
+            logging.info(f"Initializing tokenizer {tokenizer} for language {language}")
+            tokenize = factory(language)
+            _tokenizers[key] = tokenize
+    return tokenize
+
+
+def warm_up_tokenizer(tokenizer: str = "nltk", language: str = "en"):
+    """
+    Initializes a sentence tokenizer ahead of time, so the first stream
+    using it doesn't pay the initialization.
+
+    Args:
+        tokenizer (str): "nltk", "stanza" or "fast".
+        language (str): Language code, e.g. "en".
+    """
+    get_sentence_tokenizer(tokenizer, language)
+
+
+def get_sentence_generator(tokenizer: str) -> Callable:
+    """
+    Returns the function splitting a text stream into sentences: the
+    built-in segmenter for the "fast" tokenizer, stream2sentence otherwise.
+    Both take the arguments of stream2sentence.generate_sentences.
+    """
+    if tokenizer == "fast":
+        return generate_sentences_fast
+
+    # Imported on use, so the "fast" tokenizer doesn't load NLTK
+    import stream2sentence as s2s
+    return s2s.generate_sentences
@@ -0,0 +1,382 @@
+"""
+Stream Manager Module
+---------------------
+Serves many concurrent text-to-speech sessions from one loaded engine.
+
+- StreamManager: Owns the engine and a scheduler thread that synthesizes
+  the pending sentences of all sessions one at a time, round-robin, so a
+  long text doesn't hold back the other sessions.
+- StreamSession: A logical stream with its own text input, sentence
+  splitting and audio output queue. Audio is read by iterating the session.
+
+The engine's output is routed into the session being served through
+BaseEngine.redirect_output(), the engine's own queue is not used. Word
+timings are not delivered to sessions.
+
+Usage:
+    manager = StreamManager(KokoroEngine())
+
+    session = manager.create_session("Hello world. How are you?")
+    for chunk in session:
+        send(chunk)
+"""
+
+from .sentence_tokenizers import get_sentence_tokenizer, get_sentence_generator
+from .sentence_cache import SentenceCache, CacheRecorder
+from .audio_frame import AudioFrame
+from .engines import BaseEngine
+from typing import Union, Iterator, List
+from collections import deque
+import threading
+import logging
+import queue
+
+
+class StreamSession:
+    """
+    One logical text-to-speech stream of a StreamManager.
+
+    Text is fed with feed() and ended with close(), the audio chunks (in the
+    engine's stream format) are read by iterating the session. Iteration ends
+    once all text was synthesized or the session was cancelled.
+    """
+
+    _END = object()
+
+    def __init__(self, manager: "StreamManager", session_id: int, voice=None):
+        """
+        Args:
+            manager (StreamManager): The manager serving the session.
+            session_id (int): Identifier of the session.
+            voice (optional): Voice set on the engine while sentences of this
+              session are synthesized. None uses the engine's current voice.
+        """
+        self.manager = manager
+        self.id = session_id
+        self.voice = voice
+        self.chunks = queue.Queue()
+        self.pending = deque()
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        self.input_done = False
+        self.text_items = queue.Queue()
+        self.splitter_thread = threading.Thread(target=self._split_sentences, daemon=True)
+        self.splitter_thread.start()
+
+    def feed(self, text_or_iterator: Union[str, Iterator[str]]) -> "StreamSession":
+        """
+        Feeds text or a text iterator (e.g. LLM tokens) to the session.
+
+        Returns:
+            Self instance.
+        """
+        self.text_items.put(text_or_iterator)
+        return self
+
+    def close(self):
+        """Marks the end of the text, the session finishes after synthesizing it."""
+        self.text_items.put(self._END)
+
+    def cancel(self):
+        """
+        Stops the session: pending sentences are dropped, a sentence being
+        synthesized is stopped and iteration ends right away.
+        """
+        self.manager._cancel(self)
+
+    def put(self, chunk, block: bool = True, timeout: float = None):
+        """
+        Receives an audio chunk from the engine.
+
+        Args:
+            chunk: Audio data chunk.
+            block, timeout: Accepted for queue.Queue compatibility, ignored.
+        """
+        if not self.cancelled.is_set():
+            if isinstance(chunk, AudioFrame):
+                chunk = bytes(chunk)
+            self.chunks.put(chunk)
+
+    def put_nowait(self, chunk):
+        """Receives an audio chunk from the engine."""
+        self.put(chunk)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yields the audio chunks until the session is finished."""
+        while True:
+            chunk = self.chunks.get()
+            if chunk is self._END:
+                self.chunks.put(self._END)
+                return
+            yield chunk
+
+    def _text(self) -> Iterator[str]:
+        """Yields the fed text chunks until close() or cancel() is called."""
+        while not self.cancelled.is_set():
+            item = self.text_items.get()
+            if item is self._END:
+                return
+            if isinstance(item, str):
+                yield item
+                continue
+            for token in item:
+                if self.cancelled.is_set():
+                    return
+                if hasattr(token, "choices"):
+                    token = token.choices[0].delta.content or ""
+                yield str(token)
+
+    def _split_sentences(self):
+        """Splits the fed text into sentences and hands them to the manager."""
+        manager = self.manager
+        try:
+            sentences = get_sentence_generator(manager.tokenizer)(
+                self._text(),
+                tokenize_sentences=manager.tokenize_sentences,
+                tokenizer=manager.tokenizer,
+                language=manager.language,
+                **manager.sentence_kwargs,
+            )
+            for sentence in sentences:
+                if self.cancelled.is_set():
+                    break
+                sentence = sentence.strip()
+                if sentence:
+                    manager._add_sentence(self, sentence)
+        except Exception as e:
+            logging.warning(f"session {self.id} failed to split text into sentences: {e}")
+        finally:
+            manager._input_finished(self)
+
+
+class StreamManager:
+    """
+    Shares one engine between many StreamSessions.
+
+    A single scheduler thread synthesizes one sentence at a time and moves
+    to the next session with pending sentences after each one. Sessions
+    whose consumer lags behind by more than max_buffered_chunks chunks are
+    skipped until it caught up.
+    """
+
+    def __init__(
+        self,
+        engine: BaseEngine,
+        sentence_cache: SentenceCache = None,
+        tokenizer: str = "nltk",
+        language: str = "en",
+        tokenize_sentences=None,
+        max_buffered_chunks: int = 256,
+        default_voice=None,
+        **sentence_kwargs,
+    ):
+        """
+        Args:
+            engine (BaseEngine): The engine shared by all sessions.
+            sentence_cache (SentenceCache, optional): Cache for synthesized
+              sentence audio, shared by all sessions.
+            tokenizer (str): Sentence tokenizer, "nltk", "stanza" or "fast".
+            language (str): Language code for sentence splitting.
+            tokenize_sentences (Callable, optional): Custom function splitting
+              a text into sentences.
+            max_buffered_chunks (int): Number of unread chunks above which a
+              session is not served until its consumer catches up.
+            default_voice (optional): Voice set for sessions created without
+              a voice. If None, those sessions use whatever voice the engine
+              has at the time, which may be the voice of the session served
+              before them.
+            **sentence_kwargs: Sentence splitting arguments of
+              stream2sentence.generate_sentences, e.g. minimum_sentence_length
+              or quick_yield_single_sentence_fragment.
+        """
+        self.engine = engine
+        self.sentence_cache = sentence_cache
+        self.tokenizer = tokenizer
+        self.language = language
+        self.tokenize_sentences = tokenize_sentences or get_sentence_tokenizer(tokenizer, language)
+        self.max_buffered_chunks = max_buffered_chunks
+        self.default_voice = default_voice
+        self.sentence_kwargs = {
+            "quick_yield_single_sentence_fragment": True,
+            "cleanup_text_links": True,
+            "cleanup_text_emojis": True,
+        }
+        self.sentence_kwargs.update(sentence_kwargs)
+
+        self.sessions: List[StreamSession] = []
+        self.next_session = 0
+        self.session_count = 0
+        self.current_session = None
+        self.current_voice = None
+        self.running = True
+        self.condition = threading.Condition()
+        self.scheduler_thread = threading.Thread(target=self._run, daemon=True)
+        self.scheduler_thread.start()
+
+    def get_stream_info(self):
+        """
+        Returns:
+            tuple: Format, channels and sample rate of the session audio.
+        """
+        return self.engine.get_stream_info()
+
+    def create_session(
+        self,
+        text_or_iterator: Union[str, Iterator[str]] = None,
+        voice=None,
+    ) -> StreamSession:
+        """
+        Creates a session.
+
+        Args:
+            text_or_iterator (optional): If given, it is fed and the session
+              is closed, so it ends after synthesizing this text.
+            voice (optional): Voice for this session's sentences, None uses
+              the manager's default_voice (or, without one, the engine's
+              current voice).
+
+        Returns:
+            StreamSession: The new session.
+        """
+        with self.condition:
+            if not self.running:
+                raise RuntimeError("StreamManager was shut down")
+            self.session_count += 1
+            session = StreamSession(self, self.session_count, voice)
+            self.sessions.append(session)
+
+        if text_or_iterator is not None:
+            session.feed(text_or_iterator)
+            session.close()
+        return session
+
+    def shutdown(self):
+        """Cancels all sessions and stops the scheduler (the engine is not shut down)."""
+        with self.condition:
+            sessions = list(self.sessions)
+        for session in sessions:
+            session.cancel()
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.scheduler_thread.join()
+
+    def _add_sentence(self, session: StreamSession, sentence: str):
+        with self.condition:
+            if not session.cancelled.is_set():
+                session.pending.append(sentence)
+                self.condition.notify_all()
+
+    def _input_finished(self, session: StreamSession):
+        with self.condition:
+            session.input_done = True
+            self._finish_if_done(session)
+            self.condition.notify_all()
+
+    def _cancel(self, session: StreamSession):
+        with self.condition:
+            if session.finished.is_set():
+                return
+            session.cancelled.set()
+            session.pending.clear()
+            if self.current_session is session:
+                self.engine.stop()
+            session.text_items.put(StreamSession._END)
+
+            # Drop the audio the consumer didn't read yet
+            while not session.chunks.empty():
+                try:
+                    session.chunks.get_nowait()
+                except queue.Empty:
+                    break
+            self._finish(session)
+
+    def _finish_if_done(self, session: StreamSession):
+        """Ends a session without text left to synthesize. Caller holds the condition."""
+        if session.input_done and not session.pending and self.current_session is not session:
+            self._finish(session)
+
+    def _finish(self, session: StreamSession):
+        """Ends the session's output. Caller holds the condition."""
+        if session.finished.is_set():
+            return
+        session.finished.set()
+        session.chunks.put(StreamSession._END)
+        if session in self.sessions:
+            self.sessions.remove(session)
+
+    def _next_job(self):
+        """Picks the next sentence round-robin. Caller holds the condition."""
+        count = len(self.sessions)
+        for offset in range(count):
+            index = (self.next_session + offset) % count
+            session = self.sessions[index]
+            if session.pending and session.chunks.qsize() < self.max_buffered_chunks:
+                self.next_session = index + 1
+                return session, session.pending.popleft()
+        return None
+
+    def _run(self):
+        while True:
+            with self.condition:
+                job = self._next_job()
+                while job is None and self.running:
+                    # Timeout: sessions held back by a slow consumer become
+                    # eligible again without a notification
+                    self.condition.wait(timeout=0.05)
+                    job = self._next_job()
+                if not self.running:
+                    return
+                session, sentence = job
+                self.current_session = session
+
+            try:
+                self._synthesize(session, sentence)
+            except Exception as e:
+                # The scheduler serves the other sessions, it must keep running
+                logging.warning(f'session {session.id} failed on sentence "{sentence}" with error: {e}')
+            finally:
+                with self.condition:
+                    self.current_session = None
+                    self._finish_if_done(session)
+
+    def _synthesize(self, session: StreamSession, sentence: str):
+        """Synthesizes a sentence into the session's output."""
+        engine = self.engine
+        voice = session.voice if session.voice is not None else self.default_voice
+        # Equal voices given as distinct objects don't need another set_voice()
+        if voice is not None and voice != self.current_voice:
+            try:
+                engine.set_voice(voice)
+            except Exception as e:
+                # Without its voice the session can't be served, the engine's
+                # voice is unknown now and set again for the next session
+                logging.warning(f"session {session.id} failed to set voice {voice} with error: {e}")
+                self.current_voice = None
+                session.cancel()
+                return
+            self.current_voice = voice
+
+        key = None
+        if self.sentence_cache is not None:
+            key = self.sentence_cache.make_key(engine, sentence)
+            cached = self.sentence_cache.get(key) if key else None
+            if cached is not None:
+                for chunk in cached:
+                    session.put(chunk)
+                return
+
+        recorder = CacheRecorder(session) if key else session
+        try:
+            with engine.redirect_output(recorder):
+                success = engine.synthesize(sentence)
+        except Exception as e:
+            logging.warning(f'session {session.id} failed to synthesize sentence "{sentence}" with error: {e}')
+            success = False
+
+        # Word timings are not delivered to sessions
+        while not engine.timings.empty():
+            engine.timings.get_nowait()
+
+        if key and success and not session.cancelled.is_set():
+            self.sentence_cache.put(key, recorder.chunks)
@@ -8,29 +8,42 @@ This module provides classes to handle audio streaming using PyAudio. It covers:
   - Playback with pause, resume, and stop (StreamPlayer)
 
 Key Components:
-  1. AudioConfiguration: Sets up audio parameters (format, channels, sample rate, device).
-  2. AudioStream: Manages opening, starting, stopping, and closing streams, and adapts to device capabilities.
+  1. AudioConfiguration: Sets up audio parameters (format, channels, sample rate, device, output sink).
+  2. AudioStream: The PyAudio output sink. Manages opening, starting, stopping, and closing streams, and adapts to device capabilities.
   3. AudioBufferManager: Buffers audio data in a queue and tracks sample counts.
   4. StreamPlayer: Orchestrates playback, handles events, and supports callbacks.
 
+Other sinks (ring buffer, file, callback) live in audio_sinks.py. PyAudio is
+only initialized once a device stream is actually opened.
+
 Designed for flexible, real-time audio playback and streaming, with error handling for unsupported configurations.
 """
-from pydub import AudioSegment
+from .audio_sinks import AudioSink
+from .buffer_controller import get_bytes_per_second
+from .resampler import StreamingResampler
+from .ring_buffer import AudioRingBuffer
+from .word_timings import WordTimingQueue
+from .audio_frame import AudioFrame, AUDIO_CHUNK_TYPES
+from .mp3_decoder import StreamingMp3Decoder, is_decoder_available
+from . import audio_devices
+from .metrics import SentenceMarker
 try:
     import pyaudio._portaudio as pa
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
 except ImportError:
-    print("Could not import the PyAudio C module 'pyaudio._portaudio'.")
-    raise
-import numpy as np
+    # No PortAudio on this system, only muted playback and non-device sinks work
+    from . import audio_formats as pa
+    from . import audio_formats as pyaudio
+    PYAUDIO_AVAILABLE = False
+from . import audio_formats
 import subprocess
 import threading
-import resampy
-import pyaudio
 import logging
 import shutil
 import queue
 import time
-import io
+import copy
 
 
 class AudioConfiguration:
@@ -47,6 +60,9 @@ class AudioConfiguration:
         muted: bool = False,
         frames_per_buffer: int = pa.paFramesPerBufferUnspecified,
         playout_chunk_size: int = -1,
+        output_sink: AudioSink = None,
+        callback_mode: bool = False,
+        decode_mpeg: bool = True,
     ):
         """
         Args:
@@ -57,6 +73,9 @@ class AudioConfiguration:
             muted (bool): If True, audio playback is muted. Defaults to False.
             frames_per_buffer (int): Number of frames per buffer for PyAudio. Defaults to pa.paFramesPerBufferUnspecified, letting PyAudio choose.
             playout_chunk_size (int): Size of audio chunks (in bytes) to be played out. Defaults to -1, which determines the chunk size based on frames_per_buffer or a default value.
+            output_sink (AudioSink): Destination of the played-out audio. Defaults to None, which plays to the PyAudio output device.
+            callback_mode (bool): If True, the output device pulls the audio from a ring buffer through PortAudio's callback API instead of blocking writes. Defaults to False.
+            decode_mpeg (bool): If True, mpeg streams (channels and rate -1) are decoded to PCM with ffmpeg and played like other audio instead of being piped to mpv. Falls back to mpv if ffmpeg is not installed. Defaults to True.
 
         """
         self.format = format
@@ -66,10 +85,21 @@ class AudioConfiguration:
         self.muted = muted
         self.frames_per_buffer = frames_per_buffer
         self.playout_chunk_size = playout_chunk_size
+        self.output_sink = output_sink
+        self.callback_mode = callback_mode
+        self.decode_mpeg = decode_mpeg
+
+
+# Seconds of audio the ring buffer of a callback mode stream holds
+CALLBACK_BUFFER_SECONDS = 0.2
+
+# Seconds between checks for newly decoded audio while an mp3 decoder runs
+DECODER_POLL_INTERVAL = 0.01
 
 
-class AudioStream:
+class AudioStream(AudioSink):
     """
+    Audio sink playing to a PyAudio output device (or mpv for mpeg streams).
     Handles audio stream operations
     - opening, starting, stopping, and closing
     """
@@ -79,15 +109,33 @@ class AudioStream:
         Args:
             config (AudioConfiguration): Object containing audio settings.
         """
+        super().__init__()
         self.config = config
         self.stream = None
-        self.pyaudio_instance = pyaudio.PyAudio()
         self.actual_sample_rate = 0
         self.mpv_process = None
+        self.write_aborted = threading.Event()
+
+        # Callback mode
+        self.ring_buffer = None
+        self.callback_buffer = bytearray()
+        self.silence = b""
+        self.frame_bytes = 0
+        self.output_paused = False
+        self.expecting_audio = False
+        self.in_underrun = False
+        self.underruns = 0
+        self.device_latency = 0.0
+
+    @property
+    def pyaudio_instance(self):
+        """The process-wide PyAudio instance, created on first use."""
+        return audio_devices.get_pyaudio()
 
     def get_supported_sample_rates(self, device_index):
         """
         Test which standard sample rates are supported by the specified device.
+        The result is cached per device and format, see audio_devices.invalidate_device_cache().
         
         Args:
             device_index (int): The index of the audio device to test
@@ -95,25 +143,7 @@ class AudioStream:
         Returns:
             list: List of supported sample rates
         """
-        standard_rates = [8000, 9600, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000]
-        supported_rates = []
-
-        device_info = self.pyaudio_instance.get_device_info_by_index(device_index)
-        max_channels = device_info.get('maxOutputChannels')
-
-        # Test each standard sample rate
-        for rate in standard_rates:
-            try:
-                if self.pyaudio_instance.is_format_supported(
-                    rate,
-                    output_device=device_index,
-                    output_channels=max_channels,
-                    output_format=self.config.format,
-                ):
-                    supported_rates.append(rate)
-            except:
-                continue
-        return supported_rates
+        return audio_devices.get_supported_sample_rates(device_index, self.config.format)
 
     def _get_best_sample_rate(self, device_index, desired_rate):
         """
@@ -129,10 +159,10 @@ class AudioStream:
         try:
             # First determine the actual device index to use
             actual_device_index = (device_index if device_index is not None 
-                                else self.pyaudio_instance.get_default_output_device_info()['index'])
+                                else audio_devices.get_default_output_device_index())
 
             # Now use the actual_device_index for getting device info and supported rates
-            device_info = self.pyaudio_instance.get_device_info_by_index(actual_device_index)
+            device_info = audio_devices.get_device_info(actual_device_index)
             supported_rates = self.get_supported_sample_rates(actual_device_index)
 
             # Check if desired rate is supported
@@ -222,7 +252,7 @@ class AudioStream:
             self.actual_sample_rate = best_rate
 
             if self.config.format == pyaudio.paCustomFormat:
-                pyFormat = self.pyaudio_instance.get_format_from_width(2)
+                pyFormat = audio_formats.paInt16
                 logging.debug(
                     "Opening stream for mpeg audio chunks, "
                     f"pyFormat: {pyFormat}, pyChannels: {pyChannels}, "
@@ -235,6 +265,16 @@ class AudioStream:
                     f"pyFormat: {pyFormat}, pyChannels: {pyChannels}, "
                     f"pySampleRate: {best_rate}"
                 )
+            stream_callback = None
+            if self.config.callback_mode:
+                self.frame_bytes = audio_formats.get_sample_size(pyFormat) * pyChannels
+                capacity_frames = max(
+                    int(best_rate * CALLBACK_BUFFER_SECONDS),
+                    4 * self.config.frames_per_buffer,
+                )
+                self.ring_buffer = AudioRingBuffer(capacity_frames * self.frame_bytes)
+                stream_callback = self._stream_callback
+
             try:
                 self.stream = self.pyaudio_instance.open(
                     format=pyFormat,
@@ -243,7 +283,9 @@ class AudioStream:
                     output_device_index=pyOutput_device_index,
                     frames_per_buffer=self.config.frames_per_buffer,
                     output=True,
+                    stream_callback=stream_callback,
                 )
+                self.device_latency = self.stream.get_output_latency()
             except Exception as e:
                 print(
                     "Error opening stream with parameters:"
@@ -270,25 +312,95 @@ class AudioStream:
 
     def start_stream(self):
         """Starts the audio stream."""
+        self.write_aborted.clear()
         if self.stream and not self.stream.is_active():
             self.stream.start_stream()
 
     def stop_stream(self):
-        """Stops the audio stream."""
+        """Stops the audio stream (in callback mode after the buffered audio was played)."""
+        if self.ring_buffer:
+            if self.write_aborted.is_set():
+                self.ring_buffer.clear()
+            elif not self.ring_buffer.wait_drained(timeout=CALLBACK_BUFFER_SECONDS + 0.5):
+                logging.warning("callback stream did not consume the buffered audio")
+            self.expecting_audio = False
+        self.write_aborted.clear()
         if self.stream and self.stream.is_active():
             self.stream.stop_stream()
 
+    def abort_write(self):
+        """
+        Makes a write() waiting for buffer space return right away and drops
+        further writes until the stream is started or stopped again.
+        In callback mode the buffered audio is dropped as well.
+        """
+        self.write_aborted.set()
+        if self.ring_buffer:
+            self.expecting_audio = False
+            self.ring_buffer.clear()
+
+    def output_latency(self) -> float:
+        """
+        Returns:
+            float: Seconds between writing audio and hearing it, as reported
+              by the device plus the audio waiting in the ring buffer.
+        """
+        latency = self.device_latency
+        ring_buffer = self.ring_buffer
+        if ring_buffer and self.actual_sample_rate > 0:
+            latency += ring_buffer.available() / (self.frame_bytes * self.actual_sample_rate)
+        return latency
+
+    def set_paused(self, paused: bool):
+        """In callback mode, plays silence while paused without consuming the buffered audio."""
+        self.output_paused = paused
+
+    def _stream_callback(self, in_data, frame_count, time_info, status):
+        """
+        PortAudio callback, pulls the next frames from the ring buffer.
+        Missing audio is filled with silence and counted as underrun.
+        """
+        count = frame_count * self.frame_bytes
+        if len(self.callback_buffer) != count:
+            self.callback_buffer = bytearray(count)
+            self.silence = bytes(count)
+
+        read = 0
+        if not self.output_paused:
+            read = self.ring_buffer.read_into(self.callback_buffer, count)
+        if read < count:
+            self.callback_buffer[read:] = memoryview(self.silence)[read:]
+
+        starved = (read < count and self.expecting_audio and not self.output_paused)
+        if (starved and not self.in_underrun) or status & pyaudio.paOutputUnderflow:
+            self.underruns += 1
+            logging.debug(f"audio output underrun ({self.underruns} in total)")
+        self.in_underrun = starved
+
+        return bytes(self.callback_buffer), pyaudio.paContinue
+
     def close_stream(self):
         """Closes the audio stream."""
         if self.stream:
             self.stop_stream()
             self.stream.close()
             self.stream = None
+            self.ring_buffer = None
         elif self.mpv_process:
             if self.mpv_process.stdin:
                 self.mpv_process.stdin.close()
             self.mpv_process.wait()
             self.mpv_process.terminate()
+            self.mpv_process = None
+
+    def is_stream_open(self) -> bool:
+        """
+        Checks if a device stream or mpv process is open.
+
+        Returns:
+            bool: True if the stream is open, False otherwise.
+        """
+        return self.stream is not None or self.mpv_process is not None
 
     def is_stream_active(self) -> bool:
         """
@@ -299,6 +411,79 @@ class AudioStream:
         """
         return self.stream and self.stream.is_active()
 
+    def write(self, chunk: bytes):
+        """
+        Writes audio data to the output device, waiting briefly for
+        buffer space first (or pipes mpeg data to mpv).
+
+        Args:
+            chunk (bytes): Audio data in the device format.
+        """
+        if not self.is_stream_open():
+            self.open_stream()
+            self.start_stream()
+
+        if self.mpv_process:
+            if self.mpv_process.stdin:
+                self.mpv_process.stdin.write(chunk)
+                self.mpv_process.stdin.flush()
+            return
+
+        if not self.stream:
+            return
+
+        if self.ring_buffer:
+            self._write_to_ring_buffer(chunk)
+            return
+
+        # Define the timeout duration in seconds
+        timeout = 0.1
+
+        # Record the start time
+        start_time = time.time()
+
+        if self.config.format == pyaudio.paCustomFormat:
+            sample_width = 2
+        else:
+            sample_width = audio_formats.get_sample_size(self.config.format)
+        frames_in_chunk = len(chunk) // (sample_width * self.config.channels)
+
+        # Wait until there's space in the buffer or the timeout is reached
+        while True:
+            available = self.stream.get_write_available()
+            if available >= frames_in_chunk:
+                break
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                print(f"Wait aborted: Timeout of {timeout}s exceeded. "
+                    f"Buffer availability: {available}, "
+                    f"Frames in sub-chunk: {frames_in_chunk}")
+                break
+
+            # Sleep about as long as the device needs to play the missing
+            # frames, abort_write() wakes the wait up right away
+            wait = 0.001
+            if self.actual_sample_rate > 0:
+                wait = max(wait, (frames_in_chunk - available) / self.actual_sample_rate)
+            if self.write_aborted.wait(min(wait, remaining)):
+                return
+
+        if self.write_aborted.is_set():
+            return
+        self.stream.write(chunk)
+
+    def _write_to_ring_buffer(self, chunk: bytes):
+        """Hands a chunk to the callback, waiting (not polling) while the ring buffer is full."""
+        self.expecting_audio = True
+        view = memoryview(chunk)
+        written = 0
+        while written < len(view) and not self.write_aborted.is_set():
+            written += self.ring_buffer.write(view[written:], self.write_aborted)
+            if written < len(view) and not self.output_paused and not self.write_aborted.is_set():
+                print(f"Wait aborted: output device consumed no audio for 1s, "
+                    f"dropping {len(view) - written} bytes")
+                break
+
 
 class AudioBufferManager:
     """
@@ -318,7 +503,6 @@ class AudioBufferManager:
         self.config = config
         self.audio_buffer = audio_buffer
         self.timings = timings
-        self.total_samples = 0
 
     def add_to_buffer(self, audio_data):
         """
@@ -328,7 +512,21 @@ class AudioBufferManager:
             audio_data: Audio data to be added.
         """
         self.audio_buffer.put(audio_data)
-        self.total_samples += len(audio_data) // 2
+
+    def get_buffered_bytes(self) -> int:
+        """
+        Returns:
+            int: Bytes of audio waiting in the buffer.
+        """
+        # Engine queues (AudioChunkQueue) keep count as chunks are put and taken
+        buffered_bytes = getattr(self.audio_buffer, "buffered_bytes", None)
+        if buffered_bytes is not None:
+            return buffered_bytes
+        with self.audio_buffer.mutex:
+            return sum(
+                len(chunk) for chunk in self.audio_buffer.queue
+                if isinstance(chunk, AUDIO_CHUNK_TYPES)
+            )
 
     def clear_buffer(self):
         """Clears all audio data from the buffer."""
@@ -342,7 +540,6 @@ class AudioBufferManager:
                 self.timings.get_nowait()
             except queue.Empty:
                 continue
-        self.total_samples = 0
 
     def get_from_buffer(self, timeout: float = 0.05):
         """
@@ -356,50 +553,27 @@ class AudioBufferManager:
             The audio data chunk or None if the buffer is empty.
         """
         try:
-            chunk = self.audio_buffer.get(timeout=timeout)
-
-            # Map PyAudio format to bytes per sample
-            format_bytes = {
-                pyaudio.paCustomFormat: 4,
-                pyaudio.paFloat32: 4,
-                pyaudio.paInt32: 4,
-                pyaudio.paInt24: 3,
-                pyaudio.paInt16: 2,
-                pyaudio.paInt8: 1,
-                pyaudio.paUInt8: 1
-            }
-
-            # Get format and channels from config
-            audio_format = self.config.format
-            channels = self.config.channels
-
-            # Log if format is unknown
-            if audio_format not in format_bytes:
-                print(f"Warning: Unknown audio format {audio_format} (0x{audio_format:x})")
-                print(f"Available formats: {[hex(k) for k in format_bytes.keys()]}")
-                format_bytes[audio_format] = 4  # Default to 4 bytes
-
-            # Calculate bytes per frame
-            bytes_per_frame = format_bytes[audio_format] * channels
-
-            # Update total samples counter
-            if chunk:
-                self.total_samples -= len(chunk) // bytes_per_frame
-            return True, chunk
+            return True, self.audio_buffer.get(timeout=timeout)
         except queue.Empty:
             return False, None
 
-    def get_buffered_seconds(self, rate: int) -> float:
+    def get_buffered_seconds(self, rate: int = None) -> float:
         """
-        Calculates the duration (in seconds) of the buffered audio data.
+        Calculates the duration (in seconds) of the buffered audio data
+        from the sample width and channel count of the audio format
+        (estimated for compressed mpeg streams).
 
         Args:
-            rate (int): Sample rate of the audio data.
+            rate (int, optional): Sample rate of the audio data, defaults
+              to the configured rate.
 
         Returns:
             float: Duration of buffered audio in seconds.
         """
-        return self.total_samples / rate
+        bytes_per_second = get_bytes_per_second(
+            self.config.format, self.config.channels, rate or self.config.rate
+        )
+        return self.get_buffered_bytes() / bytes_per_second
 
 
 class StreamPlayer:
@@ -434,12 +608,36 @@ class StreamPlayer:
             muted (bool): Initial muted state.
         """
         self.buffer_manager = AudioBufferManager(audio_buffer, timings, config)
+        self.config = config
         self.timings = timings
-        self.timings_list = []
-        self.audio_stream = AudioStream(config)
+        self.word_timings = WordTimingQueue(timings)
+        self.last_write_time = 0.0
+
+        # mp3 streams are decoded by one decoder process per stream and
+        # played as PCM. output_config is the decoded format, for engines
+        # not reporting it (mpeg) it is read from the first frame header.
+        self.mp3_decoder = None
+        self.output_config = config
+        if config.format == pyaudio.paCustomFormat:
+            if config.channels > 0 and config.rate > 0:
+                self.mp3_decoder = StreamingMp3Decoder(config.channels, config.rate)
+                self.output_config = self._decoded_config()
+            elif config.decode_mpeg and is_decoder_available():
+                self.mp3_decoder = StreamingMp3Decoder()
+                self.output_config = None
+
+        if config.output_sink is not None:
+            self.audio_stream = config.output_sink
+            self.audio_stream.configure(self.output_config or config)
+        else:
+            self.audio_stream = AudioStream(self.output_config or config)
         self.playback_active = False
         self.immediate_stop = threading.Event()
+        self.playback_stopped = threading.Event()
+        self.playback_stopped.set()
         self.pause_event = threading.Event()
+        self.resume_event = threading.Event()
+        self.resume_event.set()
         self.playback_thread = None
         self.on_playback_start = on_playback_start
         self.on_playback_stop = on_playback_stop
@@ -448,6 +646,8 @@ class StreamPlayer:
         self.first_chunk_played = False
         self.muted = muted
         self.seconds_played = 0
+        self.sentence_marker = None
+        self.resamplers = {}
 
     def _play_mpeg_chunk(self, chunk):
         """
@@ -463,40 +663,54 @@ class StreamPlayer:
                 self.first_chunk_played = True
 
             if not self.muted:
-                if self.audio_stream.mpv_process and self.audio_stream.mpv_process.stdin:
-                    self.audio_stream.mpv_process.stdin.write(chunk)
-                    self.audio_stream.mpv_process.stdin.flush()
+                self.audio_stream.write(chunk)
+            self._stamp_sentence_start()
 
             if self.on_audio_chunk:
                 self.on_audio_chunk(chunk)
 
-            import time
-            while self.pause_event.is_set():
-                time.sleep(0.01)
+            self.resume_event.wait()
 
         except Exception as e:
             print(f"Error sending audio data to mpv: {e}")
 
+    def _play_decoded(self, pcm: bytes):
+        """
+        Plays PCM from the mp3 decoder. The output is configured once the
+        format of an mpeg stream is known.
+
+        Args:
+            pcm (bytes): Decoded 16 bit audio, may be empty.
+        """
+        if not pcm:
+            return
+        if self.output_config is None:
+            self.output_config = self._decoded_config()
+            self._configure_output()
+        self._play_wav_chunk(pcm)
+
+    def _decoded_config(self) -> AudioConfiguration:
+        """Returns the player's configuration with the format of the decoded mp3 audio."""
+        config = copy.copy(self.config)
+        config.format = pyaudio.paInt16
+        config.channels = self.mp3_decoder.channels
+        config.rate = self.mp3_decoder.rate
+        return config
+
     def _play_wav_chunk(self, chunk):
-        if self.audio_stream.config.format == pyaudio.paCustomFormat:
-            segment = AudioSegment.from_file(io.BytesIO(chunk), format="mp3")
-            chunk = segment.raw_data
-            sample_width = segment.sample_width
-            channels = segment.channels
-        else:
-            sample_width = self.audio_stream.pyaudio_instance.get_sample_size(self.audio_stream.config.format)
-            channels = self.audio_stream.config.channels
+        sample_width = audio_formats.get_sample_size(self.audio_stream.config.format)
+        channels = self.audio_stream.config.channels
 
+        if not self.muted and not self.audio_stream.is_stream_open():
+            # Playback was started muted, open the output now so the
+            # device sample rate is known before resampling
+            self.audio_stream.open_stream()
+            self.audio_stream.start_stream()
+
+        output_rate = self.audio_stream.config.rate
         if self.audio_stream.config.rate != self.audio_stream.actual_sample_rate and self.audio_stream.actual_sample_rate > 0:
-            if self.audio_stream.config.format == pyaudio.paFloat32:
-                audio_data = np.frombuffer(chunk, dtype=np.float32)
-                resampled_data = resampy.resample(audio_data, self.audio_stream.config.rate, self.audio_stream.actual_sample_rate)
-                chunk = resampled_data.astype(np.float32).tobytes()
-            else:
-                audio_data = np.frombuffer(chunk, dtype=np.int16)
-                audio_data = audio_data.astype(np.float32) / 32768.0
-                resampled_data = resampy.resample(audio_data, self.audio_stream.config.rate, self.audio_stream.actual_sample_rate)
-                chunk = (resampled_data * 32768.0).astype(np.int16).tobytes()
+            chunk = self._get_resampler(channels).process(chunk)
+            output_rate = self.audio_stream.actual_sample_rate
 
         if self.audio_stream.config.playout_chunk_size > 0:
             sub_chunk_size = self.audio_stream.config.playout_chunk_size
@@ -507,6 +721,9 @@ class StreamPlayer:
                 sub_chunk_size = self.audio_stream.config.frames_per_buffer * sample_width * channels
 
         for i in range(0, len(chunk), sub_chunk_size):
+            if self.immediate_stop.is_set():
+                break
+
             sub_chunk = chunk[i : i + sub_chunk_size]
 
             if not self.first_chunk_played and self.on_playback_start:
@@ -515,52 +732,88 @@ class StreamPlayer:
 
             if not self.muted:
                 try:
-                    import time
-
-                    # Define the timeout duration in seconds
-                    timeout = 0.1
-
-                    # Record the start time
-                    start_time = time.time()
-
-                    frames_in_sub_chunk = len(sub_chunk) // (sample_width * channels)
-
-                    # Wait until there's space in the buffer or the timeout is reached
-                    while self.audio_stream.stream.get_write_available() < frames_in_sub_chunk:
-                        if time.time() - start_time > timeout:
-                            print(f"Wait aborted: Timeout of {timeout}s exceeded. "
-                                f"Buffer availability: {self.audio_stream.stream.get_write_available()}, "
-                                f"Frames in sub-chunk: {frames_in_sub_chunk}")
-                            break
-                        time.sleep(0.001)  # Small sleep to let the stream process audio
-
-                    self.audio_stream.stream.write(sub_chunk)
-                    self.seconds_played += len(sub_chunk) / (self.audio_stream.config.rate * sample_width * channels)
-                    while (True):
-                        try:
-                            timing = self.timings.get_nowait()
-                            self.timings_list.append(timing)
-                        except queue.Empty:
-                            break
-
-                    for timing in self.timings_list:
-                        if timing.start_time <= self.seconds_played:
-                            if self.on_word_spoken:
-                                self.on_word_spoken(timing)
-                            self.timings_list.remove(timing)
-                            break
+                    self.audio_stream.write(sub_chunk)
+                    self._stamp_sentence_start()
+                    self.seconds_played += len(sub_chunk) / (output_rate * sample_width * channels)
+                    self.last_write_time = time.time()
+                    self._dispatch_words()
                 except Exception as e:
                     print(f"RealtimeTTS error sending audio data: {e}")
+            else:
+                self._stamp_sentence_start()
 
             if self.on_audio_chunk:
                 self.on_audio_chunk(sub_chunk)
 
             # Pause playback if the event is set
-            while self.pause_event.is_set():
-                time.sleep(0.01)
+            self.resume_event.wait()
 
-            if self.immediate_stop.is_set():
-                break
+    def _dispatch_words(self, flush: bool = False):
+        """
+        Calls on_word_spoken for every word that started before the audible
+        playback position: the written audio minus the output latency that
+        has not elapsed since the last write.
+
+        Args:
+            flush (bool): If True, all pending words are dispatched.
+        """
+        if flush:
+            position = float("inf")
+        else:
+            latency = self.audio_stream.output_latency()
+            pending = max(0.0, latency - (time.time() - self.last_write_time))
+            position = self.seconds_played - pending
+
+        for timing in self.word_timings.pop_due(position):
+            if self.on_word_spoken:
+                self.on_word_spoken(timing)
+
+    def reset_word_timings(self):
+        """Restarts the playback position for word timings at 0, e.g. for a new text."""
+        self.word_timings.clear()
+        self.seconds_played = 0
+
+    def _get_resampler(self, channels: int) -> StreamingResampler:
+        """
+        Returns the resampler from the engine rate to the output rate,
+        created once per rate pair and kept (with its filter state) across chunks.
+        """
+        config = self.audio_stream.config
+        format = pyaudio.paFloat32 if config.format == pyaudio.paFloat32 else pyaudio.paInt16
+        key = (config.rate, self.audio_stream.actual_sample_rate, channels, format)
+        resampler = self.resamplers.get(key)
+        if resampler is None:
+            resampler = StreamingResampler(*key)
+            self.resamplers[key] = resampler
+        return resampler
+
+    def _stamp_sentence_start(self):
+        """Records that the first audio of the current sentence was written."""
+        if self.sentence_marker is not None:
+            self.sentence_marker.metrics.first_chunk_played = time.time()
+            self.sentence_marker = None
+
+    def _handle_sentence_marker(self, marker: SentenceMarker):
+        """
+        Processes a sentence marker from the audio buffer.
+
+        Args:
+            marker (SentenceMarker): Marker queued before or after the
+              audio of a sentence.
+        """
+        if not marker.is_end:
+            self.sentence_marker = marker
+            return
+
+        if self.sentence_marker is not None and self.sentence_marker.metrics is marker.metrics:
+            # Sentence produced no audio
+            self.sentence_marker = None
+        marker.metrics.last_chunk_played = time.time()
+        if marker.callback:
+            try:
+                marker.callback(marker.metrics)
+            except Exception as e:
+                logging.warning(f"error in sentence metrics callback: {e}")
 
     def _play_chunk(self, chunk):
         """
@@ -569,6 +822,21 @@ class StreamPlayer:
         Args:
             chunk: Chunk of audio data to be played.
         """
+        if isinstance(chunk, AudioFrame):
+            # Played as a view of the engine's samples, converted only if
+            # the output format differs
+            self._play_wav_chunk(chunk.convert(self.audio_stream.config.format).data)
+            return
+
+        if self.mp3_decoder is not None:
+            try:
+                pcm = self.mp3_decoder.feed(chunk)
+            except (RuntimeError, ValueError) as e:
+                print(f"RealtimeTTS error decoding mp3 audio: {e}")
+                return
+            self._play_decoded(pcm)
+            return
+
         # --- Handle Raw MPEG Stream (MPV) ---
         is_mpeg_stream = (
             self.audio_stream.config.format == pyaudio.paCustomFormat and
@@ -587,15 +855,36 @@ class StreamPlayer:
         Processes and plays audio data from the buffer
         until it's empty or playback is stopped.
         """
+        decoder = self.mp3_decoder
         while self.playback_active or not self.buffer_manager.audio_buffer.empty():
-            success, chunk = self.buffer_manager.get_from_buffer()
-            if chunk:
+            # The decoder outputs audio after its input was fed, poll it more often
+            timeout = DECODER_POLL_INTERVAL if decoder and decoder.process else 0.05
+            success, chunk = self.buffer_manager.get_from_buffer(timeout)
+            if isinstance(chunk, SentenceMarker):
+                self._handle_sentence_marker(chunk)
+            elif chunk:
                 self._play_chunk(chunk)
+            elif decoder is not None:
+                self._play_decoded(decoder.read())
 
             if self.immediate_stop.is_set():
                 logging.info("Immediate stop requested, aborting playback")
                 break
 
+            # Words of audio still in the output buffer become due without new writes
+            if self.word_timings and not self.muted:
+                self._dispatch_words()
+
+        if decoder is not None:
+            if self.immediate_stop.is_set():
+                decoder.reset()
+            else:
+                self._play_decoded(decoder.flush())
+
+        if not self.immediate_stop.is_set() and not self.muted:
+            self._dispatch_words(flush=True)
+
+        self.playback_stopped.set()
         if self.on_playback_stop:
             self.on_playback_stop()
 
@@ -606,31 +895,76 @@ class StreamPlayer:
         Returns:
             float: Duration of buffered audio in seconds.
         """
-        if self.audio_stream.config.rate > 0:
-            return self.buffer_manager.get_buffered_seconds(self.audio_stream.config.rate)
-        else: # mpeg
-            return self.buffer_manager.get_buffered_seconds(16000)
+        # mp3 audio is measured with the bitrate seen by the decoder
+        if self.mp3_decoder is not None:
+            bytes_per_second = self.mp3_decoder.compressed_bytes_per_second()
+            if bytes_per_second:
+                return self.buffer_manager.get_buffered_bytes() / bytes_per_second
+        return self.buffer_manager.get_buffered_seconds()
 
     def start(self):
         """Starts audio playback."""
         self.first_chunk_played = False
+        self.sentence_marker = None
+        for resampler in self.resamplers.values():
+            resampler.reset()
         self.playback_active = True
-        if not self.audio_stream.stream:
-            self.audio_stream.open_stream()
 
-        self.audio_stream.start_stream()
+        if self.output_config is not None:
+            self._configure_output()
+
+        # Muted playback doesn't need an output, the sink opens on first write
+        # (for mpeg streams once the format is known from the decoded audio)
+        if not self.muted and self.output_config is not None:
+            if not self.audio_stream.is_stream_open():
+                self.audio_stream.open_stream()
+
+            self.audio_stream.start_stream()
 
         if not self.playback_thread or not self.playback_thread.is_alive():
+            self.playback_stopped.clear()
             self.playback_thread = threading.Thread(target=self._process_buffer)
             self.playback_thread.start()
 
-    def stop(self, immediate: bool = False):
+    def _configure_output(self):
+        """
+        Assigns the player's output format to the output. It may be shared
+        with players of other engines and only needs to be reopened for a
+        different format.
+        """
+        if self.audio_stream.config is not self.output_config:
+            if self.audio_stream.is_stream_open() and not self._has_output_format(self.audio_stream.config):
+                self.audio_stream.close_stream()
+            self.audio_stream.configure(self.output_config)
+
+    def _has_output_format(self, config: AudioConfiguration) -> bool:
+        """Checks if config describes the same output format as the player's."""
+        output_config = self.output_config
+        return (
+            output_config is not None
+            and config.format == output_config.format
+            and config.channels == output_config.channels
+            and config.rate == output_config.rate
+            and config.output_device_index == output_config.output_device_index
+        )
+
+    def stop(self, immediate: bool = False, close_output: bool = True, timeout: float = 0.05):
         """
         Stops audio playback.
 
         Args:
             immediate (bool): If True, stops playback immediately
-              without waiting for buffer to empty.
+              without waiting for buffer to empty. The queued audio is
+              dropped and a pending device write is aborted, the output
+              stays open until the final stop().
+            close_output (bool): If False, the output stream is only
+              stopped and stays open for the next start().
+            timeout (float): Seconds an immediate stop waits for the
+              playback thread to stop writing.
+
+        Returns:
+            bool: For an immediate stop, True if playback stopped within
+              the timeout.
         """
         if not self.playback_thread:
             logging.warn("No playback thread found, cannot stop playback")
@@ -638,9 +972,13 @@ class StreamPlayer:
 
         if immediate:
             self.immediate_stop.set()
-            while self.playback_active:
-                time.sleep(0.001)
-            return
+            self.resume()
+            self.audio_stream.abort_write()
+            self.buffer_manager.clear_buffer()
+
+            # Wakes up the playback thread waiting for the next chunk
+            self.buffer_manager.audio_buffer.put(None)
+            return self.playback_stopped.wait(timeout)
 
         self.playback_active = False
 
@@ -649,18 +987,26 @@ class StreamPlayer:
 
         time.sleep(0.001)
 
-        self.audio_stream.close_stream()
+        if close_output:
+            self.audio_stream.close_stream()
+        else:
+            self.audio_stream.stop_stream()
         self.immediate_stop.clear()
         self.buffer_manager.clear_buffer()
+        self.word_timings.clear()
         self.playback_thread = None
 
     def pause(self):
         """Pauses audio playback."""
         self.pause_event.set()
+        self.resume_event.clear()
+        self.audio_stream.set_paused(True)
 
     def resume(self):
         """Resumes paused audio playback."""
         self.pause_event.clear()
+        self.resume_event.set()
+        self.audio_stream.set_paused(False)
 
     def mute(self, muted: bool = True):
         """Mutes audio playback."""
@@ -6,31 +6,47 @@ Converts text into real-time audio using one or more TTS engines. Key features i
 - Synthesis: Transforms text or text streams into audio.
 - Multi-Engine: Supports engine switching if one fails.
 - Async Playback: Handles play, pause, resume, and stop with separate threads.
+- Asyncio Streaming: Yields audio chunks to async code via astream().
+- Pull-based Streaming: Yields audio chunks to sync code via iter_chunks().
+- Pre-rendering: Synthesizes known phrases in the background into the sentence cache via prerender().
 - Callbacks: Offers hooks for stream events, per-character, and per-word processing.
+- Metrics: Records per-sentence latency timestamps and aggregate histograms.
 - Buffer Management: Generates audio chunks based on buffered duration.
 - Output Options: Plays audio live or writes to a WAV file.
 """
 
 
-from .threadsafe_generators import CharIterator, AccumulatingThreadSafeGenerator
-from .stream_player import StreamPlayer, AudioConfiguration
-from typing import Union, Iterator, List
-from .engines import BaseEngine
+from .threadsafe_generators import CharIterator, AccumulatingThreadSafeGenerator, AsyncIteratorBridge, TextAccumulator
+from .stream_player import StreamPlayer, AudioConfiguration, AudioStream
+from .sentence_pipeline import SentencePipeline, SentenceBuffer
+from .buffer_controller import AdaptiveBufferController, get_bytes_per_second
+from .sentence_cache import SentenceCache, CacheRecorder
+from .metrics import StreamMetrics, SentenceMarker, SentenceRecorder
+from .audio_sinks import AudioSink
+from .audio_frame import AudioFrame, AUDIO_CHUNK_TYPES, get_duration
+from .sentence_tokenizers import get_sentence_tokenizer, get_sentence_generator
+from typing import Union, Iterator, AsyncIterator, List, Tuple
+from contextlib import nullcontext
+from .engines import BaseEngine, TimingInfo
 try:
     import pyaudio._portaudio as pa
+    import pyaudio
 except ImportError:
-    print("Could not import the PyAudio C module 'pyaudio._portaudio'.")
-    raise
-import stream2sentence as s2s
+    # Headless operation (muted or non-device output sink) works without PyAudio
+    from . import audio_formats as pa
+    from . import audio_formats as pyaudio
 import numpy as np
 import threading
 import traceback
+import asyncio
 import logging
-import pyaudio
 import queue
 import time
 import wave
 
+# Sentences kept in metrics.sentences in long-form mode
+LONG_FORM_METRICS_SENTENCES = 100
+
 class TextToAudioStream:
     def __init__(
         self,
@@ -49,6 +65,15 @@ class TextToAudioStream:
         frames_per_buffer: int = pa.paFramesPerBufferUnspecified,
         playout_chunk_size: int = -1,
         level=logging.WARNING,
+        engine_pool: List[BaseEngine] = None,
+        output_sink: AudioSink = None,
+        sentence_cache: SentenceCache = None,
+        on_sentence_metrics=None,
+        text_window_chars: int = 0,
+        on_text_consumed=None,
+        callback_mode: bool = False,
+        max_buffered_seconds: float = 0.0,
+        decode_mpeg: bool = True,
     ):
         """
         Initializes the TextToAudioStream.
@@ -108,6 +133,9 @@ class TextToAudioStream:
                 - "nltk": Uses the Natural Language Toolkit (NLTK) tokenizer.
                 - "stanza": Uses the Stanza library for advanced sentence
                   splitting.
+                - "fast": Uses the built-in rule-based segmenter, which
+                  needs no extra dependencies and suits well-punctuated
+                  text like LLM output.
                 Defaults to "nltk".
                 
             language (str, optional):
@@ -141,6 +169,69 @@ class TextToAudioStream:
                 The logging level to use for internal logging. Accepts standard
                 Python logging levels, such as `logging.DEBUG`, `logging.INFO`,
                 `logging.WARNING`, etc. Defaults to `logging.WARNING`.
+
+            engine_pool (List[BaseEngine], optional):
+                Additional engine instances identical to the (first) engine,
+                e.g. several KokoroEngine or PiperEngine objects. Sentences
+                are synthesized in parallel across the first engine and the
+                pool, then re-sequenced into playback order before they reach
+                the player. All pool engines must report the same stream info
+                as the first engine. Word timings (on_word) are not supported
+                while a pool is in use. Defaults to None.
+
+            output_sink (AudioSink, optional):
+                Destination of the played-out audio instead of the PyAudio
+                output device, e.g. a RingBufferSink, FileSink or
+                CallbackSink. PyAudio is neither required nor initialized
+                when a sink is given. Defaults to None (PyAudio device).
+
+            sentence_cache (SentenceCache, optional):
+                Cache for synthesized sentence audio. Sentences found in the
+                cache (same engine, voice parameters, format and text) are
+                played without calling the engine. Word timings are not
+                replayed for cached sentences. Defaults to None (no cache).
+
+            on_sentence_metrics (callable, optional):
+                Called with the SentenceMetrics of every sentence once its
+                last chunk was played. The metrics hold timestamps for text
+                received, sentence detected, synthesis start, first chunk
+                enqueued, first and last chunk played. Aggregated histograms
+                are available via the `metrics` attribute. Defaults to None.
+
+            text_window_chars (int, optional):
+                Long-form mode for documents and transcripts of unbounded
+                length. If greater than 0, the stream keeps only the last
+                text_window_chars characters of the processed text (text()
+                returns this window), releases fed text once it was read and
+                keeps metrics of the last 100 sentences only. Sentence
+                detection is not affected. Defaults to 0 (keep all text).
+
+            on_text_consumed (callable, optional):
+                Called with every chunk of text read from the input, e.g. to
+                write the spoken text to a file instead of keeping it in
+                memory. Defaults to None.
+
+            callback_mode (bool, optional):
+                If True, the output device pulls the audio through
+                PortAudio's callback API from a ring buffer filled by the
+                playback thread, instead of blocking writes. Pause, resume
+                and stop take effect without polling, and gaps in the audio
+                are counted in `player.audio_stream.underruns`.
+                Defaults to False.
+
+            max_buffered_seconds (float, optional):
+                If greater than 0, the engine's synthesize() blocks while
+                more than this many seconds of audio wait for playback, so
+                fast engines don't fill memory with audio far ahead of the
+                speakers. Defaults to 0 (unbounded).
+
+            decode_mpeg (bool, optional):
+                If True, the mp3 audio of mpeg engines (e.g. Edge,
+                ElevenLabs) is decoded to PCM by one ffmpeg process per
+                stream and played like the audio of other engines, so
+                on_audio_chunk receives PCM and output_wavfile is a WAV
+                file. If False or if ffmpeg is not installed, the mp3 data
+                is piped to mpv. Defaults to True.
         """
         self.log_characters = log_characters
         self.on_text_stream_start = on_text_stream_start
@@ -153,24 +244,48 @@ class TextToAudioStream:
         self.chunk_callback = None
         self.wf = None
         self.abort_events = []
+        self.text_window_chars = text_window_chars
+        self.on_text_consumed = on_text_consumed
+        self.generated_text_history = TextAccumulator(max_chars=text_window_chars)
         self.tokenizer = tokenizer
         self.language = language
         self.global_muted = muted
         self.frames_per_buffer = frames_per_buffer
         self.playout_chunk_size = playout_chunk_size
+        self.callback_mode = callback_mode
+        self.max_buffered_seconds = max_buffered_seconds
+        self.decode_mpeg = decode_mpeg
+        self.output_sink = output_sink
+        self.sentence_cache = sentence_cache
+        self.prerender_thread = None
+        self.buffer_controller = None
+        self.hedge_threads = {}
+        self.max_unplayed_chunks = 0
+        self.metrics = StreamMetrics(
+            on_sentence_metrics,
+            max_sentences=LONG_FORM_METRICS_SENTENCES if text_window_chars > 0 else 0,
+        )
+        self.text_received_time = None
         self.player = None
+        self.players = {}
+        self.output_streams = {}
+        self.standby_lock = threading.Lock()
+        self.standby_outputs_open = False
+        self.engine_switch_lock = threading.Lock()
         self.play_lock = threading.Lock()
         self.is_playing_flag = False
 
         self._create_iterators()
 
-        logging.info(f"Initializing tokenizer {tokenizer} " f"for language {language}")
-        s2s.init_tokenizer(tokenizer, language)
+        # The tokenizer is initialized on first use (see sentence_tokenizers)
 
         # Initialize the play_thread attribute
         # (used for playing audio in a separate thread)
         self.play_thread = None
 
+        # Play thread still finishing after stop(wait_for_synthesis=False)
+        self.stopping_play_thread = None
+
         # Initialize an attribute to store generated text
         self.generated_text = ""
 
@@ -187,8 +302,24 @@ class TextToAudioStream:
             # Handle the case where engine is a single BaseEngine instance
             self.engines = [engine]
 
+        # Engines used to synthesize sentences in parallel
+        self.engine_pool = [self.engines[0]]
+        if engine_pool:
+            stream_info = self.engines[0].get_stream_info()
+            for pool_engine in engine_pool:
+                if pool_engine.get_stream_info() != stream_info:
+                    raise ValueError(
+                        f"engine_pool engine {pool_engine.engine_name} reports stream info "
+                        f"{pool_engine.get_stream_info()}, expected {stream_info}"
+                    )
+            self.engine_pool.extend(engine_pool)
+
         self.load_engine(self.engines[self.engine_index])
 
+        # Fallback engines get their player up front, so switching is cheap
+        for fallback_engine in self.engines[1:]:
+            self._get_player(fallback_engine)
+
     def load_engine(self, engine: BaseEngine):
         """
         Loads the synthesis engine and prepares the audio player for stream playback.
@@ -201,10 +332,31 @@ class TextToAudioStream:
         # Store the engine instance (responsible for text-to-audio conversion)
         self.engine = engine
 
+        # Reuse the engine's player (and its output stream) if it has one
+        self.player = self._get_player(engine)
+
+        # The standby outputs were opened for the previous engine's fallbacks
+        self._close_standby_outputs()
+
+        logging.info(f"loaded engine {self.engine.engine_name}")
+
+    def _get_player(self, engine: BaseEngine) -> StreamPlayer:
+        """
+        Returns the StreamPlayer of engine, creating it on first use or if the
+        engine's stream info changed.
+
+        Players are kept per engine because they read from the engine's queue.
+        Players of engines with the same stream info share one output stream,
+        so switching between them doesn't reopen the audio device.
+        """
         # Extract stream information (format, channels, rate) from the engine
-        format, channels, rate = self.engine.get_stream_info()
+        stream_info = engine.get_stream_info()
 
-        # Check if the engine doesn't support consuming generators directly
+        cached = self.players.get(id(engine))
+        if cached and cached[0] == stream_info:
+            return cached[1]
+
+        format, channels, rate = stream_info
         config = AudioConfiguration(
             format,
             channels,
@@ -213,17 +365,100 @@ class TextToAudioStream:
             muted=self.global_muted,
             frames_per_buffer=self.frames_per_buffer,
             playout_chunk_size=self.playout_chunk_size,
+            callback_mode=self.callback_mode,
+            decode_mpeg=self.decode_mpeg,
         )
+        if self.output_sink is not None:
+            config.output_sink = self.output_sink
+        else:
+            if stream_info not in self.output_streams:
+                self.output_streams[stream_info] = AudioStream(config)
+            config.output_sink = self.output_streams[stream_info]
 
-        self.player = StreamPlayer(
-            self.engine.queue,
-            self.engine.timings,
+        player = StreamPlayer(
+            engine.queue,
+            engine.timings,
             config,
             on_playback_start=self._on_audio_stream_start,
             on_word_spoken=self._on_word_spoken,
         )
+        self.players[id(engine)] = (stream_info, player)
+        return player
 
-        logging.info(f"loaded engine {self.engine.engine_name}")
+    def _switch_to_engine(self, engine: BaseEngine):
+        """
+        Makes engine the active engine during playback. The current player
+        finishes its buffered audio, then the engine's warm player takes over.
+        The output stream stays open if both players share it.
+        """
+        previous_engine = self.engine
+        previous_player = self.player
+        self.load_engine(engine)
+        self._limit_buffered_audio(previous_engine, bounded=False)
+        self._limit_buffered_audio(engine)
+
+        previous_player.stop(close_output=previous_player.audio_stream is not self.player.audio_stream)
+        self.player.mute(previous_player.muted)
+        with self.standby_lock:
+            self.player.start()
+        self.player.on_audio_chunk = self._on_audio_chunk
+
+    def _limit_buffered_audio(self, engine: BaseEngine, bounded: bool = True):
+        """
+        Applies max_buffered_seconds and play()'s max_unplayed_chunks to the
+        engine's queue while its player consumes it, bounded=False lifts the
+        limits so a synthesis nobody plays anymore can't block.
+        """
+        max_buffered_bytes = 0
+        if bounded and self.max_buffered_seconds > 0:
+            max_buffered_bytes = int(
+                self.max_buffered_seconds * get_bytes_per_second(*engine.get_stream_info())
+            )
+        engine.set_max_buffered_bytes(max_buffered_bytes)
+        engine.set_max_buffered_chunks(self.max_unplayed_chunks if bounded else 0)
+
+    def _open_standby_outputs(self):
+        """
+        Opens the output streams of the fallback engines' players in the
+        background and keeps them stopped, so a fallback switch starts playing
+        without opening a device. They stay open across play() calls until
+        the engine changes or shutdown() is called.
+        """
+        if len(self.engines) < 2 or self.output_sink is not None or self.player.muted:
+            return
+        with self.standby_lock:
+            if self.standby_outputs_open:
+                return
+            self.standby_outputs_open = True
+
+        def open_outputs():
+            for engine in self.engines:
+                player = self._get_player(engine)
+                if player.output_config is None:
+                    # mpeg stream, the output format is known once audio was decoded
+                    continue
+                with self.standby_lock:
+                    if not self.standby_outputs_open:
+                        # Closed again while opening
+                        return
+                    output = player.audio_stream
+                    if output is self.player.audio_stream or output.is_stream_open():
+                        continue
+                    try:
+                        output.open_stream()
+                        output.stop_stream()
+                    except Exception as e:
+                        logging.warning(f"failed to open standby output for engine {engine.engine_name}: {e}")
+
+        threading.Thread(target=open_outputs, daemon=True).start()
+
+    def _close_standby_outputs(self):
+        """Closes the standby output streams opened by _open_standby_outputs()."""
+        with self.standby_lock:
+            self.standby_outputs_open = False
+            for output in self.output_streams.values():
+                if output is not self.player.audio_stream and output.is_stream_open():
+                    output.close_stream()
 
     def feed(self, text_or_iterator: Union[str, Iterator[str]]):
         """
@@ -264,10 +499,15 @@ class TextToAudioStream:
         sentence_fragment_delimiters: str = ".?!;:,\n…。",
         force_first_fragment_after_words=30,
         debug=False,
+        lookahead: int = 0,
+        max_unplayed_chunks: int = 0,
+        adaptive_buffering: bool = False,
+        hedge_after_seconds: float = 0.0,
     ):
         """
         Async handling of text to audio synthesis, see play() method.
         """
+        self._wait_for_stopping_play()
         if not self.is_playing_flag:
             self.is_playing_flag = True
             args = (
@@ -296,6 +536,10 @@ class TextToAudioStream:
                 force_first_fragment_after_words,
                 True,
                 debug,
+                lookahead,
+                max_unplayed_chunks,
+                adaptive_buffering,
+                hedge_after_seconds,
             )
             self.play_thread = threading.Thread(target=self.play, args=args)
             self.play_thread.start()
@@ -316,9 +560,9 @@ class TextToAudioStream:
         on_sentence_synthesized=None,
         before_sentence_synthesized=None,
         on_audio_chunk=None,
-        tokenizer: str = "nltk",
+        tokenizer: str = "",
         tokenize_sentences=None,
-        language: str = "en",
+        language: str = "",
         context_size: int = 12,
         context_size_look_overhead: int = 12,
         comma_silence_duration=0.0,
@@ -329,6 +573,10 @@ class TextToAudioStream:
         force_first_fragment_after_words=30,
         is_external_call=True,
         debug=False,
+        lookahead: int = 0,
+        max_unplayed_chunks: int = 0,
+        adaptive_buffering: bool = False,
+        hedge_after_seconds: float = 0.0,
     ):
         """
         Handles the synthesis of text to audio.
@@ -350,9 +598,9 @@ class TextToAudioStream:
         - on_sentence_synthesized: Callback function that gets called after hen a single sentence fragment was synthesized.
         - before_sentence_synthesized: Callback function that gets called before a single sentence fragment gets synthesized.
         - on_audio_chunk: Callback function that gets called when a single audio chunk is ready.
-        - tokenizer: Tokenizer to use for sentence splitting (currently "nltk" and "stanza" are supported).
+        - tokenizer: Tokenizer to use for sentence splitting ("nltk", "stanza" and the built-in rule-based "fast" are supported). Empty uses the tokenizer given to the constructor.
         - tokenize_sentences (Callable): A function that tokenizes sentences from the input text. You can write your own lightweight tokenizer here if you are unhappy with nltk and stanza. Defaults to None. Takes text as string and should return splitted sentences as list of strings.
-        - language: Language to use for sentence splitting.
+        - language: Language to use for sentence splitting. Empty uses the language given to the constructor.
         - context_size: The number of characters used to establish context for sentence boundary detection. A larger context improves the accuracy of detecting sentence boundaries. Default is 12 characters.
         - context_size_look_overhead: The number of characters to look ahead when determining sentence boundaries. This helps in identifying the end of a sentence more accurately. Default is 12 characters.
         - comma_silence_duration: The duration of silence to insert after a comma in seconds. Default is 0.0 seconds.
@@ -366,18 +614,33 @@ class TextToAudioStream:
             Default is 30 words.
         - is_external_call: If True, the method is called from an external source.
         - debug: If True, enables debug mode.
+        - lookahead (int): Number of upcoming sentences synthesized into separate buffers while the current sentence plays. Buffered sentences are released to the player strictly in order. Engines that support concurrent synthesis work on all look-ahead sentences in parallel. For engines that can't (e.g. Coqui, StyleTTS, ZipVoice) a single background worker synthesizes the upcoming sentences one after another into the buffers while the player drains the current one. This keeps synthesis running ahead when the engine queue is bounded (max_buffered_seconds, max_unplayed_chunks as set by iter_chunks/astream). With an unbounded queue sentences are synthesized back to back anyway and look-ahead has no effect for these engines; it never makes a slower than real time engine keep up (use an engine_pool for that). Set to 0 to deactivate. Default is 0. With an engine_pool it is raised to at least the pool size minus one.
+        - max_unplayed_chunks (int): If greater than 0, the engine blocks before putting an audio chunk while this many chunks are waiting for the player. Keeps memory bounded when the audio consumer is slow. Set to 0 to deactivate. Default is 0.
+        - adaptive_buffering (bool): If True, replaces buffer_threshold_seconds with a controller that measures the engine's time to first audio and real-time factor and decides how many sentences to merge into one synthesis call. Merges more for engines with a high per-call overhead while enough audio is queued, synthesizes every sentence on its own when playback is close to running dry. Default is False.
+        - hedge_after_seconds (float): If greater than 0 and fallback engines with the same stream format are available, a sentence is also started on the next such engine when the current engine produced no audio within this many seconds. The engine delivering audio first is played, the other one is asked to stop (most engines finish the sentence in the background anyway) and its audio discarded. The current engine stays active for the next sentence. Set to 0 to deactivate. Default is 0.
         """
         if self.global_muted:
             muted = True
 
         if is_external_call:
-            self.engine.reset_audio_duration()
+            self._wait_for_stopping_play()
+            self._wait_for_prerender()
             if not self.play_lock.acquire(blocking=False):
                 logging.warning("play() called while already playing audio, skipping")
                 return
+            # Only after the lock, a rejected call must not reset the running play
+            self.metrics.start_play()
+            self.engine.reset_audio_duration()
+            for pool_engine in self.engine_pool[1:]:
+                pool_engine.reset_audio_duration()
+            if self.player:
+                self.player.reset_word_timings()
+            self.max_unplayed_chunks = max_unplayed_chunks
+            self._limit_buffered_audio(self.engine)
 
         self.is_playing_flag = True
         self.error_flag = False
+        char_iter = self.char_iter
 
         # Log the start of the stream
         logging.info("stream start")
@@ -401,13 +664,12 @@ class TextToAudioStream:
 
         if output_wavfile:
             if self._is_engine_mpeg():
-                self.wf = open(output_wavfile, "wb")
+                if self.player.mp3_decoder is None:
+                    self.wf = open(output_wavfile, "wb")
+                # Decoded mpeg audio is written once its format is known
             else:
-                self.wf = wave.open(output_wavfile, "wb")
                 _, channels, rate = self.engine.get_stream_info()
-                self.wf.setnchannels(channels)
-                self.wf.setsampwidth(2)
-                self.wf.setframerate(rate)
+                self._open_wavfile(channels, rate)
 
         # Initialize the generated_text variable
         if reset_generated_text:
@@ -423,6 +685,7 @@ class TextToAudioStream:
 
                 # Directly synthesize audio using the character iterator
                 self.char_iter.log_characters = self.log_characters
+                self.char_iter.chunk_mode = False
 
                 self.engine.synthesize(self.char_iter)
 
@@ -452,11 +715,14 @@ class TextToAudioStream:
                 logging.info("stream stop")
 
                 # Accumulate the generated text and reset the character iterators
-                self.generated_text += self.char_iter.iterated_text
+                # (unless stop() already replaced them while synthesis finished)
+                self.generated_text += char_iter.iterated_text
 
-                self._create_iterators()
+                if self.char_iter is char_iter:
+                    self._create_iterators()
 
                 if is_external_call:
+                    self._limit_buffered_audio(self.engine, bounded=False)
                     self.is_playing_flag = False
                     self.play_lock.release()
         else:
@@ -465,9 +731,13 @@ class TextToAudioStream:
                 if self.player:
                     self.player.start()
                     self.player.on_audio_chunk = self._on_audio_chunk
+                    self._open_standby_outputs()
+
+                if tokenize_sentences is None:
+                    tokenize_sentences = get_sentence_tokenizer(tokenizer, language)
 
                 # Generate sentences from the characters
-                generate_sentences = s2s.generate_sentences(
+                generate_sentences = get_sentence_generator(tokenizer)(
                     self.thread_safe_char_iter,
                     context_size=context_size,
                     context_size_look_overhead=context_size_look_overhead,
@@ -488,38 +758,80 @@ class TextToAudioStream:
                 )
 
                 # Create the synthesis chunk generator with the given sentences
+                buffer_controller = None
+                if adaptive_buffering:
+                    if self.buffer_controller is None:
+                        self.buffer_controller = AdaptiveBufferController()
+                    buffer_controller = self.buffer_controller
+                    buffer_controller.reset()
+
                 chunk_generator = self._synthesis_chunk_generator(
-                    generate_sentences, buffer_threshold_seconds, log_synthesized_text
+                    generate_sentences, buffer_threshold_seconds, log_synthesized_text,
+                    buffer_controller,
                 )
 
-                sentence_queue = queue.Queue()
                 sentence_count = 0
-
-                def synthesize_worker():
+                sentence_count_lock = threading.Lock()
+
+                def synthesize_sentence(sentence, output=None, pool_engine=None, metrics=None):
+                    """
+                    Synthesizes a single sentence, switching to fallback engines on failure.
+                    If output is given, the engine's audio is redirected into it.
+                    If pool_engine is given, that engine synthesizes the sentence
+                    and no fallback switching takes place.
+                    If metrics is given, the sentence's timestamps are recorded into it.
+                    """
                     nonlocal sentence_count
-                    while not abort_event.is_set():
-                        sentence = sentence_queue.get()
-                        if sentence is None:  # Sentinel value to stop the worker
-                            break
-
-                        sentence_count += 1
 
-                        synthesis_successful = False
-                        if log_synthesized_text:
-                            print(f"\033[96m\033[1m⚡ synthesizing\033[0m \033[37m→ \033[2m'\033[22m{sentence}\033[2m'\033[0m")
+                    if metrics:
+                        (output if output is not None else self.engine.queue).put(
+                            SentenceMarker(metrics, is_end=False)
+                        )
 
-                        while not synthesis_successful:
-                            try:
-                                if abort_event.is_set():
-                                    break
-
-                                if before_sentence_synthesized:
-                                    before_sentence_synthesized(sentence)
+                    with sentence_count_lock:
+                        sentence_count += 1
 
-                                success = self.engine.synthesize(sentence)
+                    synthesis_successful = False
+                    if log_synthesized_text:
+                        print(f"\033[96m\033[1m⚡ synthesizing\033[0m \033[37m→ \033[2m'\033[22m{sentence}\033[2m'\033[0m")
+
+                    while not synthesis_successful:
+                        failed_engine = pool_engine or self.engine
+                        try:
+                            if abort_event.is_set():
+                                break
+
+                            if before_sentence_synthesized:
+                                before_sentence_synthesized(sentence)
+
+                            engine = pool_engine or self.engine
+                            if output is None:
+                                redirect = nullcontext()
+                            elif pool_engine is not None:
+                                # The pipeline forwards the pool's word timings in sentence order
+                                output.timings_base = engine.audio_duration
+                                redirect = engine.redirect_output(output, timings=output.timings)
+                            else:
+                                redirect = engine.redirect_output(output)
+                            with redirect:
+                                recorder = None
+                                if metrics:
+                                    metrics.synthesis_start = time.time()
+                                    recorder = SentenceRecorder(
+                                        engine.queue, metrics,
+                                        get_bytes_per_second(*engine.get_stream_info()),
+                                    )
+                                with engine.redirect_output(recorder) if recorder else nullcontext():
+                                    success, synthesizing_engine = self._synthesize_hedged(
+                                        engine, sentence, abort_event, buffer_controller,
+                                        hedge_after_seconds if pool_engine is None else 0,
+                                    )
+                                if metrics:
+                                    metrics.engine_name = synthesizing_engine.engine_name
+                                    metrics.synthesis_end = time.time()
 
                                 # insert potential silence
-                                stream_format, _, sample_rate = self.engine.get_stream_info()
+                                stream_format, _, sample_rate = engine.get_stream_info()
 
                                 end_sentence_delimeters = ".!?…。¡¿"
                                 mid_sentence_delimeters = ";:,\n()[]{}-“”„”—/|《》"
@@ -538,65 +850,133 @@ class TextToAudioStream:
                                         silent_chunk = np.zeros(silent_samples, dtype=np.int16)
                                     else:
                                         silent_chunk = np.zeros(silent_samples, dtype=np.float32)
-                                    self.engine.queue.put(silent_chunk.tobytes())
+                                    engine.queue.put(silent_chunk.tobytes())
 
 
-                                if success:
-                                    if on_sentence_synthesized:
-                                        on_sentence_synthesized(sentence)
-                                    synthesis_successful = True
-                                else:
-                                    logging.warning(
-                                        f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}", unknown error'
-                                    )
+                            if success:
+                                if on_sentence_synthesized:
+                                    on_sentence_synthesized(sentence)
+                                synthesis_successful = True
+                            else:
+                                logging.warning(
+                                    f'engine {engine.engine_name} failed to synthesize sentence "{sentence}", unknown error'
+                                )
+
+                        except Exception as e:
+                            logging.warning(
+                                f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}" with error: {e}'
+                            )
+                            tb_str = traceback.format_exc()
+                            print(f"Traceback: {tb_str}")
+                            print(f"Error: {e}")
 
-                            except Exception as e:
+                        if not synthesis_successful:
+                            if pool_engine is not None:
                                 logging.warning(
-                                    f'engine {self.engine.engine_name} failed to synthesize sentence "{sentence}" with error: {e}'
+                                    f"pooled engine {pool_engine.engine_name} failed, skipping sentence"
                                 )
-                                tb_str = traceback.format_exc()
-                                print(f"Traceback: {tb_str}")
-                                print(f"Error: {e}")
-
-                            if not synthesis_successful:
-                                if len(self.engines) == 1:
-                                    time.sleep(0.2)
-                                    logging.warning(
-                                        f"engine {self.engine.engine_name} is the only engine available, can't switch to another engine"
-                                    )
-                                    break
-                                else:
-                                    logging.warning(
-                                        "fallback engine(s) available, switching to next engine"
-                                    )
-                                    self.engine_index = (self.engine_index + 1) % len(
-                                        self.engines
-                                    )
+                                break
+                            elif len(self.engines) == 1:
+                                time.sleep(0.2)
+                                logging.warning(
+                                    f"engine {self.engine.engine_name} is the only engine available, can't switch to another engine"
+                                )
+                                break
+                            else:
+                                # Look-ahead workers may fail at the same time,
+                                # only the first one switches away from the engine
+                                with self.engine_switch_lock:
+                                    if self.engine is failed_engine:
+                                        logging.warning(
+                                            "fallback engine(s) available, switching to next engine"
+                                        )
+                                        self.engine_index = (self.engine_index + 1) % len(
+                                            self.engines
+                                        )
+
+                                        self._switch_to_engine(self.engines[self.engine_index])
+
+                    if metrics:
+                        (output if output is not None else self.engine.queue).put(
+                            SentenceMarker(metrics, is_end=True, callback=self.metrics.sentence_played)
+                        )
+
+                    return synthesis_successful
+
+                # The pool only applies while its first engine is the active one
+                use_pool = len(self.engine_pool) > 1 and self.engine is self.engine_pool[0]
+
+                if lookahead > 0 or use_pool:
+                    # Synthesize upcoming sentences into separate buffers while
+                    # the current one plays, release them to the player in order
+                    if use_pool:
+                        lookahead = max(lookahead, len(self.engine_pool) - 1)
+                        pipeline = SentencePipeline(
+                            synthesize=lambda buffer, engine: synthesize_sentence(buffer.text, buffer, engine, buffer.context),
+                            release=lambda chunk: self.engine.queue.put(chunk),
+                            engines=self.engine_pool,
+                            lookahead=lookahead,
+                            abort_event=abort_event,
+                            timings=self.engine.timings,
+                            bytes_per_second=get_bytes_per_second(*self.engine.get_stream_info()),
+                            timings_offset=self.engine.audio_duration,
+                        )
+                    else:
+                        # A single worker prefetches into the buffers for engines that
+                        # can't synthesize concurrently, bypassing a bounded engine queue
+                        workers = lookahead + 1 if self.engine.can_synthesize_concurrently else 1
+                        pipeline = SentencePipeline(
+                            synthesize=lambda buffer, engine: synthesize_sentence(buffer.text, buffer, metrics=buffer.context),
+                            release=lambda chunk: self.engine.queue.put(chunk),
+                            engines=[self.engine] * workers,
+                            lookahead=lookahead,
+                            abort_event=abort_event,
+                        )
+
+                    for sentence in chunk_generator:
+                        if abort_event.is_set():
+                            break
+                        sentence = sentence.strip()
+                        if sentence:
+                            if not pipeline.submit(sentence, self._new_sentence_metrics(sentence)):
+                                break
 
-                                    self.player.stop()
-                                    self.load_engine(self.engines[self.engine_index])
-                                    self.player.start()
-                                    self.player.on_audio_chunk = self._on_audio_chunk
+                    pipeline.close()
+                    if use_pool:
+                        # Later play() calls continue the time scale of the released audio
+                        self.engine.audio_duration = pipeline.released_seconds
 
-                        sentence_queue.task_done()
+                else:
+                    sentence_queue = queue.Queue()
 
-                worker_thread = threading.Thread(target=synthesize_worker)
-                worker_thread.daemon = True
-                worker_thread.start()
+                    def synthesize_worker():
+                        while not abort_event.is_set():
+                            item = sentence_queue.get()
+                            if item is None:  # Sentinel value to stop the worker
+                                break
 
-                # Iterate through the synthesized chunks and feed them to the engine for audio synthesis
-                for sentence in chunk_generator:
-                    if abort_event.is_set():
-                        break
-                    sentence = sentence.strip()
-                    if sentence:
-                        sentence_queue.put(sentence)
-                    else:
-                        continue  # Skip empty sentences
+                            sentence, metrics = item
+                            synthesize_sentence(sentence, metrics=metrics)
+
+                            sentence_queue.task_done()
+
+                    worker_thread = threading.Thread(target=synthesize_worker)
+                    worker_thread.daemon = True
+                    worker_thread.start()
+
+                    # Iterate through the synthesized chunks and feed them to the engine for audio synthesis
+                    for sentence in chunk_generator:
+                        if abort_event.is_set():
+                            break
+                        sentence = sentence.strip()
+                        if sentence:
+                            sentence_queue.put((sentence, self._new_sentence_metrics(sentence)))
+                        else:
+                            continue  # Skip empty sentences
 
-                # Signal to the worker to stop
-                sentence_queue.put(None)
-                worker_thread.join()
+                    # Signal to the worker to stop
+                    sentence_queue.put(None)
+                    worker_thread.join()
 
             except Exception as e:
                 self.error_flag = True
@@ -654,15 +1034,247 @@ class TextToAudioStream:
                     force_first_fragment_after_words=force_first_fragment_after_words,
                     is_external_call=False,
                     debug=debug,
+                    lookahead=lookahead,
+                    max_unplayed_chunks=max_unplayed_chunks,
+                    adaptive_buffering=adaptive_buffering,
+                    hedge_after_seconds=hedge_after_seconds,
                 )
 
             if is_external_call:
                 if self.on_audio_stream_stop:
                     self.on_audio_stream_stop()
 
+                self._limit_buffered_audio(self.engine, bounded=False)
                 self.is_playing_flag = False
                 self.play_lock.release()
 
+    async def astream(
+        self,
+        text_or_iterator: Union[str, Iterator[str], AsyncIterator[str]] = None,
+        max_buffered_chunks: int = 64,
+        **play_kwargs,
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesizes the fed text and yields the audio chunks to async code.
+
+        Usage:
+            async for chunk in stream.astream(llm_token_stream):
+                await websocket.send_bytes(chunk)
+
+        Synthesis runs muted on a dedicated thread, chunks are handed over to
+        the event loop with call_soon_threadsafe. Awaiting the next chunk
+        does not block any thread.
+
+        Args:
+            text_or_iterator: Optional text, iterator or async iterator to
+              feed before synthesis starts. Async iterators are pumped on the
+              running event loop.
+            max_buffered_chunks (int): Maximum number of chunks waiting for
+              the consumer. Playback and synthesis are throttled when the
+              consumer falls behind. Default is 64.
+            **play_kwargs: Forwarded to play(), e.g. fast_sentence_fragment.
+
+        Yields:
+            bytes: Post-processed audio chunks, as passed to on_audio_chunk.
+        """
+        if self.is_playing():
+            logging.warning("astream() called while already playing audio, skipping")
+            return
+
+        loop = asyncio.get_running_loop()
+
+        bridge = None
+        pump_task = None
+        if text_or_iterator is not None:
+            if hasattr(text_or_iterator, "__aiter__"):
+                bridge = AsyncIteratorBridge(text_or_iterator)
+                pump_task = loop.create_task(bridge.pump())
+                self.feed(bridge)
+            else:
+                self.feed(text_or_iterator)
+
+        chunks = asyncio.Queue()
+        free_slots = threading.Semaphore(max_buffered_chunks)
+        cancelled = threading.Event()
+        finished = object()
+
+        def on_audio_chunk(chunk):
+            # Throttle the playback thread while the consumer lags behind
+            while not free_slots.acquire(timeout=0.05):
+                if cancelled.is_set():
+                    return
+            if not cancelled.is_set():
+                loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+
+        def synthesize():
+            try:
+                play_kwargs.setdefault("max_unplayed_chunks", 2)
+                self.play(muted=True, on_audio_chunk=on_audio_chunk, **play_kwargs)
+            finally:
+                if not cancelled.is_set():
+                    loop.call_soon_threadsafe(chunks.put_nowait, finished)
+
+        self.is_playing_flag = True
+        self.play_thread = threading.Thread(target=synthesize, daemon=True)
+        self.play_thread.start()
+
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is finished:
+                    break
+                free_slots.release()
+                yield chunk
+        finally:
+            cancelled.set()
+            if pump_task and not pump_task.done():
+                pump_task.cancel()
+            if bridge:
+                bridge.close()
+            if self.play_thread and self.play_thread.is_alive():
+                await loop.run_in_executor(None, self.stop)
+
+    def iter_chunks(
+        self,
+        text_or_iterator: Union[str, Iterator[str]] = None,
+        max_buffered_chunks: int = 64,
+        **play_kwargs,
+    ) -> Iterator[bytes]:
+        """
+        Synthesizes the fed text muted and yields the post-processed audio
+        chunks as they become available.
+
+        Usage:
+            for chunk in stream.iter_chunks("Hello world."):
+                response.write(chunk)
+
+        Replaces the on_audio_chunk / queue / on_audio_stream_stop sentinel
+        pattern. When the consumer is slow, playback blocks and synthesis of
+        further sentences waits, so no audio piles up in memory.
+
+        Args:
+            text_or_iterator: Optional text or iterator to feed before
+              synthesis starts.
+            max_buffered_chunks (int): Maximum number of chunks waiting for
+              the consumer. Default is 64.
+            **play_kwargs: Forwarded to play(), e.g. fast_sentence_fragment.
+
+        Yields:
+            bytes: Post-processed audio chunks, as passed to on_audio_chunk.
+        """
+        if self.is_playing():
+            logging.warning("iter_chunks() called while already playing audio, skipping")
+            return
+
+        if text_or_iterator is not None:
+            self.feed(text_or_iterator)
+
+        chunks = queue.Queue(maxsize=max_buffered_chunks)
+        cancelled = threading.Event()
+        finished = object()
+
+        def hand_over(item):
+            # Blocks the playback thread while the consumer lags behind
+            while not cancelled.is_set():
+                try:
+                    chunks.put(item, timeout=0.05)
+                    return
+                except queue.Full:
+                    continue
+
+        def synthesize():
+            try:
+                play_kwargs.setdefault("max_unplayed_chunks", 2)
+                self.play(muted=True, on_audio_chunk=hand_over, **play_kwargs)
+            finally:
+                hand_over(finished)
+
+        self.is_playing_flag = True
+        self.play_thread = threading.Thread(target=synthesize, daemon=True)
+        self.play_thread.start()
+
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is finished:
+                    break
+                yield chunk
+        finally:
+            cancelled.set()
+            if self.play_thread and self.play_thread.is_alive():
+                self.stop()
+
+    def prerender(
+        self,
+        phrases: Union[str, List[str]],
+        wait: bool = False,
+        **play_kwargs,
+    ) -> threading.Thread:
+        """
+        Synthesizes known utterances (greetings, confirmations, error
+        messages) in the background and pins them in the sentence cache,
+        so playing them later starts with near-zero latency.
+
+        The phrases are split into sentences the same way play() splits fed
+        text, so pass the sentence splitting arguments used with play()
+        (e.g. minimum_sentence_length) if they differ from the defaults.
+        Creates a memory-only SentenceCache if the stream has none.
+
+        Args:
+            phrases: A phrase or a list of phrases to pre-render.
+            wait (bool): If True, returns after all phrases are rendered.
+            **play_kwargs: Sentence splitting arguments of play().
+
+        Returns:
+            threading.Thread: The background rendering thread.
+        """
+        if isinstance(phrases, str):
+            phrases = [phrases]
+
+        if self.sentence_cache is None:
+            self.sentence_cache = SentenceCache()
+
+        cache = self.sentence_cache
+        engine = self.engine
+
+        def render():
+            for phrase in phrases:
+                for sentence in self._split_sentences(phrase, **play_kwargs):
+                    key = cache.make_key(engine, sentence)
+                    if key is None:
+                        logging.warning(f"engine {engine.engine_name} can't describe its voice, not prerendering")
+                        return
+                    if cache.pin(key):
+                        continue
+
+                    recorder = CacheRecorder()
+                    try:
+                        with engine.redirect_output(recorder):
+                            success = engine.synthesize(sentence)
+                    except Exception as e:
+                        logging.warning(f'prerendering "{sentence}" failed with error: {e}')
+                        continue
+                    finally:
+                        if not engine.can_synthesize_concurrently:
+                            # Timings of pre-rendered audio would confuse on_word
+                            while not engine.timings.empty():
+                                engine.timings.get_nowait()
+
+                    if success:
+                        cache.put(key, recorder.chunks, pinned=True)
+                    else:
+                        logging.warning(f'engine {engine.engine_name} failed to prerender "{sentence}"')
+
+            logging.info(f"prerendered {len(phrases)} phrase(s)")
+
+        self._wait_for_prerender()
+        self.prerender_thread = threading.Thread(target=render, daemon=True)
+        self.prerender_thread.start()
+
+        if wait:
+            self.prerender_thread.join()
+        return self.prerender_thread
+
     def pause(self):
         """
         Pauses playback of the synthesized audio stream (won't work properly with elevenlabs).
@@ -680,28 +1292,76 @@ class TextToAudioStream:
             logging.info("stream resume")
             self.player.resume()
 
-    def stop(self):
+    def stop(self, wait_for_synthesis: bool = True) -> float:
         """
         Stops the playback of the synthesized audio stream immediately.
+
+        Queued audio is dropped, a pending write to the output device is
+        aborted and the engines are signaled to stop synthesizing.
+
+        Args:
+            wait_for_synthesis (bool): If False, returns as soon as playback
+              stopped instead of waiting for the play thread to finish the
+              sentence being synthesized (barge-in). The next play() or
+              play_async() call waits for it.
+
+        Returns:
+            float: Seconds from the call until playback was stopped.
         """
+        start_time = time.time()
+
         if self.engine:
+            # A synthesis blocked on a full queue has to see the stop request
+            self._limit_buffered_audio(self.engine, bounded=False)
             self.engine.stop()
 
+        for pool_engine in self.engine_pool[1:]:
+            pool_engine.stop()
+
         for abort_event in self.abort_events:
             abort_event.set()
 
         if self.is_playing():
             self.char_iter.stop()
-            self.player.resume()
-            self.player.stop(immediate=True)
+            if self.player and not self.player.stop(immediate=True):
+                logging.warning("playback thread did not stop in time, it stops after its current write")
             self.stream_running = False
 
+        stop_latency = time.time() - start_time
+        self.metrics.stop_latency.add(stop_latency)
+        logging.info(f"stream stopped, stop latency: {stop_latency * 1000:.1f}ms")
+
         if self.play_thread is not None:
-            if self.play_thread.is_alive():
+            if not wait_for_synthesis:
+                self.stopping_play_thread = self.play_thread
+            elif self.play_thread.is_alive():
                 self.play_thread.join()
             self.play_thread = None
 
         self._create_iterators()
+        return stop_latency
+
+    def shutdown(self):
+        """
+        Stops playback and closes all audio output streams, including the
+        standby outputs kept open for the fallback engines. The engines
+        themselves are not shut down.
+        """
+        if self.is_playing():
+            self.stop()
+        self._close_standby_outputs()
+        with self.standby_lock:
+            for output in self.output_streams.values():
+                if output.is_stream_open():
+                    output.close_stream()
+
+    def _wait_for_stopping_play(self):
+        """Waits for a play thread left running by stop(wait_for_synthesis=False)."""
+        thread = self.stopping_play_thread
+        if thread is None or thread is threading.current_thread():
+            return
+        thread.join()
+        self.stopping_play_thread = None
 
     def text(self):
         """
@@ -747,28 +1407,42 @@ class TextToAudioStream:
     def _on_audio_chunk(self, chunk):
         """
         Postprocessing of single chunks of audio data.
-        This method is called for each chunk of audio data processed. It first determines the audio stream format.
-        If the format is `pyaudio.paFloat32`, we convert to paInt16.
+        This method is called for each chunk of audio data processed, in the
+        format of the player's output. If the format is `pyaudio.paFloat32`,
+        we convert to paInt16.
 
         Args:
-            chunk (bytes): The audio data chunk to be processed.
+            chunk (bytes): The audio data chunk to be processed (a memoryview
+              for audio the engine put as AudioFrame).
         """
-        format, channels, sample_rate = self.engine.get_stream_info()
-
-        if format == pyaudio.paFloat32:
-            audio_data = np.frombuffer(chunk, dtype=np.float32)
-            audio_data = np.int16(audio_data * 32767)
-            chunk = audio_data.tobytes()
+        config = self.player.audio_stream.config
+        if config.format == pyaudio.paFloat32:
+            frame = AudioFrame.from_bytes(chunk, config.format, config.channels, config.rate)
+            chunk = bytes(frame.convert(pyaudio.paInt16))
+        elif isinstance(chunk, memoryview):
+            # View of an AudioFrame, raw chunks are passed on as they are
+            chunk = bytes(chunk)
+
+        if self.output_wavfile and not self.wf and self.player.output_config:
+            # Audio of an mpeg engine, decoded to PCM by the player
+            self._open_wavfile(self.player.output_config.channels, self.player.output_config.rate)
 
         if self.output_wavfile and self.wf:
-            if self._is_engine_mpeg():
-                self.wf.write(chunk)
-            else:
+            if isinstance(self.wf, wave.Wave_write):
                 self.wf.writeframes(chunk)
+            else:
+                self.wf.write(chunk)
 
         if self.chunk_callback:
             self.chunk_callback(chunk)
 
+    def _open_wavfile(self, channels: int, rate: int):
+        """Opens output_wavfile for 16 bit audio."""
+        self.wf = wave.open(self.output_wavfile, "wb")
+        self.wf.setnchannels(channels)
+        self.wf.setsampwidth(2)
+        self.wf.setframerate(rate)
+
     def _on_last_character(self):
         """
         This method is invoked when the last character of the text stream has been processed.
@@ -791,8 +1465,8 @@ class TextToAudioStream:
 
         This method initializes two types of iterators:
 
-        1. `CharIterator`: Responsible for managing individual characters during the streaming process.
-        - It takes callbacks for events like when a character is processed (`on_character`), when the first text chunk is encountered (`on_first_text_chunk`), and when the last text chunk is encountered (`on_last_text_chunk`).
+        1. `CharIterator`: Responsible for managing the text during the streaming process. It runs in chunk mode, so stream2sentence receives whole text chunks instead of single characters.
+        - It takes callbacks for events like when a text chunk is processed (`on_text_chunk`), when the first text chunk is encountered (`on_first_text_chunk`), and when the last text chunk is encountered (`on_last_text_chunk`).
 
         2. `AccumulatingThreadSafeGenerator`: A thread-safe wrapper around `CharIterator`.
         - Ensures that the character iterator can be safely accessed from multiple threads.
@@ -800,27 +1474,368 @@ class TextToAudioStream:
 
         # Create a CharIterator instance for managing individual characters
         self.char_iter = CharIterator(
-            on_character=self._on_character,
+            chunk_mode=True,
+            max_text_chars=self.text_window_chars,
+            on_text_chunk=self._on_text_chunk,
             on_first_text_chunk=self.on_text_stream_start,
             on_last_text_chunk=self._on_last_character,
         )
 
         # Create a thread-safe version of the char iterator
-        self.thread_safe_char_iter = AccumulatingThreadSafeGenerator(self.char_iter)
+        self.thread_safe_char_iter = AccumulatingThreadSafeGenerator(
+            self.char_iter, max_text_chars=self.text_window_chars
+        )
 
-    def _on_character(self, char: str):
+    def _new_sentence_metrics(self, sentence: str):
+        """
+        Creates the metrics of a sentence that was just detected.
+        Text arriving from now on counts as text of the next sentence.
         """
-        This method is called for each character that is processed in the text stream.
-        It accumulates the characters and invokes a callback.
+        metrics = self.metrics.new_sentence(sentence, self.text_received_time)
+        self.text_received_time = None
+        return metrics
+
+    @property
+    def generated_text(self) -> str:
+        """The text processed by the stream (its last text_window_chars in long-form mode)."""
+        return self.generated_text_history.text()
+
+    @generated_text.setter
+    def generated_text(self, text: str):
+        self.generated_text_history.set(text)
+
+    def _on_text_chunk(self, text: str):
+        """
+        This method is called for each chunk of text that is processed in the text stream.
+        It accumulates the text and invokes the on_character callback for every character.
 
         Args:
-            char (str): The character currently being processed.
+            text (str): The text chunk currently being processed.
         """
-        # If an on_character callback is defined, invoke it for the current character
+        # If an on_character callback is defined, invoke it for every character
         if self.on_character:
-            self.on_character(char)
+            for char in text:
+                self.on_character(char)
+
+        if self.text_received_time is None:
+            self.text_received_time = time.time()
+
+        self.generated_text_history.append(text)
 
-        self.generated_text += char
+        if self.on_text_consumed:
+            self.on_text_consumed(text)
+
+    def _synthesize_cached(
+        self,
+        engine: BaseEngine,
+        text: str,
+        abort_event: threading.Event = None,
+        buffer_controller: AdaptiveBufferController = None,
+    ) -> bool:
+        """
+        Synthesizes text with engine, serving it from the sentence cache if possible.
+        On a cache hit the cached chunks are put into engine.queue, on a miss the
+        synthesized chunks are recorded and stored in the cache.
+
+        Args:
+            engine (BaseEngine): Engine used on a cache miss.
+            text (str): Text to synthesize.
+            abort_event (threading.Event, optional): If set after synthesis,
+              the (possibly incomplete) audio is not cached.
+            buffer_controller (AdaptiveBufferController, optional): Receives
+              measurements of the engine call and the amount of produced audio.
+
+        Returns:
+            bool: True if synthesis succeeded.
+        """
+        key = self.sentence_cache.make_key(engine, text) if self.sentence_cache else None
+        if key is None:
+            return self._synthesize_measured(engine, text, buffer_controller)
+
+        chunks = self.sentence_cache.get(key)
+        if chunks is not None:
+            logging.debug(f'sentence cache hit for "{text}"')
+            if engine.get_stream_info()[0] == pyaudio.paCustomFormat:
+                # Compressed audio must not be split at arbitrary positions
+                chunks = [b"".join(chunks)]
+            for chunk in chunks:
+                engine.queue.put(chunk)
+            if buffer_controller:
+                buffer_controller.add_audio(
+                    sum(len(chunk) for chunk in chunks)
+                    / get_bytes_per_second(*engine.get_stream_info())
+                )
+            return True
+
+        recorder = CacheRecorder(engine.queue)
+        with engine.redirect_output(recorder):
+            success = self._synthesize_measured(engine, text, buffer_controller)
+
+        if success and not (abort_event and abort_event.is_set()):
+            self.sentence_cache.put(key, recorder.chunks)
+        return success
+
+    def _synthesize_hedged(
+        self,
+        engine: BaseEngine,
+        text: str,
+        abort_event: threading.Event,
+        buffer_controller: AdaptiveBufferController = None,
+        hedge_after_seconds: float = 0.0,
+    ) -> Tuple[bool, BaseEngine]:
+        """
+        Synthesizes text with engine. If engine produces no audio within
+        hedge_after_seconds, the text is additionally started on the next
+        fallback engine with the same stream format (and so on). The audio
+        and word timings of the engine delivering first are forwarded to
+        engine.queue and engine.timings, those of the other engines are
+        discarded.
+
+        The other engines are only asked to stop(). Most engines can't
+        interrupt a running synthesize() call and keep working on the
+        sentence until it is done, so a losing engine may stay busy for a
+        while. A backup engine still busy with an earlier sentence is
+        skipped instead of waited for.
+
+        Args:
+            engine (BaseEngine): Engine to synthesize with first.
+            text (str): Text to synthesize.
+            abort_event (threading.Event): Stops waiting for audio when set.
+            buffer_controller (AdaptiveBufferController, optional): Receives
+              the measurements and audio of the winning engine only.
+            hedge_after_seconds (float): Deadline for the first audio chunk,
+              0 to synthesize with engine only.
+
+        Returns:
+            Tuple[bool, BaseEngine]: Success and the engine whose audio was used.
+        """
+        backups = []
+        if hedge_after_seconds > 0 and len(self.engines) > 1 and engine in self.engines:
+            stream_info = engine.get_stream_info()
+            start = self.engines.index(engine)
+            for offset in range(1, len(self.engines)):
+                candidate = self.engines[(start + offset) % len(self.engines)]
+                if candidate is not engine and candidate.get_stream_info() == stream_info:
+                    backups.append(candidate)
+
+        if not backups:
+            return self._synthesize_cached(engine, text, abort_event, buffer_controller), engine
+
+        target = engine.queue
+        timings_target = engine.timings
+        attempts = []
+        cache_hits = set()
+
+        def start_attempt(attempt_engine):
+            buffer = SentenceBuffer(len(attempts), text)
+            buffer.timings_base = attempt_engine.audio_duration
+            if self.sentence_cache:
+                key = self.sentence_cache.make_key(attempt_engine, text)
+                if key is not None and key in self.sentence_cache:
+                    cache_hits.add(buffer.index)
+
+            def run():
+                success = False
+                try:
+                    with attempt_engine.redirect_output(buffer, timings=buffer.timings):
+                        success = self._synthesize_cached(attempt_engine, text, abort_event)
+                except Exception as e:
+                    logging.warning(
+                        f'engine {attempt_engine.engine_name} failed to synthesize sentence "{text}" with error: {e}'
+                    )
+                finally:
+                    buffer.finish(success)
+
+            thread = threading.Thread(target=run, daemon=True)
+            self.hedge_threads[id(attempt_engine)] = thread
+            attempts.append((attempt_engine, buffer))
+            thread.start()
+
+        # The primary engine may still be finishing a sentence it lost a
+        # race for, its next sentence has to wait for that
+        previous = self.hedge_threads.get(id(engine))
+        if previous and previous.is_alive():
+            previous.join()
+
+        start_attempt(engine)
+        hedge_time = time.time() + hedge_after_seconds
+        winner = None
+
+        while winner is None and not abort_event.is_set():
+            for attempt_engine, buffer in attempts:
+                if not buffer.chunks.empty() or (buffer.finished.is_set() and buffer.success):
+                    winner = (attempt_engine, buffer)
+                    break
+            if winner:
+                break
+
+            all_failed = all(buffer.finished.is_set() for _, buffer in attempts)
+            if backups and (all_failed or time.time() >= hedge_time):
+                backup = backups.pop(0)
+                hedge_time = time.time() + hedge_after_seconds
+                previous = self.hedge_threads.get(id(backup))
+                if previous and previous.is_alive():
+                    logging.info(
+                        f"not hedging with {backup.engine_name}, still busy with an earlier sentence"
+                    )
+                    continue
+                logging.info(
+                    f"no audio from {attempts[-1][0].engine_name} after {hedge_after_seconds:.2f}s, "
+                    f"hedging with {backup.engine_name}"
+                )
+                start_attempt(backup)
+            elif all_failed:
+                break
+            else:
+                time.sleep(0.005)
+
+        for attempt_engine, buffer in attempts:
+            if winner is None or attempt_engine is not winner[0]:
+                if not buffer.finished.is_set():
+                    attempt_engine.stop()
+
+        if winner is None:
+            return False, engine
+
+        winner_engine, buffer = winner
+        if winner_engine is not engine:
+            logging.info(f"hedged synthesis won by {winner_engine.engine_name}")
+
+        # Only the winner's audio is measured, cached audio just counts as queued
+        bytes_per_second = get_bytes_per_second(*winner_engine.get_stream_info())
+        output = target
+        probe = None
+        if buffer_controller and buffer.index not in cache_hits:
+            probe = buffer_controller.probe(target, bytes_per_second)
+            probe.start_time = buffer.start_time
+            probe.first_chunk_time = buffer.first_chunk_time
+            output = probe
+
+        # Word timings are relative to the audio_duration of the engine that
+        # produced them, shift them onto the primary engine's time scale
+        primary_base = attempts[0][1].timings_base
+        shift = primary_base - buffer.timings_base
+
+        def forward_timings():
+            while True:
+                try:
+                    timing = buffer.timings.get_nowait()
+                except queue.Empty:
+                    return
+                timings_target.put(
+                    TimingInfo(timing.start_time + shift, timing.end_time + shift, timing.word)
+                )
+
+        while not abort_event.is_set():
+            forward_timings()
+            try:
+                chunk = buffer.chunks.get(timeout=0.05)
+            except queue.Empty:
+                if buffer.finished.is_set() and buffer.chunks.empty():
+                    break
+                continue
+            if probe is None and buffer_controller and isinstance(chunk, AUDIO_CHUNK_TYPES):
+                buffer_controller.add_audio(get_duration(chunk, bytes_per_second))
+            output.put(chunk)
+        forward_timings()
+
+        if probe:
+            probe.finish(text, buffer.success and not abort_event.is_set())
+
+        if winner_engine is not engine and attempts[0][1].finished.is_set():
+            # Continue the primary engine's time scale after the winner's audio
+            engine.audio_duration = primary_base + (winner_engine.audio_duration - buffer.timings_base)
+
+        return buffer.success, winner_engine
+
+    def _synthesize_measured(
+        self,
+        engine: BaseEngine,
+        text: str,
+        buffer_controller: AdaptiveBufferController = None,
+    ) -> bool:
+        """
+        Calls engine.synthesize(), reporting time to first audio, duration and
+        audio length of the call to buffer_controller if given.
+
+        Returns:
+            bool: True if synthesis succeeded.
+        """
+        if not buffer_controller:
+            return engine.synthesize(text)
+
+        probe = buffer_controller.probe(
+            engine.queue, get_bytes_per_second(*engine.get_stream_info())
+        )
+        success = False
+        try:
+            with engine.redirect_output(probe):
+                success = engine.synthesize(text)
+        finally:
+            probe.finish(text, success)
+        return success
+
+    def _wait_for_prerender(self):
+        """
+        Waits for a running prerender() if the engine can't synthesize
+        concurrently.
+        """
+        if (
+            self.prerender_thread
+            and self.prerender_thread.is_alive()
+            and self.prerender_thread is not threading.current_thread()
+            and not self.engine.can_synthesize_concurrently
+        ):
+            logging.info("waiting for prerendering to finish")
+            self.prerender_thread.join()
+
+    def _split_sentences(
+        self,
+        text: str,
+        fast_sentence_fragment: bool = True,
+        fast_sentence_fragment_allsentences: bool = False,
+        fast_sentence_fragment_allsentences_multiple: bool = False,
+        minimum_sentence_length: int = 10,
+        minimum_first_fragment_length: int = 10,
+        tokenizer: str = "",
+        tokenize_sentences=None,
+        language: str = "",
+        context_size: int = 12,
+        context_size_look_overhead: int = 12,
+        sentence_fragment_delimiters: str = ".?!;:,\n…。",
+        force_first_fragment_after_words=30,
+        **_,
+    ) -> List[str]:
+        """
+        Splits text into the sentences play() would synthesize for it,
+        using play()'s sentence splitting arguments and defaults.
+
+        Returns:
+            List[str]: The stripped, non-empty sentences.
+        """
+        tokenizer = tokenizer if tokenizer else self.tokenizer
+        language = language if language else self.language
+        if tokenize_sentences is None:
+            tokenize_sentences = get_sentence_tokenizer(tokenizer, language)
+
+        sentences = get_sentence_generator(tokenizer)(
+            [text],
+            context_size=context_size,
+            context_size_look_overhead=context_size_look_overhead,
+            minimum_sentence_length=minimum_sentence_length,
+            minimum_first_fragment_length=minimum_first_fragment_length,
+            quick_yield_single_sentence_fragment=fast_sentence_fragment,
+            quick_yield_for_all_sentences=fast_sentence_fragment_allsentences,
+            quick_yield_every_fragment=fast_sentence_fragment_allsentences_multiple,
+            cleanup_text_links=True,
+            cleanup_text_emojis=True,
+            tokenize_sentences=tokenize_sentences,
+            tokenizer=tokenizer,
+            language=language,
+            sentence_fragment_delimiters=sentence_fragment_delimiters,
+            force_first_fragment_after_words=force_first_fragment_after_words,
+        )
+        return [sentence.strip() for sentence in sentences if sentence.strip()]
 
     def _is_engine_mpeg(self):
         """
@@ -837,17 +1852,20 @@ class TextToAudioStream:
         generator: Iterator[str],
         buffer_threshold_seconds: float = 2.0,
         log_synthesis_chunks: bool = False,
+        buffer_controller: AdaptiveBufferController = None,
     ) -> Iterator[str]:
         """
         Generates synthesis chunks based on buffered audio length.
 
         The function buffers chunks of synthesis until the buffered audio seconds fall below the provided threshold.
         Once the threshold is crossed, the buffered synthesis chunk is yielded.
+        With a buffer_controller, the controller decides when to yield instead of the fixed threshold.
 
         Args:
             generator: Input iterator that provides chunks for synthesis.
             buffer_threshold_seconds: Time in seconds to specify how long audio data should be buffered before yielding the synthesis chunk.
             log_synthesis_chunks: Boolean flag that, if set to True, logs the synthesis chunks to the logging system.
+            buffer_controller: Optional AdaptiveBufferController deciding how many chunks to merge.
 
         Returns:
             Iterator of synthesis chunks.
@@ -859,7 +1877,9 @@ class TextToAudioStream:
         # Iterates over each chunk from the provided generator
         for chunk in generator:
             # Fetch the total seconds of buffered audio
-            if self.player:
+            if buffer_controller:
+                buffered_audio_seconds = buffer_controller.buffered_seconds()
+            elif self.player:
                 buffered_audio_seconds = self.player.get_buffered_seconds()
             else:
                 buffered_audio_seconds = 0
@@ -867,6 +1887,21 @@ class TextToAudioStream:
             # Append the current chunk (and a space) to the accumulated synthesis_chunk
             synthesis_chunk += chunk + " "
 
+            if buffer_controller:
+                buffer_controller.record_sentence_arrival(len(chunk))
+                if buffer_controller.should_yield(len(synthesis_chunk)):
+                    if log_synthesis_chunks:
+                        logging.info(
+                            f'-- ["{synthesis_chunk}"], buffered {buffered_audio_seconds:.1f}s'
+                        )
+                    yield synthesis_chunk
+                    synthesis_chunk = ""
+                else:
+                    logging.info(
+                        f"merging chunks, buffer {buffered_audio_seconds:.1f}s covers the next synthesis call"
+                    )
+                continue
+
             # Check if the buffered audio is below the specified threshold
             if (
                 buffered_audio_seconds < buffer_threshold_seconds
@@ -5,27 +5,101 @@ This module offers tools for safe, thread-friendly iteration over generators and
 
 Classes:
 
+0. TextAccumulator:
+   - Collects text pieces in a list, joined on demand.
+   - Optionally keeps only a window of the most recent text (long-form mode).
+
 1. CharIterator:
-   - Iterates over characters from strings or string iterators.
-   - Logs each character and triggers callbacks for the first and last text chunks.
+   - Iterates over characters from strings or string iterators, or over
+     whole text chunks in chunk mode.
+   - Logs the text and triggers callbacks for the first and last text chunks.
    - Can be stopped instantly with a threading event.
+   - Optionally releases consumed items and bounds the kept text.
 
 2. AccumulatingThreadSafeGenerator:
    - Wraps a generator for safe multi-threaded token consumption.
-   - Accumulates tokens into a full text.
+   - Accumulates tokens into a full text (or a window of it).
    - Uses locks to avoid race conditions and supports first/last token callbacks.
+
+3. AsyncIteratorBridge:
+   - Exposes an async token iterator as a blocking iterator.
+   - Tokens are pumped on the event loop and consumed by the synthesis thread.
 """
 
 
-from typing import Union, Iterator, Callable, Optional
+from typing import Union, Iterator, AsyncIterator, Callable, Optional
 import threading
+import queue
 from dataclasses import dataclass, field
 
 
+class TextAccumulator:
+    """
+    Accumulates text in a list of pieces that is joined on demand, so
+    appending stays cheap for long texts.
+
+    With max_chars > 0 only the most recent max_chars characters are kept
+    (the text is trimmed whenever it grows beyond twice the window).
+    """
+
+    # Number of pieces collapsed into one string, keeps the list short
+    COMPACT_PARTS = 1024
+
+    def __init__(self, text: str = "", max_chars: int = 0):
+        """
+        Args:
+            text (str): Initial text.
+            max_chars (int): Number of most recent characters to keep,
+              0 keeps all text.
+        """
+        self.max_chars = max_chars
+        self.set(text)
+
+    def set(self, text: str) -> None:
+        """Replace the accumulated text."""
+        self.parts = [text] if text else []
+        self.compacted = len(self.parts)
+        self.length = len(text)
+
+    def append(self, text: str) -> None:
+        """Append a piece of text."""
+        if not text:
+            return
+        parts = self.parts
+        parts.append(text)
+        self.length += len(text)
+
+        if self.max_chars > 0 and self.length > 2 * self.max_chars:
+            kept = "".join(parts)[-self.max_chars:]
+            self.parts = [kept]
+            self.compacted = 1
+            self.length = len(kept)
+        elif len(parts) - self.compacted >= self.COMPACT_PARTS:
+            parts[self.compacted:] = ["".join(parts[self.compacted:])]
+            self.compacted += 1
+
+    def text(self) -> str:
+        """Return the accumulated text (the window in long-form mode)."""
+        text = "".join(self.parts)
+        if self.max_chars > 0:
+            return text[-self.max_chars:]
+        return text
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.length > 0
+
+
 @dataclass
 class CharIterator:
     """
     An iterator that allows iteration over characters of strings or string iterators.
+
+    In chunk mode every string, or every token of a string iterator, is
+    returned as a whole, which saves the per-character overhead when the
+    consumer (like stream2sentence) accepts text chunks.
     
     Attributes:
         items (List[Union[str, Iterator[str]]]): The list of strings or string iterators.
@@ -33,16 +107,25 @@ class CharIterator:
         _char_index (Optional[int]): Current character index in the current string.
         _current_iterator (Optional[Iterator[str]]): Current iterator being consumed.
         immediate_stop (threading.Event): Event signaling to stop iteration.
-        iterated_text (str): Accumulates the characters that have been iterated over.
+        iterated_text (str): The text that has been iterated over.
+        chunk_mode (bool): If True, returns whole text chunks instead of characters.
+        max_text_chars (int): If greater than 0, only the last max_text_chars
+          characters of iterated_text are kept and consumed items are
+          removed from items (long-form mode).
         log_characters (bool): If True, logs processed characters.
         on_character (Callable): Callback on each character processed.
+        on_text_chunk (Callable): Callback on each returned piece of text
+          (a character, or a chunk in chunk mode).
         on_first_text_chunk (Callable): Callback on receiving the first text chunk.
         on_last_text_chunk (Callable): Callback on receiving the last text chunk.
         first_chunk_received (bool): Flag indicating if the first chunk was processed.
     """
 
     log_characters: bool = False
+    chunk_mode: bool = False
+    max_text_chars: int = 0
     on_character: Optional[Callable[[str], None]] = None
+    on_text_chunk: Optional[Callable[[str], None]] = None
     on_first_text_chunk: Optional[Callable[[], None]] = None
     on_last_text_chunk: Optional[Callable[[], None]] = None
 
@@ -51,9 +134,21 @@ class CharIterator:
     _char_index: Optional[int] = None
     _current_iterator: Optional[Iterator[str]] = None
     immediate_stop: threading.Event = field(default_factory=threading.Event)
-    iterated_text: str = ""
+    _text: Optional[TextAccumulator] = None
     first_chunk_received: bool = False
 
+    def __post_init__(self) -> None:
+        self._text = TextAccumulator(max_chars=self.max_text_chars)
+
+    @property
+    def iterated_text(self) -> str:
+        """The text that has been iterated over."""
+        return self._text.text()
+
+    @iterated_text.setter
+    def iterated_text(self, text: str) -> None:
+        self._text.set(text)
+
     def add(self, item: Union[str, Iterator[str]]) -> None:
         """Add a string or a string iterator to the list of items."""
         self.items.append(item)
@@ -66,19 +161,42 @@ class CharIterator:
         """Return the iterator object itself."""
         return self
 
-    def _log_and_trigger(self, char: str) -> None:
-        """Log character and trigger associated callbacks."""
-        self.iterated_text += char
+    def _log_and_trigger(self, text: str) -> None:
+        """Log text and trigger associated callbacks."""
+        self._text.append(text)
         if self.log_characters:
-            print(char, end="", flush=True)
+            print(text, end="", flush=True)
+        if self.on_text_chunk:
+            self.on_text_chunk(text)
         if self.on_character:
-            self.on_character(char)
+            for char in text:
+                self.on_character(char)
         if not self.first_chunk_received and self.on_first_text_chunk:
             self.on_first_text_chunk()
             self.first_chunk_received = True
 
+    def _take(self, text: str) -> str:
+        """Return the next character (or the rest in chunk mode) of text."""
+        if self.chunk_mode:
+            piece = text[self._char_index:]
+            self._char_index = len(text)
+        else:
+            piece = text[self._char_index]
+            self._char_index += 1
+        self._log_and_trigger(piece)
+        return piece
+
+    def _next_item(self) -> None:
+        """Move on to the next item, releasing the consumed one in long-form mode."""
+        self._char_index = None
+        self._current_iterator = None
+        if self.max_text_chars > 0:
+            del self.items[self._index]
+        else:
+            self._index += 1
+
     def __next__(self) -> str:
-        """Fetch the next character from the current string or string iterator."""
+        """Fetch the next character (or chunk) from the current string or string iterator."""
         if self.immediate_stop.is_set():
             raise StopIteration
 
@@ -90,13 +208,9 @@ class CharIterator:
                     self._char_index = 0
 
                 if self._char_index < len(item):
-                    char = item[self._char_index]
-                    self._char_index += 1
-                    self._log_and_trigger(char)
-                    return char
+                    return self._take(item)
                 else:
-                    self._char_index = None
-                    self._index += 1
+                    self._next_item()
 
             else:  # item is an iterator
                 if self._current_iterator is None:
@@ -108,22 +222,17 @@ class CharIterator:
                         if hasattr(self._current_str, "choices"):
                             self._current_str = str(self._current_str.choices[0].delta.content) or ""
                     except StopIteration:
-                        self._char_index = None
-                        self._current_iterator = None
-                        self._index += 1
+                        self._next_item()
                         continue
 
                     self._char_index = 0
 
                 if self._char_index < len(self._current_str):
-                    char = self._current_str[self._char_index]
-                    self._char_index += 1
-                    self._log_and_trigger(char)
-                    return char
+                    return self._take(self._current_str)
                 else:
                     self._char_index = None
 
-        if self.iterated_text and self.on_last_text_chunk:
+        if self._text and self.on_last_text_chunk:
             self.on_last_text_chunk()
 
         raise StopIteration
@@ -134,7 +243,7 @@ class AccumulatingThreadSafeGenerator:
     A thread-safe generator that accumulates the iterated tokens into a text.
     """
 
-    def __init__(self, gen_func: Iterator[str], on_first_text_chunk: Optional[Callable[[], None]] = None, on_last_text_chunk: Optional[Callable[[], None]] = None):
+    def __init__(self, gen_func: Iterator[str], on_first_text_chunk: Optional[Callable[[], None]] = None, on_last_text_chunk: Optional[Callable[[], None]] = None, max_text_chars: int = 0):
         """
         Initialize the AccumulatingThreadSafeGenerator instance.
         
@@ -142,11 +251,13 @@ class AccumulatingThreadSafeGenerator:
             gen_func (Iterator[str]): The generator function to be used.
             on_first_text_chunk (Optional[Callable]): Callback for the first chunk of text.
             on_last_text_chunk (Optional[Callable]): Callback for the last chunk of text.
+            max_text_chars (int): If greater than 0, only the last max_text_chars
+              characters of the accumulated text are kept.
         """
         self.lock = threading.Lock()
         self.generator = gen_func
         self.exhausted = False
-        self.iterated_text = ""
+        self.text = TextAccumulator(max_chars=max_text_chars)
         self.on_first_text_chunk = on_first_text_chunk
         self.on_last_text_chunk = on_last_text_chunk
         self.first_chunk_received = False
@@ -160,7 +271,7 @@ class AccumulatingThreadSafeGenerator:
         with self.lock:
             try:
                 token = next(self.generator)
-                self.iterated_text += str(token)
+                self.text.append(str(token))
 
                 if not self.first_chunk_received and self.on_first_text_chunk:
                     self.on_first_text_chunk()
@@ -169,11 +280,16 @@ class AccumulatingThreadSafeGenerator:
                 return token
 
             except StopIteration:
-                if self.iterated_text and self.on_last_text_chunk:
+                if self.text and self.on_last_text_chunk:
                     self.on_last_text_chunk()
                 self.exhausted = True
                 raise
 
+    @property
+    def iterated_text(self) -> str:
+        """The text of all tokens iterated so far."""
+        return self.text.text()
+
     def is_exhausted(self) -> bool:
         """Check if the generator has been exhausted."""
         with self.lock:
@@ -182,4 +298,51 @@ class AccumulatingThreadSafeGenerator:
     def accumulated_text(self) -> str:
         """Retrieve the accumulated text from the iterated tokens."""
         with self.lock:
-            return self.iterated_text
+            return self.text.text()
+
+
+class AsyncIteratorBridge:
+    """
+    Exposes an async iterator (e.g. the token stream of an async LLM client)
+    as a blocking iterator that the synthesis thread can consume.
+
+    The tokens are pulled on the event loop by awaiting pump(), no thread is
+    blocked on the async side.
+    """
+
+    _END = object()
+
+    def __init__(self, async_iterator: AsyncIterator[str]):
+        """
+        Initialize the AsyncIteratorBridge instance.
+
+        Args:
+            async_iterator (AsyncIterator[str]): The async iterator providing the tokens.
+        """
+        self.async_iterator = async_iterator
+        self.tokens = queue.Queue()
+
+    async def pump(self) -> None:
+        """Forward all tokens of the async iterator. Must be awaited on the event loop."""
+        try:
+            async for token in self.async_iterator:
+                self.tokens.put(token)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Signal the end of the token stream to the consuming thread."""
+        self.tokens.put(self._END)
+
+    def __iter__(self) -> "AsyncIteratorBridge":
+        """Return the iterator object itself."""
+        return self
+
+    def __next__(self) -> str:
+        """Block until the next token is available."""
+        token = self.tokens.get()
+        if token is self._END:
+            # Keep the end marker for any further next() calls
+            self.tokens.put(self._END)
+            raise StopIteration
+        return token
@@ -0,0 +1,60 @@
+"""
+Word Timings Module
+-------------------
+Keeps the word timings reported by engines until the StreamPlayer has
+played up to them.
+
+- WordTimingQueue: Min-heap of TimingInfo entries ordered by start time.
+  pop_due() returns every word that started before a playback position,
+  each pop is O(log n) however many words are pending.
+"""
+
+from typing import Iterator
+from itertools import count
+import heapq
+import queue
+
+
+class WordTimingQueue:
+    """
+    Collects TimingInfo objects from an engine's timings queue and hands
+    them out in start time order once playback reached them.
+    """
+
+    def __init__(self, timings: queue.Queue):
+        """
+        Args:
+            timings (queue.Queue): The engine's queue of TimingInfo objects.
+        """
+        self.timings = timings
+        self.heap = []
+        self.sequence = count()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def collect(self):
+        """Moves newly reported timings from the engine's queue into the heap."""
+        while True:
+            try:
+                timing = self.timings.get_nowait()
+            except queue.Empty:
+                return
+            # The sequence number keeps words with equal start times in order
+            heapq.heappush(self.heap, (timing.start_time, next(self.sequence), timing))
+
+    def pop_due(self, position: float) -> Iterator:
+        """
+        Yields the timings starting at or before position, in start order.
+
+        Args:
+            position (float): Playback position in seconds.
+        """
+        self.collect()
+        heap = self.heap
+        while heap and heap[0][0] <= position:
+            yield heapq.heappop(heap)[2]
+
+    def clear(self):
+        """Discards all pending timings."""
+        self.heap.clear()
@@ -10,6 +10,8 @@ Features:
 -   Loads two pre-configured voices at startup.
 -   Handles one TTS request at a time to prevent resource contention.
 -   Streams audio back for low-latency responses.
+-   Pre-renders canned phrases for every voice at startup, so they play
+    without synthesis latency.
 """
 from __future__ import annotations
 
@@ -23,7 +25,7 @@ import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from RealtimeTTS import TextToAudioStream, ZipVoiceEngine, ZipVoiceVoice
+from RealtimeTTS import SentenceCache, TextToAudioStream, ZipVoiceEngine, ZipVoiceVoice
 
 # --- Configuration ---
 ZIPVOICE_PROJECT_ROOT = os.getenv("ZIPVOICE_PROJECT_ROOT", "/opt/app-root/src/ZipVoice")
@@ -40,6 +42,13 @@ VOICE_BETA_PROMPT_TEXT = os.getenv(
     "Your voice just got supercharged! Crystal clear audio that flows like silk and hits like thunder!"
 )
 
+# Canned phrases pre-rendered for every voice at startup ("|"-separated).
+PRERENDER_PHRASES = [
+    phrase.strip()
+    for phrase in os.getenv("PRERENDER_PHRASES", "Server is now ready.").split("|")
+    if phrase.strip()
+]
+
 # --- Global State ---
 # These will be initialized during the application lifespan startup.
 engine: ZipVoiceEngine | None = None
@@ -156,12 +165,16 @@ async def lifespan(app: FastAPI):
         device="cuda" if "cuda" in os.getenv("DEVICE", "cuda") else "cpu" # Prefer CUDA
     )
 
-    # 3. Create the TextToAudioStream.
-    stream = TextToAudioStream(engine, muted=True)
+    # 3. Create the TextToAudioStream with a sentence cache for repeated phrases.
+    stream = TextToAudioStream(engine, muted=True, sentence_cache=SentenceCache())
 
-    # 4. Warm up the engine to reduce latency on the first request.
-    print("Warming up the engine...")
-    stream.feed("Server is now ready.").play(muted=True)
+    # 4. Warm up the engine and pre-render the canned phrases for every voice.
+    #    This also reduces latency on the first request.
+    print(f"Pre-rendering {len(PRERENDER_PHRASES)} phrase(s) per voice...")
+    for voice in AVAILABLE_VOICES.values():
+        engine.set_voice(voice)
+        stream.prerender(PRERENDER_PHRASES, wait=True)
+    engine.set_voice(voice_alpha)
 
     print("--- Server Ready ---")
 
@@ -13,6 +13,7 @@ if __name__ == "__main__":
 
 from RealtimeTTS import (
     TextToAudioStream,
+    warm_up_tokenizer,
     AzureEngine,
     ElevenlabsEngine,
     SystemEngine,
@@ -26,8 +27,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, Query, Request
 from fastapi.staticfiles import StaticFiles
 
-from queue import Queue
-import threading
+import asyncio
 import logging
 import uvicorn
 import wave
@@ -71,54 +71,12 @@ origins = [
     f"https://127.0.0.1:{PORT}",
 ]
 
-play_text_to_speech_semaphore = threading.Semaphore(1)
 engines = {}
 voices = {}
 current_engine = None
-speaking_lock = threading.Lock()
-tts_lock = threading.Lock()
-gen_lock = threading.Lock()
-
-
-class TTSRequestHandler:
-    def __init__(self, engine):
-        self.engine = engine
-        self.audio_queue = Queue()
-        self.stream = TextToAudioStream(
-            engine, on_audio_stream_stop=self.on_audio_stream_stop, muted=True
-        )
-        self.speaking = False
-
-    def on_audio_chunk(self, chunk):
-        self.audio_queue.put(chunk)
-
-    def on_audio_stream_stop(self):
-        self.audio_queue.put(None)
-        self.speaking = False
-
-    def play_text_to_speech(self, text):
-        self.speaking = True
-        self.stream.feed(text)
-        logging.debug(f"Playing audio for text: {text}")
-        print(f'Synthesizing: "{text}"')
-        self.stream.play_async(on_audio_chunk=self.on_audio_chunk, muted=True)
-
-    def audio_chunk_generator(self, send_wave_headers):
-        first_chunk = False
-        try:
-            while True:
-                chunk = self.audio_queue.get()
-                if chunk is None:
-                    print("Terminating stream")
-                    break
-                if not first_chunk:
-                    if send_wave_headers:
-                        print("Sending wave header")
-                        yield create_wave_header_for_engine(self.engine)
-                    first_chunk = True
-                yield chunk
-        except Exception as e:
-            print(f"Error during streaming: {str(e)}")
+
+# engines have a single output queue, so requests take turns per engine
+engine_locks = {}
 
 
 app = FastAPI()
@@ -212,24 +170,22 @@ def create_wave_header_for_engine(engine):
 
 @app.get("/tts")
 async def tts(request: Request, text: str = Query(...)):
-    with tts_lock:
-        request_handler = TTSRequestHandler(current_engine)
-        browser_request = is_browser_request(request)
-
-        if play_text_to_speech_semaphore.acquire(blocking=False):
-            try:
-                threading.Thread(
-                    target=request_handler.play_text_to_speech,
-                    args=(text,),
-                    daemon=True,
-                ).start()
-            finally:
-                play_text_to_speech_semaphore.release()
-
-        return StreamingResponse(
-            request_handler.audio_chunk_generator(browser_request),
-            media_type="audio/wav",
-        )
+    engine = current_engine
+    browser_request = is_browser_request(request)
+    print(f'Synthesizing: "{text}"')
+
+    async def audio_chunk_generator():
+        async with engine_locks.setdefault(engine.engine_name, asyncio.Lock()):
+            stream = TextToAudioStream(engine, muted=True)
+            first_chunk = True
+            async for chunk in stream.astream(text):
+                if first_chunk and browser_request:
+                    print("Sending wave header")
+                    yield create_wave_header_for_engine(engine)
+                first_chunk = False
+                yield chunk
+
+    return StreamingResponse(audio_chunk_generator(), media_type="audio/wav")
 
 
 @app.get("/engines")
@@ -351,6 +307,9 @@ def root_page():
 
 
 if __name__ == "__main__":
+    print("Initializing sentence tokenizer")
+    warm_up_tokenizer("nltk", "en")
+
     print("Initializing TTS Engines")
 
     for engine_name in SUPPORTED_ENGINES:
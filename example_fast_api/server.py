@@ -24,6 +24,7 @@ if __name__ == "__main__":
 
 from RealtimeTTS import (
     TextToAudioStream,
+    warm_up_tokenizer,
     AzureEngine,
     ElevenlabsEngine,
     SystemEngine,
@@ -36,8 +37,8 @@ from fastapi.responses import StreamingResponse, HTMLResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, Query, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
 
-from queue import Queue
 import threading
 import logging
 import uvicorn
@@ -78,7 +79,6 @@ origins = [
     f"https://127.0.0.1:{PORT}",
 ]
 
-audio_queue = Queue()
 play_text_to_speech_semaphore = threading.Semaphore(1)
 engines = {}
 voices = {}
@@ -86,8 +86,6 @@ current_engine = None
 stream = None
 current_speaking = {}
 speaking_lock = threading.Lock()
-tts_lock = threading.Lock()
-gen_lock = threading.Lock()
 
 app = FastAPI()
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -149,24 +147,6 @@ def set_engine(request: Request, engine_name: str = Query(...)):
         return {"error": "Failed to switch engine"}
 
 
-def play_text_to_speech(stream, text, audio_queue):
-    set_speaking(text, True)
-
-    def on_audio_chunk(chunk):
-        logging.debug("Received chunk")
-        audio_queue.put(chunk)
-
-    try:
-        stream.feed(text)
-        logging.debug(f"Playing audio for text: {text}")
-        print(f'Synthesizing: "{text}"')
-        stream.play(on_audio_chunk=on_audio_chunk, muted=True)
-        audio_queue.put(None)
-    finally:
-        set_speaking(text, False)
-        play_text_to_speech_semaphore.release()
-
-
 def is_browser_request(request):
     user_agent = request.headers.get("user-agent", "").lower()
     is_browser = any(browser_id in user_agent for browser_id in BROWSER_IDENTIFIERS)
@@ -197,27 +177,61 @@ def create_wave_header_for_engine(engine):
 
     return final_wave_header.getvalue()
 
-def audio_chunk_generator(audio_queue, send_wave_headers):
-    with gen_lock:
-        first_chunk = False
-        try:
-            while True:
-                chunk = audio_queue.get()
-                if chunk is None:
-                    logging.debug("Terminating stream")
-                    break
-                if not first_chunk:
-                    if (
-                        send_wave_headers
-                        and not current_engine.engine_name == "elevenlabs"
-                    ):
-                        logging.debug("Sending wave header")
-                        yield create_wave_header_for_engine(current_engine)
-                    first_chunk = True
-                logging.debug("Sending chunk")
-                yield chunk
-        except Exception as e:
-            logging.error(f"Error during streaming: {str(e)}")
+class PlaybackSlot:
+    """
+    The acquired play_text_to_speech_semaphore of one request. Released
+    exactly once, by the end of the audio generator or by the response's
+    background task, which also runs if the client disconnected before the
+    generator was ever iterated.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.released = False
+        self.lock = threading.Lock()
+
+    def release(self):
+        with self.lock:
+            if self.released:
+                return
+            self.released = True
+        set_speaking(self.text, False)
+        play_text_to_speech_semaphore.release()
+
+
+def streaming_audio_response(text, send_wave_headers, media_type):
+    slot = PlaybackSlot(text)
+    try:
+        return StreamingResponse(
+            audio_chunk_generator(text, send_wave_headers, slot),
+            media_type=media_type,
+            background=BackgroundTask(slot.release),
+        )
+    except Exception:
+        slot.release()
+        raise
+
+
+def audio_chunk_generator(text, send_wave_headers, slot):
+    set_speaking(text, True)
+    print(f'Synthesizing: "{text}"')
+    try:
+        first_chunk = True
+        for chunk in stream.iter_chunks(text):
+            if first_chunk:
+                if (
+                    send_wave_headers
+                    and not current_engine.engine_name == "elevenlabs"
+                ):
+                    logging.debug("Sending wave header")
+                    yield create_wave_header_for_engine(current_engine)
+                first_chunk = False
+            logging.debug("Sending chunk")
+            yield chunk
+    except Exception as e:
+        logging.error(f"Error during streaming: {str(e)}")
+    finally:
+        slot.release()
 
 
 def is_currently_speaking(text):
@@ -233,24 +247,18 @@ def set_speaking(text, status):
 @app.get("/tts")
 def tts(request: Request, text: str = Query(...)):
     browser_request = is_browser_request(request)
-    audio_queue = Queue()
 
-    if play_text_to_speech_semaphore.acquire(blocking=False):
-        threading.Thread(
-            target=play_text_to_speech, args=(stream, text, audio_queue), daemon=True
-        ).start()
-    else:
+    if not play_text_to_speech_semaphore.acquire(blocking=False):
         raise HTTPException(
             status_code=503,
             detail="Service unavailable, currently processing another request. Please try again shortly.",
             headers={"Retry-After": "10"},
         )
 
-    return StreamingResponse(
-        audio_chunk_generator(audio_queue, browser_request),
-        media_type="audio/wav"
-        if current_engine.engine_name != "elevenlabs"
-        else "audio/mpeg",
+    return streaming_audio_response(
+        text,
+        browser_request,
+        "audio/wav" if current_engine.engine_name != "elevenlabs" else "audio/mpeg",
     )
 
 
@@ -264,16 +272,11 @@ def tts_text(request: Request, text: str = Query(...)):
 
     browser_request = is_browser_request(request)
 
-    if play_text_to_speech_semaphore.acquire(blocking=False):
-        threading.Thread(
-            target=play_text_to_speech, args=(stream, text), daemon=True
-        ).start()
-    else:
+    if not play_text_to_speech_semaphore.acquire(blocking=False):
         logging.debug("Can't play audio, another instance is already running")
+        raise HTTPException(status_code=503, detail="Currently processing another request.")
 
-    return StreamingResponse(
-        audio_chunk_generator(browser_request), media_type="audio/wav"
-    )
+    return streaming_audio_response(text, browser_request, "audio/wav")
 
 
 @app.get("/engines")
@@ -395,6 +398,9 @@ def root_page():
 
 
 if __name__ == "__main__":
+    print("Initializing sentence tokenizer")
+    warm_up_tokenizer("nltk", "en")
+
     print("Initializing TTS Engines")
 
     for engine_name in SUPPORTED_ENGINES:
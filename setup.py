@@ -59,7 +59,6 @@ base_requirements = [
     requirements["stream2sentence"],
     requirements["pydub"],
     requirements["pyaudio"],
-    requirements["resampy"],
 ]
 
 # Define subsets of requirements for each engine
@@ -0,0 +1,22 @@
+from RealtimeTTS import TextToAudioStream, SystemEngine
+import asyncio
+
+
+async def async_token_generator():
+    for token in ["This is a sentence ", "streamed from async code. ", "And here's ", "another one."]:
+        await asyncio.sleep(0.05)
+        yield token
+
+
+async def main():
+    stream = TextToAudioStream(SystemEngine())
+
+    total_bytes = 0
+    async for chunk in stream.astream(async_token_generator()):
+        total_bytes += len(chunk)
+        print(f"Chunk received, len: {len(chunk)}")
+
+    print(f"Received {total_bytes} bytes of audio")
+
+
+asyncio.run(main())
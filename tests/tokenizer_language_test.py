@@ -0,0 +1,15 @@
+from RealtimeTTS import TextToAudioStream, SystemEngine
+from RealtimeTTS import sentence_tokenizers
+
+if __name__ == "__main__":
+    engine = SystemEngine()
+
+    # The constructor's tokenizer and language are used by play()
+    stream = TextToAudioStream(engine, tokenizer="fast", language="de")
+    stream.feed("Hallo Welt. Wie geht es dir heute?")
+    stream.play(muted=True)
+
+    assert ("fast", "de") in sentence_tokenizers._tokenizers, sentence_tokenizers._tokenizers
+    print("play() initialized the \"de\" tokenizer")
+
+    engine.shutdown()